@@ -0,0 +1,55 @@
+"""Compare JSON codecs on a scaled-up ConsolidatedRefresh response.
+
+Run from repository root: python benchmarks/bench_codec.py [MACHINE_COUNT]
+"""
+
+from __future__ import annotations
+
+import sys
+import timeit
+
+from payloads import build_raw_response
+
+from pylaundry.codec import JsonCodec, OrjsonCodec, orjson
+from pylaundry.helpers import MessagePacker
+
+
+def main() -> None:
+    """Run benchmark."""
+
+    machine_count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    response_content = bytes(
+        MessagePacker.extract_response_content(build_raw_response(machine_count))  # type: ignore
+    )
+
+    codecs: list[JsonCodec] = [JsonCodec()]
+    if orjson is not None:
+        codecs.append(OrjsonCodec())
+    else:
+        print("orjson not installed. Only benchmarking standard library codec.")
+
+    expected = MessagePacker.unpack_server_response(response_content, codec=JsonCodec())
+
+    print(f"{machine_count} machines")
+
+    for codec in codecs:
+        assert (
+            MessagePacker.unpack_server_response(response_content, codec=codec)
+            == expected
+        )
+
+        runs = 20
+        seconds = (
+            timeit.timeit(
+                lambda c=codec: MessagePacker.unpack_server_response(
+                    response_content, codec=c
+                ),
+                number=runs,
+            )
+            / runs
+        )
+        print(f"{codec.name:>8}: {seconds * 1000:8.2f} ms/response")
+
+
+if __name__ == "__main__":
+    main()
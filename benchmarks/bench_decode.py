@@ -0,0 +1,70 @@
+"""Compare response decoding pipelines on a scaled-up ConsolidatedRefresh response.
+
+Run from repository root: python benchmarks/bench_decode.py [MACHINE_COUNT]
+"""
+
+from __future__ import annotations
+
+import base64
+import gzip
+import json
+import sys
+import timeit
+import tracemalloc
+
+from payloads import build_raw_response
+
+from pylaundry.codec import JsonCodec
+from pylaundry.helpers import MessagePacker
+
+
+def decode_legacy(raw_response: bytes) -> dict:
+    """Decode response the way pylaundry did before bytes-native decoding."""
+
+    raw_text = raw_response.decode()
+    response_content = dict(json.loads(raw_text))["Response"]
+    decoded = base64.standard_b64decode(response_content)
+    return dict(json.loads(str(gzip.decompress(decoded), "utf-8")))
+
+
+def decode_current(raw_response: bytes) -> dict | None:
+    """Decode response using current pipeline."""
+
+    # Same codec as the legacy path so that only the pipelines are compared. See bench_codec.py for codecs.
+    return MessagePacker.unpack_server_response(
+        MessagePacker.extract_response_content(raw_response),  # type: ignore
+        codec=JsonCodec(),
+    )
+
+
+def peak_memory(func: object, raw_response: bytes) -> int:
+    """Return peak traced allocation size while running func."""
+
+    tracemalloc.start()
+    func(raw_response)  # type: ignore
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def main() -> None:
+    """Run benchmark."""
+
+    machine_count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    raw_response = build_raw_response(machine_count)
+
+    assert decode_legacy(raw_response) == decode_current(raw_response)
+
+    print(f"{machine_count} machines, {len(raw_response)} byte response")
+
+    for name, func in [("legacy", decode_legacy), ("current", decode_current)]:
+        runs = 20
+        seconds = timeit.timeit(lambda f=func: f(raw_response), number=runs) / runs
+        print(
+            f"{name:>8}: {seconds * 1000:8.2f} ms/response,"
+            f" peak {peak_memory(func, raw_response) / 1024:10.0f} KiB"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+"""Benchmark fixtures."""
+
+# pylint: disable = redefined-outer-name, protected-access
+
+import asyncio
+from collections.abc import Generator
+
+import aiohttp
+import pytest
+
+from pylaundry import Laundry
+
+
+@pytest.fixture  # type: ignore
+def loop() -> Generator:
+    """Yield event loop for benchmarks that drive coroutines by hand."""
+
+    # pytest-benchmark times synchronous callables, so async code under test is run with run_until_complete().
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.fixture  # type: ignore
+def laundry(loop: asyncio.AbstractEventLoop) -> Generator:
+    """Yield controller with its own websession."""
+
+    async def build() -> Laundry:
+        return Laundry(websession=aiohttp.ClientSession())
+
+    laundry = loop.run_until_complete(build())
+    yield laundry
+    loop.run_until_complete(laundry._websession.close())
@@ -0,0 +1,95 @@
+"""Synthetic ConsolidatedRefresh payloads for large rooms, built from the recorded sample response.
+
+Run from repository root to write packed responses to disk: python benchmarks/payloads.py [MACHINE_COUNT ...]
+"""
+
+from __future__ import annotations
+
+import copy
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+import json
+from pathlib import Path
+import random
+import sys
+import uuid
+
+from pylaundry.helpers import MessagePacker
+
+SAMPLE_PATH = (
+    Path(__file__).parent.parent
+    / "tests"
+    / "http_bodies"
+    / "consolidated_refresh__response__success.json"
+)
+
+MACHINE_COUNTS = (10, 1_000, 50_000)
+
+BUSY_FRACTION = 0.4
+OFFLINE_FRACTION = 0.02
+
+
+def build_refresh_response(
+    machine_count: int, seed: int = 0, now: datetime | None = None
+) -> dict:
+    """Return ConsolidatedRefresh response content with machine_count machines."""
+
+    # Machines are copied from the sample round-robin, then given unique IDs, labels and serials. Status is randomized
+    # (seeded) so that busy/idle/offline machines and state ages are mixed the way they are in a real room.
+
+    rng = random.Random(seed)  # nosec
+    now = now or datetime.now(timezone.utc)
+
+    sample = json.loads(SAMPLE_PATH.read_text())
+    sample_machines = sample["MachinesInformation"]["Machines"]
+
+    machines = []
+    for i in range(machine_count):
+        machine = copy.copy(sample_machines[i % len(sample_machines)])
+
+        busy = rng.random() < BUSY_FRACTION
+        state_age = timedelta(seconds=rng.randrange(0, 3600))
+
+        machine.update(
+            {
+                "ReaderID": str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+                "Label": f"{i + 1:02d}",
+                "SerialNumber": f"{10010000 + i}",
+                "BluetoothMacAddress": f"{rng.getrandbits(48):012X}",
+                "IsBusy": busy,
+                "IsOnline": rng.random() >= OFFLINE_FRACTION,
+                "MinutesRemaining": rng.randrange(1, 75) if busy else 0,
+                "StateDateTimeUtc": (now - state_age).strftime("%Y-%m-%dT%H:%M:%SZ"),
+            }
+        )
+        machines.append(machine)
+
+    sample["MachinesInformation"]["Machines"] = machines
+
+    for group in sample["MachineGroupsInformation"]["Groups"]:
+        group["Readers"] = [group["Readers"][0]] * machine_count
+
+    return dict(sample)
+
+
+@lru_cache(maxsize=len(MACHINE_COUNTS))
+def build_raw_response(machine_count: int) -> bytes:
+    """Return packed server response with machine_count machines, as received over the wire."""
+
+    return MessagePacker.pack_server_response(build_refresh_response(machine_count))
+
+
+def main() -> None:
+    """Write packed responses to benchmarks/payloads/."""
+
+    output_dir = Path(__file__).parent / "payloads"
+    output_dir.mkdir(exist_ok=True)
+
+    for machine_count in [int(arg) for arg in sys.argv[1:]] or MACHINE_COUNTS:
+        path = output_dir / f"consolidated_refresh__{machine_count}.json"
+        path.write_bytes(build_raw_response(machine_count))
+        print(f"{path}: {path.stat().st_size} bytes")
+
+
+if __name__ == "__main__":
+    main()
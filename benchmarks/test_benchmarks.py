@@ -0,0 +1,122 @@
+"""pytest-benchmark suite for the request/response hot paths.
+
+Not part of the regular test run. Run from repository root and save results as JSON:
+
+    pytest benchmarks --benchmark-json=benchmark.json
+
+Compare against a previous run with --benchmark-compare, or save runs under .benchmarks/ with --benchmark-autosave and
+compare them with pytest-benchmark compare.
+"""
+
+# pylint: disable=protected-access
+
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timezone
+
+from aioresponses import aioresponses
+from payloads import MACHINE_COUNTS, build_raw_response, build_refresh_response
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from pylaundry import Laundry
+from pylaundry.helpers import MessagePacker
+
+FIRST_REQUEST_ID = "0c4f2a3e-58f4-4b8e-9a0d-5e6d3a1f7b21"
+NEW_REQUEST_ID = "7d1e9b42-3c6a-4f0e-8b2d-1a9c4e5f6b73"
+
+REFRESH_REQUEST = [
+    "ConsolidatedRefresh",
+    "1d6c2bb3a4bfb1ff7b5c1d0f6e0f7e14",
+    "dcba1bd5-32cf-5629-ad9a-cbf0b9a2f2ff",
+    "a2250323-3439-5d5c-8f48-1742771f1225",
+    "ffc22b96-f55b-5b8c-b376-25cbed2275b8",
+]
+
+machine_counts = pytest.mark.parametrize(
+    "machine_count", MACHINE_COUNTS, ids=lambda count: f"{count}_machines"
+)
+
+
+def test__pack_client_request(benchmark: BenchmarkFixture) -> None:
+    """Benchmark packing a ConsolidatedRefresh request."""
+
+    benchmark(
+        MessagePacker.pack_client_request,
+        REFRESH_REQUEST,
+        first_request_id=FIRST_REQUEST_ID,
+    )
+
+
+@machine_counts
+def test__unpack_server_response(
+    benchmark: BenchmarkFixture, machine_count: int
+) -> None:
+    """Benchmark unpacking a ConsolidatedRefresh response."""
+
+    response_content = MessagePacker.extract_response_content(
+        build_raw_response(machine_count)
+    )
+
+    result = benchmark(MessagePacker.unpack_server_response, response_content)
+
+    assert len(result["MachinesInformation"]["Machines"]) == machine_count
+
+
+@pytest.mark.parametrize(
+    "first_request_id", [None, FIRST_REQUEST_ID], ids=["preauth", "session"]
+)
+def test__generate_aes_key(
+    benchmark: BenchmarkFixture, first_request_id: str | None
+) -> None:
+    """Benchmark AES key derivation."""
+
+    benchmark(
+        MessagePacker._generate_aes_key,
+        new_request_id=NEW_REQUEST_ID,
+        first_request_id=first_request_id,
+    )
+
+
+@machine_counts
+def test__process_machine_data(
+    benchmark: BenchmarkFixture, laundry: Laundry, machine_count: int
+) -> None:
+    """Benchmark ingesting machine status into an already populated controller, as on every refresh."""
+
+    now = datetime.now(timezone.utc)
+    machines_info = build_refresh_response(machine_count, now=now)[
+        "MachinesInformation"
+    ]
+
+    laundry._process_machine_data(machines_info, now=now)
+
+    benchmark(laundry._process_machine_data, machines_info, now=now)
+
+    assert len(laundry.machines) == machine_count
+
+
+@machine_counts
+def test__send_request__round_trip(
+    benchmark: BenchmarkFixture,
+    loop: asyncio.AbstractEventLoop,
+    laundry: Laundry,
+    machine_count: int,
+) -> None:
+    """Benchmark packing, sending (to a mocked transport) and unpacking a ConsolidatedRefresh."""
+
+    raw_response = build_raw_response(machine_count)
+
+    laundry._first_request_id = FIRST_REQUEST_ID
+
+    with aioresponses() as response_mocker:
+        response_mocker.post(
+            url=laundry.endpoint_url, status=200, body=raw_response, repeat=True
+        )
+
+        result = benchmark(
+            lambda: loop.run_until_complete(laundry._send_request(REFRESH_REQUEST))
+        )
+
+    assert len(result["MachinesInformation"]["Machines"]) == machine_count
@@ -6,7 +6,6 @@ import asyncio
 import aiohttp
 
 from pylaundry import Laundry
-from pylaundry.exceptions import CommunicationError
 
 USERNAME = "YOUR_USERNAME"
 PASSWORD = "YOUR_PASSWORD"
@@ -28,10 +27,10 @@ async def main() -> None:
 
         await laundry.async_refresh()
 
-        for machine_id in laundry.machines:
-            try:
-                await laundry.async_get_topoff_data(machine_id=machine_id)
-            except CommunicationError:
+        topoff_results = await laundry.async_get_all_topoff_data()
+
+        for machine_id, result in topoff_results.items():
+            if isinstance(result, Exception):
                 print(f"Could not get topoff price for machine {machine_id}.")
 
         print(laundry.machines)
@@ -3,21 +3,25 @@
 from __future__ import annotations
 
 import asyncio
-from dataclasses import dataclass
+from collections.abc import Hashable, Mapping
 from datetime import datetime, timezone
-from enum import Enum
 import hashlib
-import json
 import logging
+import math
+import time
+from typing import TYPE_CHECKING
 import uuid
 
-import aiohttp
-import dateutil.parser
-
+from .cache import ResponseCache
+from .codec import DEFAULT_CODEC, JsonCodec
 from .const import (
     API_ENDPOINT_URL,
     APPKEY,
     AUTH_TOKEN_KEY,
+    DEFAULT_BASE_TIME_MIN,
+    DEFAULT_TOPOFF_CONCURRENCY,
+    DEFAULT_TOPOFF_TIME_MIN,
+    DEFAULT_VEND_CONCURRENCY,
     EMPTY_AUTH_TOKEN,
     LOG_LEVEL_TRACE,
     REFRESH_REQUEST_PREHASH_SUFFIX,
@@ -28,6 +32,7 @@ from .const import (
 from .exceptions import (
     AuthenticationError,
     CommunicationError,
+    InsufficientFunds,
     MachineNotFound,
     MachineOffline,
     NotLoggedIn,
@@ -37,67 +42,107 @@ from .exceptions import (
     VendFailure,
     VendLogFailure,
 )
-from .helpers import MessagePacker
+from .events import (
+    DEFAULT_EVENT_QUEUE_SIZE,
+    BalanceChanged,
+    EventHub,
+    LaundryEvent,
+    OverflowPolicy,
+    Subscription,
+    machine_events,
+)
+from .helpers import MessagePacker, PackingContext, parse_utc_timestamp
+from .history import MachineHistory
+from .index import MachineIndex
+from .metrics import MetricsRegistry
+from .models import (
+    LaundryMachine,
+    LaundryProfile,
+    MachineChanges,
+    MachineType,
+    VendOutcome,
+    VendStatus,
+)
+from .resilience import Resilience
+from .session import SessionState
+from .singleflight import SingleFlight
+from .table import MachineTable
+from .trace import Tracer
+
+if TYPE_CHECKING:
+    # aiohttp is only needed once a request is sent. Tools that just pack/unpack messages or read models shouldn't pay
+    # for importing the network stack.
+    import aiohttp
 
 __version__ = "v0.1.5"
 
 log = logging.getLogger(__name__)
 
 
-class MachineType(Enum):
-    """Laundry machine types."""
+class Laundry:
+    """pylaundry's controller."""
 
-    WASHER = "Washer"
-    DRYER = "Dryer"
-    UNKNOWN = "Unknown"
+    profile: LaundryProfile
+    machines: dict[str, LaundryMachine]
+    machine_changes: MachineChanges
+    encryption_keys: list[str]
 
+    def __init__(
+        self,
+        websession: aiohttp.ClientSession,
+        codec: JsonCodec | None = None,
+        cache: ResponseCache | None = None,
+        resilience: Resilience | None = None,
+        endpoint_url: str = API_ENDPOINT_URL,
+        metrics: MetricsRegistry | None = None,
+        history: MachineHistory | None = None,
+    ) -> None:
+        """Initialize pylaundry. Uses orjson to parse responses if installed unless another codec is provided."""
 
-@dataclass
-class LaundryMachine:
-    """Representation of a washer or dryer."""
+        self._websession: aiohttp.ClientSession = websession
 
-    id_: str
-    type: MachineType
-    number: str
-    busy: bool | None
-    minutes_remaining: int | None
-    base_price: float | None
-    topoff_price: float | None
-    topoff_time_min: int | None
-    online: bool | None
-    reader_serial: str | None
+        # Point at a pylaundry.simulator.LaundrySimulator to exercise the full client offline.
+        self.endpoint_url = endpoint_url
+        self._codec: JsonCodec = codec or DEFAULT_CODEC
 
+        # Caches slow-changing responses (topoff prices, encryption keys). Pass ResponseCache(max_size=0) to disable.
+        self.cache: ResponseCache = cache if cache is not None else ResponseCache()
+        self._single_flight = SingleFlight()
 
-@dataclass
-class LaundryProfile:
-    """Metadata for location and user's virtual card."""
+        # Optional rate limiting, retries and circuit breaking. Share one instance among controllers to limit their
+        # combined traffic.
+        self.resilience = resilience
 
-    location_address: str
-    card_balance: float
-    user_id: str
-    user_token: str
-    location_id: str
-    database_id: str | None
-    card_serial: str | None
+        self._first_request_id: str | None = None
+        self._auth_token: str = EMPTY_AUTH_TOKEN
+        self._packing_context: PackingContext | None = None
 
+        # Stage timing can be switched on at runtime with tracer.timing_enabled = True.
+        self.tracer = Tracer()
 
-class Laundry:
-    """pylaundry's controller."""
+        # Optional request counters and latency histograms. Share one instance among controllers to aggregate them.
+        self.metrics = metrics
 
-    profile: LaundryProfile
-    machines: dict
-    encryption_keys: list[str]
+        # Optional per-machine state history, recorded after every machine data update.
+        self.history = history
 
-    def __init__(self, websession: aiohttp.ClientSession) -> None:
-        """Initialize pylaundry."""
+        # Kept in sync with machines for availability and label lookups without scanning.
+        self.index = MachineIndex()
 
-        self._websession: aiohttp.ClientSession = websession
-        self._first_request_id: str | None = None
-        self._auth_token: str = EMPTY_AUTH_TOKEN
+        # Events are only computed while someone is watching.
+        self._event_hub = EventHub()
 
         self._username: str | None = None
         self._password: str | None = None
 
+        # Incremented whenever the session is reset or replaced. Lets a request that failed under an old session tell
+        # whether someone else already re-logged in. Lock is created lazily so that Laundry can be built outside of a
+        # running event loop.
+        self._session_generation = 0
+        self._relogin_lock: asyncio.Lock | None = None
+        self._relogin_task: asyncio.Task | None = None
+        self._vend_locks: dict[str, asyncio.Lock] = {}
+
         self.installation_token = str(uuid.uuid4())
 
     async def async_login(self, username: str, password: str) -> None:
@@ -120,7 +165,7 @@ class Laundry:
                 ),
             ]
 
-            response = await self._send_request(json.dumps(request_data))
+            response = await self._send_request(request_data)
 
         except (
             CommunicationError,
@@ -130,6 +175,10 @@ class Laundry:
         ) as err:
             raise err
 
+        self._session_generation += 1
+
+        old_balance = self.profile.card_balance if hasattr(self, "profile") else None
+
         self._process_machine_data(
             response.get("Bundle", {}).get("MachinesInformation", {})
         )
@@ -160,6 +209,89 @@ class Laundry:
             user_token=user_token,
         )
 
+        # Only a re-login can change a known balance.
+        if old_balance is not None:
+            self._publish_balance_change(old_balance)
+
+    def export_session(self) -> SessionState:
+        """Return current session state for persisting across restarts."""
+
+        if self._auth_token == EMPTY_AUTH_TOKEN:
+            raise NotLoggedIn
+
+        return SessionState(
+            installation_token=self.installation_token,
+            first_request_id=self._first_request_id,
+            auth_token=self._auth_token,
+            profile=self.profile,
+            machines=list(self.machines.values()),
+        )
+
+    def import_session(self, state: SessionState) -> None:
+        """Adopt previously exported session state. Credentials must be set separately (see async_resume())."""
+
+        self.installation_token = state.installation_token
+        self._first_request_id = state.first_request_id
+        self._auth_token = state.auth_token
+        self._session_generation += 1
+        self.profile = state.profile
+        self.machines = {machine.id_: machine for machine in state.machines}
+        self.machine_changes = MachineChanges()
+        self.index.rebuild(self.machines.values())
+
+    async def async_resume(
+        self, username: str, password: str, state: SessionState | None
+    ) -> bool:
+        """Resume saved session with a refresh, falling back to a full login. Returns whether session was resumed."""
+
+        # Credentials are kept for the login fallback here and for re-logins in _send_request().
+        self._username = username
+        self._password = password
+
+        if state is not None:
+            self.import_session(state)
+
+            try:
+                await self.async_refresh()
+            except (
+                AuthenticationError,
+                NotLoggedIn,
+                Rejected,
+                ResponseFormatError,
+                UnexpectedError,
+            ) as err:
+                log.info("Saved session rejected (%r). Logging in.", err)
+            else:
+                log.debug("Resumed saved session.")
+                return True
+
+            self._first_request_id = None
+            self._auth_token = EMPTY_AUTH_TOKEN
+
+        await self.async_login(username=username, password=password)
+
+        return False
+
+    def watch(
+        self,
+        max_queue_size: int = DEFAULT_EVENT_QUEUE_SIZE,
+        overflow: OverflowPolicy = OverflowPolicy.DROP_OLDEST,
+    ) -> Subscription:
+        """Subscribe to state change events, e.g.: async for event in laundry.watch(). See Subscription for overflow."""
+
+        # Subscribes immediately (not on first iteration), so nothing published after this call is missed.
+        return self._event_hub.subscribe(max_queue_size, overflow)
+
+    def next_available(self, machine_type: MachineType) -> LaundryMachine | None:
+        """Return an idle machine of a type, or else the busy one finishing soonest. Offline machines are skipped."""
+        return self.index.next_available(machine_type)
+
+    def machine_by_label(
+        self, label: str, machine_type: MachineType | None = None
+    ) -> LaundryMachine | None:
+        """Return machine by printed label, e.g.: machine_by_label("Dryer 12") or machine_by_label("12", MachineType.DRYER)."""
+        return self.index.by_label(label, machine_type)
+
     async def async_get_encryption_keys(self) -> None:
         """Get encryption keys from server."""
 
@@ -170,26 +302,34 @@ class Laundry:
 
         request_data = ["GetAdditionalInformation", APPKEY]
 
-        response = await self._send_request(json.dumps(request_data))
+        response = await self._send_read_request(request_data)
 
         if len(values := response.get("Values", [])) > 0 and isinstance(values, list):
             self.encryption_keys = values
         else:
             log.error("Failed to retrieve encryption keys.")
 
-    async def async_refresh(self) -> None:
-        """Get updated machine status."""
+    async def async_refresh(self) -> MachineChanges:
+        """Get updated machine status. Returns IDs of machines that changed."""
 
         if self._auth_token == EMPTY_AUTH_TOKEN:
             raise NotLoggedIn
 
+        # Concurrent callers share the whole refresh, including processing, so that they all get the same changes.
+        return await self._single_flight.run("async_refresh", self._async_refresh)
+
+    async def _async_refresh(self) -> MachineChanges:
+        """Send refresh request and process response."""
+
         request_data = [
             "ConsolidatedRefresh",
             self.profile.user_token,
             self.profile.user_id,
         ]
 
-        response = await self._send_request(json.dumps(request_data))
+        response = await self._send_request(request_data)
+
+        old_balance = self.profile.card_balance
 
         # Refresh card balance.
         self.profile.card_balance = (
@@ -199,7 +339,11 @@ class Laundry:
         )
 
         # Refresh machine status.
-        self._process_machine_data(response.get("MachinesInformation", {}))
+        changes = self._process_machine_data(response.get("MachinesInformation", {}))
+
+        self._publish_balance_change(old_balance)
+
+        return changes
 
     async def async_get_topoff_data(self, machine_id: str) -> dict | None:
         """Get topoff price for single machine, then update machine with price."""
@@ -214,26 +358,73 @@ class Laundry:
 
         machine: LaundryMachine = self.machines[machine_id]
 
-        request_data = [
-            "GetVendPrice",
-            self.profile.user_token,
-            self.profile.database_id,
-            machine.reader_serial,
-        ]
-
         try:
-            response = await self._send_request(json.dumps(request_data))
+            response = await self._async_get_vend_price(machine)
         except MachineOffline as err:
             raise err
 
+        old_topoff_price = machine.topoff_price
+
         machine.topoff_price = response.get("TopoffPrice")
         machine.topoff_time_min = response.get("TopoffTime")
 
+        if self._event_hub and machine.topoff_price != old_topoff_price:
+            self._event_hub.publish(
+                machine_events(machine, {"topoff_price": old_topoff_price}, time.time())
+            )
+
         return {
             "price": response.get("TopoffPrice"),
             "time": response.get("TopoffTime"),
         }
 
+    async def _async_get_vend_price(self, machine: LaundryMachine) -> dict:
+        """Get machine's GetVendPrice response."""
+
+        request_data = [
+            "GetVendPrice",
+            self.profile.user_token,
+            self.profile.database_id,
+            machine.reader_serial,
+        ]
+
+        return await self._send_read_request(request_data, cache_key=machine.id_)
+
+    async def async_get_all_topoff_data(
+        self, max_concurrency: int = DEFAULT_TOPOFF_CONCURRENCY
+    ) -> dict[str, dict | Exception]:
+        """Get topoff prices for all dryers concurrently, then update machines with prices."""
+
+        # Results are keyed by machine ID. Failures (e.g.: MachineOffline) are returned in place of the price dict so that one bad machine doesn't abort the batch.
+
+        if self._auth_token == EMPTY_AUTH_TOKEN:
+            raise NotLoggedIn
+
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def get_topoff_data(machine_id: str) -> dict | Exception:
+            async with semaphore:
+                try:
+                    return await self.async_get_topoff_data(machine_id)  # type: ignore
+                except Exception as err:  # pylint: disable=broad-except
+                    log.debug("Failed to get topoff data for %s: %r", machine_id, err)
+                    return err
+
+        dryer_ids = [
+            machine_id
+            for machine_id, machine in self.machines.items()
+            if machine.type is MachineType.DRYER
+        ]
+
+        results = await asyncio.gather(*map(get_topoff_data, dryer_ids))
+
+        return dict(zip(dryer_ids, results))
+
+    def machine_table(self) -> MachineTable:
+        """Return snapshot of machine states in columnar form."""
+
+        return MachineTable.from_machines(self.machines.values())
+
     async def _async_log_vend(
         self, machine_id: str, error_code: int, vend_success: bool
     ) -> None:
@@ -267,7 +458,7 @@ class Laundry:
             machine.base_price,  # Always base price, even when topping off
         ]
 
-        response = await self._send_request(json.dumps(request_data))
+        response = await self._send_request(request_data)
 
         if response.get("ResultCode") != 1:
             log.error("Failed to log vend. Response: %s", response)
@@ -290,7 +481,7 @@ class Laundry:
         ]
 
         try:
-            response = await self._send_request(json.dumps(request_data))
+            response = await self._send_request(request_data)
         except (
             UnexpectedError,
             ResponseFormatError,
@@ -306,6 +497,9 @@ class Laundry:
 
         log.debug("Vend successful.")
 
+        # Price may change once machine is running. Don't serve stale topoff data.
+        self.cache.invalidate("GetVendPrice", machine.id_)
+
         # Bypassing log. See note in _async_log_vend() for details.
 
         # try:
@@ -324,13 +518,166 @@ class Laundry:
         #     log.error("Error logging vend.")
         #     raise VendLogFailure from err
 
-    def _process_machine_data(self, machines_info_object: dict) -> None:
+    async def async_add_time(self, machine_id: str, minutes: int) -> list[VendOutcome]:
+        """Vend dryer as many times as needed to add at least minutes, starting a cycle first if it's idle."""
+
+        if minutes <= 0:
+            raise ValueError("minutes must be positive.")
+
+        if (machine := self.machines.get(machine_id)) is None:
+            raise MachineNotFound(machine_id)
+
+        if machine.type is not MachineType.DRYER:
+            raise ValueError("Only dryers can be topped off.")
+
+        if self._auth_token == EMPTY_AUTH_TOKEN:
+            raise NotLoggedIn
+
+        response = await self._async_get_vend_price(machine)
+
+        topoff_time_min = response.get("TopoffTime") or DEFAULT_TOPOFF_TIME_MIN
+
+        if machine.busy:
+            vend_count = math.ceil(minutes / topoff_time_min)
+        else:
+            base_time_min = response.get("BaseTime") or DEFAULT_BASE_TIME_MIN
+            vend_count = 1 + math.ceil(
+                max(0, minutes - base_time_min) / topoff_time_min
+            )
+
+        return (await self.async_vend_many({machine_id: vend_count}))[machine_id]
+
+    async def async_vend_many(
+        self,
+        vend_counts: Mapping[str, int],
+        max_concurrency: int = DEFAULT_VEND_CONCURRENCY,
+    ) -> dict[str, list[VendOutcome]]:
+        """Vend machines the given number of times, e.g.: {dryer_id: 3, washer_id: 1}. Returns outcomes by machine ID."""
+
+        # Idle machines are started, then topped off with their remaining vends. Busy machines are only topped off.
+        #
+        # Each machine's vends run strictly in order, each only after the previous one succeeded. Once a vend fails, the
+        # machine's remaining vends are skipped rather than retried: a vend that timed out may still have gone through.
+        # Machines are vended concurrently, with no refreshes in between, so the batch takes about as long as the
+        # longest single machine's sequence.
+        #
+        # The whole batch's cost is checked against card balance before anything is vended. Costs are based on the last
+        # refresh, so a machine that changed state since then may be charged differently.
+
+        if self._auth_token == EMPTY_AUTH_TOKEN:
+            raise NotLoggedIn
+
+        for machine_id, vend_count in vend_counts.items():
+            if machine_id not in self.machines:
+                raise MachineNotFound(machine_id)
+
+            if vend_count < 1:
+                raise ValueError("Vend counts must be at least 1.")
+
+        prices = await asyncio.gather(
+            *(
+                self._async_plan_vends(self.machines[machine_id], vend_count)
+                for machine_id, vend_count in vend_counts.items()
+            )
+        )
+        plans = dict(zip(vend_counts, prices))
+
+        total_price = round(
+            sum(price or 0 for plan in plans.values() for price in plan), 2
+        )
+
+        if (balance := self.profile.card_balance) is not None and total_price > balance:
+            raise InsufficientFunds(
+                f"Vends cost {total_price:.2f}, but card balance is {balance:.2f}."
+            )
+
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def vend_machine(
+            machine_id: str, plan: list[float | None]
+        ) -> list[VendOutcome]:
+            outcomes: list[VendOutcome] = []
+
+            async with semaphore, self._vend_lock(machine_id):
+                for sequence, price in enumerate(plan):
+                    if outcomes and outcomes[-1].status is not VendStatus.SUCCEEDED:
+                        outcomes.append(
+                            VendOutcome(machine_id, sequence, price, VendStatus.SKIPPED)
+                        )
+                        continue
+
+                    try:
+                        await self.async_vend(machine_id)
+                    except Exception as err:  # pylint: disable=broad-except
+                        log.debug("Vend %s of %s failed: %r", sequence, machine_id, err)
+                        outcomes.append(
+                            VendOutcome(
+                                machine_id, sequence, price, VendStatus.FAILED, err
+                            )
+                        )
+                    else:
+                        outcomes.append(
+                            VendOutcome(
+                                machine_id, sequence, price, VendStatus.SUCCEEDED
+                            )
+                        )
+
+            return outcomes
+
+        results = await asyncio.gather(*(map(vend_machine, plans, plans.values())))
+
+        return dict(zip(plans, results))
+
+    async def _async_plan_vends(
+        self, machine: LaundryMachine, vend_count: int
+    ) -> list[float | None]:
+        """Return expected price of each of a machine's vends."""
+
+        starts_cycle = not machine.busy
+        topoff_count = vend_count - 1 if starts_cycle else vend_count
+
+        if topoff_count and machine.type is not MachineType.DRYER:
+            raise ValueError(f"Machine {machine.id_} can't be topped off.")
+
+        topoff_price = (
+            (await self._async_get_vend_price(machine)).get("TopoffPrice")
+            if topoff_count
+            else None
+        )
+
+        return ([machine.base_price] if starts_cycle else []) + [
+            topoff_price
+        ] * topoff_count
+
+    def _vend_lock(self, machine_id: str) -> asyncio.Lock:
+        """Return lock serializing multi-vends of a machine."""
+
+        # Keeps two overlapping async_vend_many() calls from interleaving vends on the same machine.
+        if (lock := self._vend_locks.get(machine_id)) is None:
+            lock = self._vend_locks[machine_id] = asyncio.Lock()
+
+        return lock
+
+    def _process_machine_data(
+        self, machines_info_object: dict, now: datetime | None = None
+    ) -> MachineChanges:
         """Update machine data from API MachinesInformation object."""
 
+        # Existing LaundryMachine objects are updated in place so that references held by consumers stay valid. Topoff data isn't part of this object and is left untouched.
+
         if machines_info_object.get(RESULT_CODE_KEY) != 1:
             log.error("Problem with machines response: %s", machines_info_object)
 
-        machines: dict = {}
+        if not hasattr(self, "machines"):
+            self.machines = {}
+
+        changes = MachineChanges()
+        seen_ids: set[str] = set()
+        events: list[LaundryEvent] = []
+        watching = bool(self._event_hub)
+
+        # Use one reference time for the whole response so that minutes remaining are consistent across machines.
+        now = now or datetime.now(timezone.utc)
 
         machine: dict
         for machine in machines_info_object.get("Machines", []):
@@ -346,8 +693,7 @@ class Laundry:
 
                 # Determine how long ago state was reported.
                 state_age_min = (
-                    datetime.now(timezone.utc)
-                    - dateutil.parser.isoparse(machine["StateDateTimeUtc"])
+                    now - parse_utc_timestamp(machine["StateDateTimeUtc"])
                 ).total_seconds() / 60
 
                 # Adjust minutes remaining by state age.
@@ -355,44 +701,166 @@ class Laundry:
                     0, round(machine.get("MinutesRemaining", 0) - state_age_min)
                 )
 
-                # Don't overwrite topoff data if machine already exists.
-                topoff_price = (
-                    self.machines[machine_id].topoff_price
-                    if hasattr(self, "machines")
-                    else None
-                )
-                topoff_time_min = (
-                    self.machines[machine_id].topoff_time_min
-                    if hasattr(self, "machines")
-                    else None
-                )
-
-                machines[machine_id] = LaundryMachine(
-                    id_=machine["ReaderID"],
-                    type=machine_type,
-                    number=machine["Label"],
-                    busy=minutes_remaining > 0,
-                    minutes_remaining=minutes_remaining,
-                    base_price=machine.get("BasePrice"),
-                    online=bool(is_online)
-                    if (is_online := machine.get("IsOnline")) in [True, False]
-                    else None,
-                    reader_serial=machine.get("SerialNumber"),
-                    topoff_price=topoff_price,
-                    topoff_time_min=topoff_time_min,
-                )
+                state = {
+                    "type": machine_type,
+                    "number": machine["Label"],
+                    "busy": minutes_remaining > 0,
+                    "minutes_remaining": minutes_remaining,
+                    "base_price": machine.get("BasePrice"),
+                    "online": (
+                        bool(is_online)
+                        if (is_online := machine.get("IsOnline")) in [True, False]
+                        else None
+                    ),
+                    "reader_serial": machine.get("SerialNumber"),
+                }
 
             except KeyError:
                 log.error("Failed to retrieve data for a machine: %s", machine)
+                continue
+
+            seen_ids.add(machine_id)
+
+            if (existing := self.machines.get(machine_id)) is None:
+                self.machines[machine_id] = LaundryMachine(
+                    id_=machine_id, topoff_price=None, topoff_time_min=None, **state
+                )
+                changes.added.add(machine_id)
+                continue
 
-        self.machines = machines
+            previous = {}
+            for field_name, value in state.items():
+                if (old_value := getattr(existing, field_name)) != value:
+                    previous[field_name] = old_value
+                    setattr(existing, field_name, value)
 
-    async def _send_request(self, request_json: str, no_retry: bool = False) -> dict:
+            if previous:
+                changes.updated.add(machine_id)
+
+                if watching:
+                    events.extend(machine_events(existing, previous, now.timestamp()))
+
+        for machine_id in self.machines.keys() - seen_ids:
+            del self.machines[machine_id]
+            changes.removed.add(machine_id)
+
+        self.machine_changes = changes
+
+        for machine_id in changes.added | changes.updated:
+            self.index.update(self.machines[machine_id])
+
+        for machine_id in changes.removed:
+            self.index.remove(machine_id)
+
+        if self.history is not None:
+            self.history.record(self.machines.values(), now.timestamp())
+
+        # Published last so that consumers reacting to events see fully updated state.
+        if events:
+            self._event_hub.publish(events)
+
+        return changes
+
+    def _publish_balance_change(self, old_balance: float | None) -> None:
+        """Publish BalanceChanged if card balance differs from old_balance."""
+
+        if self._event_hub and self.profile.card_balance != old_balance:
+            self._event_hub.publish(
+                [BalanceChanged(time.time(), old_balance, self.profile.card_balance)]
+            )
+
+    async def _send_read_request(
+        self, request_data: list, cache_key: Hashable = None
+    ) -> dict:
+        """Send read-only request. Serves response from cache while it's fresh and coalesces identical concurrent requests."""
+
+        # Never use this for vends or anything else with side effects.
+
+        operation = request_data[0]
+
+        if (response := self.cache.get(operation, cache_key)) is not None:
+            return response
+
+        async def send_and_cache() -> dict:
+            response = await self._send_request(request_data)
+            self.cache.set(operation, cache_key, response)
+            return response
+
+        return await self._single_flight.run(tuple(request_data), send_and_cache)
+
+    async def _async_relogin(self, session_generation: int) -> None:
+        """Clear session and log back in, unless the session already changed since session_generation."""
+
+        if self._relogin_lock is None:
+            self._relogin_lock = asyncio.Lock()
+
+        # Concurrent requests that fail under the same session queue up here. Only the first re-logs in. The rest find a
+        # newer generation and go straight to re-sending.
+        async with self._relogin_lock:
+            if self._session_generation != session_generation:
+                return
+
+            self._relogin_task = asyncio.current_task()
+            self._session_generation += 1
+
+            if self.metrics is not None:
+                self.metrics.record_relogin()
+            self._first_request_id = None
+            self._auth_token = EMPTY_AUTH_TOKEN
+
+            try:
+                if not self._username or not self._password:
+                    raise AuthenticationError
+
+                await self.async_login(username=self._username, password=self._password)
+            except Exception as err:
+                raise Rejected("Request failed even after re-trying login.") from err
+            finally:
+                self._relogin_task = None
+
+    async def _send_request(self, request_data: list, no_retry: bool = False) -> dict:
+        """Send request, going through resilience layer if configured."""
+
+        # The re-login request runs inside the resilience call of the request that triggered it. Applying resilience
+        # again would spend extra rate limit tokens and count breaker outcomes twice.
+        if (
+            resilience := self.resilience
+        ) is None or asyncio.current_task() is self._relogin_task:
+            return await self._send_request_once(request_data, no_retry=no_retry)
+
+        return await resilience.async_call(
+            request_data[0],
+            self._username,
+            lambda: self._send_request_once(request_data, no_retry=no_retry),
+        )
+
+    async def _send_request_once(
+        self, request_data: list, no_retry: bool = False
+    ) -> dict:
         """Send submitted request body to server. Handles body formatting and headers and updates session objects."""
 
-        request_id, packed_request_data = MessagePacker.pack_client_request(
-            request_body=request_json,
-            first_request_id=self._first_request_id,
+        # Don't pack with a half-reset session while another request is re-logging in.
+        if (
+            relogin_task := self._relogin_task
+        ) is not None and relogin_task is not asyncio.current_task():
+            async with self._relogin_lock:  # type: ignore
+                pass
+
+        session_generation = self._session_generation
+
+        # Packing context holds precomputed key material for the current session. Rebuild it whenever the session changes.
+        if (
+            packing_context := self._packing_context
+        ) is None or packing_context.first_request_id != self._first_request_id:
+            packing_context = self._packing_context = PackingContext(
+                first_request_id=self._first_request_id, codec=self._codec
+            )
+
+        trace = log.isEnabledFor(LOG_LEVEL_TRACE)
+        timer = self.tracer.start_timer()
+
+        request_id, packed_request_data = packing_context.pack(
+            request_data, timer=timer
         )
 
         if self._first_request_id is None:
@@ -404,26 +872,36 @@ class Laundry:
             "Content-Type": "application/x-www-form-urlencoded",
         }
 
-        log.log(
-            LOG_LEVEL_TRACE, "==============[ BUILDING REQUEST BEGIN ]=============="
-        )
-        log.log(LOG_LEVEL_TRACE, "** REQUEST HEADERS **")
-        log.log(LOG_LEVEL_TRACE, request_headers)
-
         request_body = f"CP_REQ_DATA={packed_request_data}"
 
-        log.log(LOG_LEVEL_TRACE, "** REQUEST BODY **")
-        log.log(LOG_LEVEL_TRACE, request_body)
+        operation = request_data[0]
+        metrics = self.metrics
+        started_at = time.perf_counter() if metrics is not None else 0.0
+
+        if trace:
+            log.log(
+                LOG_LEVEL_TRACE,
+                "==============[ BUILDING REQUEST BEGIN ]==============",
+            )
+            log.log(LOG_LEVEL_TRACE, "** REQUEST HEADERS **")
+            log.log(LOG_LEVEL_TRACE, request_headers)
+            log.log(LOG_LEVEL_TRACE, "** REQUEST BODY **")
+            log.log(LOG_LEVEL_TRACE, request_body)
+            log.log(
+                LOG_LEVEL_TRACE, "==============[ BUILDING REQUEST END ]=============="
+            )
 
-        log.log(LOG_LEVEL_TRACE, "==============[ BUILDING REQUEST END ]==============")
+        # Already imported by whoever built the websession, so this is a dict lookup.
+        import aiohttp  # pylint: disable=import-outside-toplevel,redefined-outer-name
 
         try:
             async with self._websession.post(
-                url=API_ENDPOINT_URL, data=request_body, headers=request_headers
+                url=self.endpoint_url, data=request_body, headers=request_headers
             ) as resp:
 
                 # We can't use resp.json() because server returns JSON object in response with incorrect mimetype. This causes aiohttp to raise an aiohttp.client_exceptions.ContentTypeError exception.
-                raw_response = await resp.text()
+                # Response is kept as bytes all the way through unpacking to avoid extra copies of large payloads.
+                raw_response = await resp.read()
         except (
             asyncio.TimeoutError,
             aiohttp.ClientError,
@@ -431,9 +909,16 @@ class Laundry:
         ) as err:
             log.error("Failed to send request.")
 
+            if metrics is not None:
+                metrics.record_communication_error(operation, len(request_body))
+
             raise CommunicationError from err
 
-        log.log(LOG_LEVEL_TRACE, "RAW SERVER RESPONSE:\n%s\n\n", raw_response)
+        if timer is not None:
+            timer.lap("network")
+
+        if trace:
+            log.log(LOG_LEVEL_TRACE, "RAW SERVER RESPONSE:\n%s\n\n", raw_response)
 
         #
         # Validate response format.
@@ -441,10 +926,7 @@ class Laundry:
 
         # Expected response format is {"Response": PACKED_RESPONSE_CONTENT}
 
-        try:
-            raw_response_json = dict(json.loads(raw_response))
-        except (json.JSONDecodeError, TypeError) as err:
-            raise ResponseFormatError("Server response not a JSON dict.") from err
+        response_content = MessagePacker.extract_response_content(raw_response)
 
         # If auth token is returned, update local.
         if auth_token := resp.headers.get(AUTH_TOKEN_KEY):
@@ -452,17 +934,37 @@ class Laundry:
 
         # Isolate response content
 
-        if not (response_content := raw_response_json.get("Response")):
-            raise UnexpectedError("Couldn't find response content.")
-
         # Unpack response
 
-        unpacked_content = MessagePacker.unpack_server_response(response_content)
+        unpacked_content = (
+            MessagePacker.unpack_server_response(
+                response_content, codec=self._codec, timer=timer
+            )
+            if response_content
+            else None
+        )
+
+        self.tracer.record(operation, timer)
+
+        if metrics is not None:
+            metrics.record_response(
+                operation,
+                time.perf_counter() - started_at,
+                len(request_body),
+                len(raw_response),
+                unpacked_content.get(RESULT_CODE_KEY) if unpacked_content else None,
+            )
+
+        if not response_content:
+            raise UnexpectedError("Couldn't find response content.")
 
         if not unpacked_content:
             raise UnexpectedError("Missing unpacked content.")
 
-        log.log(LOG_LEVEL_TRACE, "UNPACKED RESPONSE CONTENT:\n%s\n\n", unpacked_content)
+        if trace:
+            log.log(
+                LOG_LEVEL_TRACE, "UNPACKED RESPONSE CONTENT:\n%s\n\n", unpacked_content
+            )
 
         response_code = unpacked_content.get(RESULT_CODE_KEY)
 
@@ -474,7 +976,11 @@ class Laundry:
                 (response_code := unpacked_content.get(RESULT_CODE_KEY))
                 == ServerResponseCodes.INVALID_REQUEST
             )
-            or (response_code == ServerResponseCodes.INPUT_MALFORMED and no_retry)
+            or (
+                response_code == ServerResponseCodes.INPUT_MALFORMED
+                # A re-login that's itself rejected as malformed must not try to re-login again.
+                and (no_retry or asyncio.current_task() is self._relogin_task)
+            )
         ):
             log.debug("UNPACKED RESPONSE CONTENT:\n%s\n\n", unpacked_content)
             raise Rejected
@@ -482,18 +988,9 @@ class Laundry:
         if response_code == ServerResponseCodes.INPUT_MALFORMED:
             # This error may occur if the server doesn't like the submitted first_request_id. We should retry once after clearing tokens and logging back in.
 
-            self._first_request_id = None
-            self._auth_token = EMPTY_AUTH_TOKEN
+            await self._async_relogin(session_generation)
 
-            try:
-                if not self._username or not self._password:
-                    raise AuthenticationError
-
-                await self.async_login(username=self._username, password=self._password)
-            except Exception as err:
-                raise Rejected("Request failed even after re-trying login.") from err
-
-            return await self._send_request(request_json=request_json, no_retry=True)
+            return await self._send_request_once(request_data, no_retry=True)
 
         if response_code == ServerResponseCodes.INVALID_CREDENTIALS:
             raise AuthenticationError
@@ -516,8 +1013,9 @@ class Laundry:
             )
             raise UnexpectedError
 
-        log.log(
-            LOG_LEVEL_TRACE, "EXTRACTED RESPONSE CONTENT:\n%s\n\n", unpacked_content
-        )
+        if trace:
+            log.log(
+                LOG_LEVEL_TRACE, "EXTRACTED RESPONSE CONTENT:\n%s\n\n", unpacked_content
+            )
 
         return unpacked_content
@@ -0,0 +1,236 @@
+"""Command-line interface. Run python -m pylaundry --help."""
+
+# Meant for cron-driven checks, so startup stays cheap: the network stack is only imported once a command actually
+# talks to the server, and --session-dir lets repeat runs resume a saved session instead of logging in every time.
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from dataclasses import asdict
+import json
+import os
+import sys
+from typing import TYPE_CHECKING, Any
+
+from .const import API_ENDPOINT_URL
+from .exceptions import (
+    AuthenticationError,
+    CommunicationError,
+    MessagePackerError,
+    NotLoggedIn,
+    Rejected,
+    ResponseFormatError,
+    UnexpectedError,
+)
+from .models import LaundryMachine, MachineChanges
+
+if TYPE_CHECKING:
+    from . import Laundry
+
+ENV_USERNAME = "PYLAUNDRY_USERNAME"
+ENV_PASSWORD = "PYLAUNDRY_PASSWORD"  # nosec
+
+DEFAULT_WATCH_INTERVAL_SEC = 60.0
+
+_ERRORS = (
+    AuthenticationError,
+    CommunicationError,
+    MessagePackerError,
+    NotLoggedIn,
+    Rejected,
+    ResponseFormatError,
+    UnexpectedError,
+)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build argument parser."""
+
+    parser = argparse.ArgumentParser(
+        prog="python -m pylaundry", description="Check Laundry Link machines."
+    )
+    parser.add_argument(
+        "--username", default=os.environ.get(ENV_USERNAME), help=f"or ${ENV_USERNAME}"
+    )
+    parser.add_argument(
+        "--password", default=os.environ.get(ENV_PASSWORD), help=f"or ${ENV_PASSWORD}"
+    )
+    parser.add_argument(
+        "--json", action="store_true", help="print JSON instead of text"
+    )
+    parser.add_argument(
+        "--session-dir", help="save session here and resume it on later runs"
+    )
+    parser.add_argument("--endpoint-url", help="e.g.: a local simulator")
+
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("status", help="show machine status and card balance")
+    commands.add_parser("balance", help="show card balance")
+
+    watch = commands.add_parser(
+        "watch", help="show machine status, then print changes as they happen"
+    )
+    watch.add_argument(
+        "--interval", type=float, default=DEFAULT_WATCH_INTERVAL_SEC, help="seconds"
+    )
+    watch.add_argument(
+        "--count", type=int, help="stop after this many refreshes (default: never)"
+    )
+
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run CLI and return exit code."""
+
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    if not args.username or not args.password:
+        parser.error(
+            f"--username and --password (or ${ENV_USERNAME} and ${ENV_PASSWORD}) are required."
+        )
+
+    try:
+        asyncio.run(_async_run(args))
+    except _ERRORS as err:
+        print(f"Error: {type(err).__name__} {err}".rstrip(), file=sys.stderr)
+        return 1
+    except KeyboardInterrupt:
+        return 130
+
+    return 0
+
+
+async def _async_run(args: argparse.Namespace) -> None:
+    """Connect and run command."""
+
+    # pylint: disable=import-outside-toplevel
+    import aiohttp
+
+    from . import Laundry
+    from .session import FileSessionStore
+
+    store = FileSessionStore(args.session_dir) if args.session_dir else None
+
+    async with aiohttp.ClientSession() as websession:
+        laundry = Laundry(
+            websession=websession, endpoint_url=args.endpoint_url or API_ENDPOINT_URL
+        )
+
+        # Resuming refreshes the saved session, so machine data is current either way.
+        if store is not None:
+            await laundry.async_resume(
+                args.username, args.password, await store.async_load(args.username)
+            )
+        else:
+            await laundry.async_login(username=args.username, password=args.password)
+
+        if args.command == "balance":
+            _print_balance(laundry, args.json)
+        elif args.command == "status":
+            _print_status(laundry, args.json)
+        else:
+            await _async_watch(laundry, args.json, args.interval, args.count)
+
+        if store is not None:
+            await store.async_save(args.username, laundry.export_session())
+
+
+async def _async_watch(
+    laundry: Laundry, as_json: bool, interval_sec: float, count: int | None
+) -> None:
+    """Print status, then changed machines after each refresh."""
+
+    _print_status(laundry, as_json)
+    sys.stdout.flush()
+
+    refreshes = 0
+    while count is None or refreshes < count:
+        await asyncio.sleep(interval_sec)
+
+        # Removed machines are gone from laundry.machines after the refresh, so keep the old objects to report them.
+        previous = dict(laundry.machines)
+        changes = await laundry.async_refresh()
+        refreshes += 1
+
+        _print_changes(laundry, previous, changes, as_json)
+
+
+def _print_balance(laundry: Laundry, as_json: bool) -> None:
+    """Print card balance."""
+
+    if as_json:
+        print(json.dumps({"balance": laundry.profile.card_balance}))
+    else:
+        print(f"Balance: {laundry.profile.card_balance:.2f}")
+
+
+def _print_status(laundry: Laundry, as_json: bool) -> None:
+    """Print card balance and all machines."""
+
+    machines = sorted(laundry.machines.values(), key=lambda machine: machine.number)
+
+    if as_json:
+        print(
+            json.dumps(
+                {
+                    "balance": laundry.profile.card_balance,
+                    "machines": [_machine_to_dict(machine) for machine in machines],
+                }
+            )
+        )
+        return
+
+    _print_balance(laundry, as_json)
+
+    for machine in machines:
+        print(_format_machine(machine))
+
+
+def _print_changes(
+    laundry: Laundry,
+    previous: dict[str, LaundryMachine],
+    changes: MachineChanges,
+    as_json: bool,
+) -> None:
+    """Print one line per added, updated or removed machine."""
+
+    for event, machine_ids, machines in [
+        ("added", changes.added, laundry.machines),
+        ("updated", changes.updated, laundry.machines),
+        ("removed", changes.removed, previous),
+    ]:
+        for machine_id in sorted(machine_ids):
+            machine = machines[machine_id]
+
+            if as_json:
+                print(
+                    json.dumps({"event": event, "machine": _machine_to_dict(machine)}),
+                    flush=True,
+                )
+            else:
+                print(f"{event}: {_format_machine(machine)}", flush=True)
+
+
+def _machine_to_dict(machine: LaundryMachine) -> dict[str, Any]:
+    """Convert machine to JSON-serializable dict."""
+    return {**asdict(machine), "type": machine.type.value}
+
+
+def _format_machine(machine: LaundryMachine) -> str:
+    """Format machine as single line of text."""
+
+    if machine.online is False:
+        state = "offline"
+    elif machine.busy:
+        state = f"busy, {machine.minutes_remaining} min remaining"
+    else:
+        state = "available"
+
+    return f"{machine.number:>4}  {machine.type.value:<7}  {state}"
+
+
+if __name__ == "__main__":
+    sys.exit(main())
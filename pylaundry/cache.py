@@ -0,0 +1,110 @@
+"""Cache for slow-changing server responses."""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from dataclasses import dataclass
+import time
+
+DEFAULT_CACHE_TTLS_SEC: dict[str, float] = {
+    "GetVendPrice": 60 * 60,
+    "GetAdditionalInformation": 24 * 60 * 60,
+}
+DEFAULT_CACHE_MAX_SIZE = 256
+
+
+@dataclass
+class CacheStats:
+    """Response cache counters."""
+
+    hits: int = 0
+    misses: int = 0
+    expirations: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Return fraction of lookups served from cache."""
+
+        return self.hits / lookups if (lookups := self.hits + self.misses) else 0.0
+
+
+class ResponseCache:
+    """Size-bounded LRU cache of unpacked responses with per-operation TTLs."""
+
+    # Entries are keyed by (operation, key), where operation is the request name (e.g.: GetVendPrice) and key identifies
+    # the target (e.g.: machine ID). Operations without a TTL are never cached.
+
+    def __init__(
+        self,
+        ttls_sec: dict[str, float] | None = None,
+        max_size: int = DEFAULT_CACHE_MAX_SIZE,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize cache."""
+
+        self.ttls_sec = dict(DEFAULT_CACHE_TTLS_SEC if ttls_sec is None else ttls_sec)
+        self.max_size = max_size
+        self.stats = CacheStats()
+
+        self._clock = clock
+        self._entries: OrderedDict[tuple[str, Hashable], tuple[float, dict]] = (
+            OrderedDict()
+        )
+
+    def __len__(self) -> int:
+        """Return number of cached entries, including expired entries not yet purged."""
+        return len(self._entries)
+
+    def get(self, operation: str, key: Hashable = None) -> dict | None:
+        """Return cached response or None on miss."""
+
+        if operation not in self.ttls_sec:
+            return None
+
+        if (entry := self._entries.get((operation, key))) is None:
+            self.stats.misses += 1
+            return None
+
+        expires_at, response = entry
+
+        if self._clock() >= expires_at:
+            del self._entries[(operation, key)]
+            self.stats.expirations += 1
+            self.stats.misses += 1
+            return None
+
+        self._entries.move_to_end((operation, key))
+        self.stats.hits += 1
+
+        return response
+
+    def set(self, operation: str, key: Hashable, response: dict) -> None:
+        """Cache response if operation has a TTL."""
+
+        if (ttl := self.ttls_sec.get(operation)) is None or self.max_size < 1:
+            return
+
+        self._entries[(operation, key)] = (self._clock() + ttl, response)
+        self._entries.move_to_end((operation, key))
+
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+
+    def invalidate(self, operation: str | None = None, key: Hashable = None) -> None:
+        """Drop cached entries. With no arguments, clears the cache. With only operation, drops all of its entries."""
+
+        if operation is None:
+            self._entries.clear()
+            return
+
+        if key is not None:
+            self._entries.pop((operation, key), None)
+            return
+
+        for cache_key in [
+            cache_key for cache_key in self._entries if cache_key[0] == operation
+        ]:
+            del self._entries[cache_key]
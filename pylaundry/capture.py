@@ -0,0 +1,467 @@
+"""Bulk decoder for captured Laundry Link traffic.
+
+Streams a HAR capture, decrypts requests and unpacks responses, and writes one JSON object per exchange (NDJSON).
+mitmproxy flows can be exported to HAR first (e.g.: mitmdump -nr flows --set hardump=capture.har). Run with
+`python -m pylaundry.capture --help`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import base64
+from collections import OrderedDict, deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Future
+from dataclasses import dataclass
+from itertools import islice
+import json
+import os
+import sys
+from typing import IO, Any
+
+from .const import AUTH_TOKEN_KEY, EMPTY_AUTH_TOKEN
+from .exceptions import CaptureFormatError, MessagePackerError, ResponseFormatError
+from .helpers import MessagePacker
+
+REQUEST_ID_KEY = "CP_REQ_ID"
+REQUEST_DATA_PREFIX = "CP_REQ_DATA="
+
+DEFAULT_READ_SIZE = 1 << 20
+DEFAULT_BATCH_SIZE = 256
+DEFAULT_MAX_SESSIONS = 100_000
+
+_WHITESPACE = " \t\r\n"
+
+
+@dataclass
+class CapturedExchange:
+    """Request/response pair extracted from a capture, with everything a worker needs to decode it."""
+
+    index: int
+    started: str | None
+    request_id: str
+    auth_token: str | None
+    is_login: bool
+    # Session's first request ID. None for logins (they use the preauth key) and for sessions that started before the
+    # capture did.
+    first_request_id: str | None
+    request_data: str | None
+    response_body: str | None
+
+
+class SessionTracker:
+    """Pairs requests with their session's first request ID by following auth tokens in capture order."""
+
+    # A login's own request ID becomes its session's first request ID. The auth token in the login response (and any
+    # token rotated in later responses) maps back to that ID. Least recently used tokens are dropped beyond max_sessions
+    # so that memory stays bounded on long captures.
+
+    def __init__(self, max_sessions: int = DEFAULT_MAX_SESSIONS) -> None:
+        """Initialize tracker."""
+
+        self.max_sessions = max_sessions
+        self._first_request_ids: OrderedDict[str, str] = OrderedDict()
+
+    def first_request_id(self, auth_token: str) -> str | None:
+        """Return first request ID of session that auth_token belongs to, if known."""
+
+        if (first_request_id := self._first_request_ids.get(auth_token)) is not None:
+            self._first_request_ids.move_to_end(auth_token)
+
+        return first_request_id
+
+    def add_token(self, auth_token: str, first_request_id: str) -> None:
+        """Associate auth token with session."""
+
+        self._first_request_ids[auth_token] = first_request_id
+        self._first_request_ids.move_to_end(auth_token)
+
+        if len(self._first_request_ids) > self.max_sessions:
+            self._first_request_ids.popitem(last=False)
+
+
+class _JsonStream:
+    """Reads JSON values one at a time from a text stream."""
+
+    # Only the current value is held in memory (plus at most one read_size chunk), so documents of any size can be walked
+    # as long as their individual values are reasonably sized.
+
+    def __init__(self, file: IO[str], read_size: int = DEFAULT_READ_SIZE) -> None:
+        """Initialize stream."""
+
+        self._file = file
+        self._read_size = read_size
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+
+    def peek(self) -> str:
+        """Return next non-whitespace character without consuming it, or an empty string at end of input."""
+
+        while True:
+            while (
+                self._pos < len(self._buffer) and self._buffer[self._pos] in _WHITESPACE
+            ):
+                self._pos += 1
+
+            if self._pos < len(self._buffer) or not self._fill():
+                return self._buffer[self._pos : self._pos + 1]
+
+    def expect(self, char: str) -> None:
+        """Consume char, which must be next."""
+
+        if (next_char := self.peek()) != char:
+            raise CaptureFormatError(f"Expected {char!r}, found {next_char!r}.")
+
+        self._pos += 1
+
+    def value(self) -> Any:
+        """Consume and return next value."""
+
+        self.peek()
+
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError as err:
+                # Most likely the value continues past the buffer.
+                if self._fill():
+                    continue
+                raise CaptureFormatError(
+                    "Capture is truncated or not valid JSON."
+                ) from err
+
+            # A number that ends the buffer may continue in the next chunk.
+            if end == len(self._buffer) and isinstance(value, (int, float)):
+                if self._fill():
+                    continue
+
+            self._pos = end
+            return value
+
+    def iter_object(self) -> Iterator[str]:
+        """Consume object, yielding each key. Caller must consume the key's value before resuming."""
+
+        self.expect("{")
+
+        if self.peek() == "}":
+            self._pos += 1
+            return
+
+        while True:
+            key = self.value()
+            self.expect(":")
+
+            yield key
+
+            if self.peek() != ",":
+                self.expect("}")
+                return
+
+            self._pos += 1
+
+    def iter_array(self) -> Iterator[Any]:
+        """Consume array, yielding each item."""
+
+        self.expect("[")
+
+        if self.peek() == "]":
+            self._pos += 1
+            return
+
+        while True:
+            yield self.value()
+
+            if self.peek() != ",":
+                self.expect("]")
+                return
+
+            self._pos += 1
+
+    def _fill(self) -> bool:
+        """Append next chunk to buffer, dropping consumed text. Returns False at end of input."""
+
+        if not (chunk := self._file.read(self._read_size)):
+            return False
+
+        self._buffer = self._buffer[self._pos :] + chunk
+        self._pos = 0
+
+        return True
+
+
+def iter_har_entries(
+    file: IO[str], read_size: int = DEFAULT_READ_SIZE
+) -> Iterator[dict]:
+    """Yield entries of a HAR capture one at a time."""
+
+    stream = _JsonStream(file, read_size)
+
+    for key in stream.iter_object():
+        if key != "log":
+            stream.value()
+            continue
+
+        for log_key in stream.iter_object():
+            if log_key == "entries":
+                yield from stream.iter_array()
+            else:
+                stream.value()
+
+
+def iter_exchanges(
+    entries: Iterable[dict], tracker: SessionTracker | None = None
+) -> Iterator[CapturedExchange]:
+    """Yield Laundry Link exchanges from HAR entries, paired with their sessions. Other traffic is skipped."""
+
+    tracker = tracker or SessionTracker()
+
+    for index, entry in enumerate(entries):
+        request = entry.get("request", {})
+        response = entry.get("response", {})
+        request_headers = _headers(request)
+
+        if (request_id := request_headers.get(REQUEST_ID_KEY.lower())) is None:
+            continue
+
+        auth_token = request_headers.get(AUTH_TOKEN_KEY.lower())
+        is_login = auth_token in (None, "", EMPTY_AUTH_TOKEN)
+
+        if is_login:
+            first_request_id = None
+            session_first_request_id: str | None = request_id
+        else:
+            first_request_id = session_first_request_id = tracker.first_request_id(
+                str(auth_token)
+            )
+
+        if session_first_request_id is not None and (
+            new_auth_token := _headers(response).get(AUTH_TOKEN_KEY.lower())
+        ):
+            tracker.add_token(new_auth_token, session_first_request_id)
+
+        yield CapturedExchange(
+            index=index,
+            started=entry.get("startedDateTime"),
+            request_id=request_id,
+            auth_token=auth_token,
+            is_login=is_login,
+            first_request_id=first_request_id,
+            request_data=_request_data(request),
+            response_body=_response_body(response),
+        )
+
+
+def decode_exchange(exchange: CapturedExchange) -> dict:
+    """Decrypt request and unpack response. Failures are reported in the record's errors list."""
+
+    record: dict[str, Any] = {
+        "index": exchange.index,
+        "started": exchange.started,
+        "request_id": exchange.request_id,
+        "first_request_id": exchange.first_request_id,
+        "operation": None,
+        "request": None,
+        "response": None,
+        "errors": [],
+    }
+
+    if exchange.request_data is None:
+        record["errors"].append("Request body missing.")
+    elif not exchange.is_login and exchange.first_request_id is None:
+        record["errors"].append(
+            "Session started before capture. Can't decrypt request."
+        )
+    else:
+        try:
+            request = json.loads(
+                MessagePacker.unpack_client_request(
+                    exchange.request_data,
+                    new_request_id=exchange.request_id,
+                    first_request_id=exchange.first_request_id,
+                )
+            )
+        except (MessagePackerError, ValueError) as err:
+            record["errors"].append(f"Couldn't decrypt request: {err!r}")
+        else:
+            record["request"] = request
+            if isinstance(request, list) and request:
+                record["operation"] = request[0]
+
+    if exchange.response_body is None:
+        record["errors"].append("Response body missing.")
+    else:
+        try:
+            if response_content := MessagePacker.extract_response_content(
+                exchange.response_body.encode()
+            ):
+                record["response"] = MessagePacker.unpack_server_response(
+                    response_content
+                )
+            else:
+                record["errors"].append("Response has no content.")
+        except (MessagePackerError, ResponseFormatError, ValueError) as err:
+            record["errors"].append(f"Couldn't unpack response: {err!r}")
+
+    return record
+
+
+def decode_capture(
+    input_file: IO[str],
+    output_file: IO[str],
+    max_workers: int | None = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    read_size: int = DEFAULT_READ_SIZE,
+) -> int:
+    """Decode HAR capture into NDJSON, one line per exchange in capture order. Returns number of exchanges written."""
+
+    # Parsing and session pairing are sequential and stay in this process. Decoding is spread across a process pool in
+    # batches. At most two batches per worker are in flight, so memory doesn't grow with capture size.
+
+    batches = _batched(
+        iter_exchanges(iter_har_entries(input_file, read_size=read_size)), batch_size
+    )
+    written = 0
+
+    def write(lines: list[str]) -> None:
+        nonlocal written
+        output_file.writelines(lines)
+        written += len(lines)
+
+    if not max_workers or max_workers < 2:
+        for batch in batches:
+            write(_decode_batch(batch))
+
+        return written
+
+    from concurrent.futures import (  # pylint: disable=import-outside-toplevel
+        ProcessPoolExecutor,
+    )
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        pending: deque[Future[list[str]]] = deque()
+
+        for batch in batches:
+            pending.append(executor.submit(_decode_batch, batch))
+
+            if len(pending) >= 2 * max_workers:
+                write(pending.popleft().result())
+
+        while pending:
+            write(pending.popleft().result())
+
+    return written
+
+
+def _decode_batch(batch: list[CapturedExchange]) -> list[str]:
+    """Decode exchanges into NDJSON lines. Runs in worker processes."""
+
+    return [
+        json.dumps(decode_exchange(exchange), ensure_ascii=False) + "\n"
+        for exchange in batch
+    ]
+
+
+def _batched(
+    items: Iterable[CapturedExchange], size: int
+) -> Iterator[list[CapturedExchange]]:
+    """Yield lists of up to size items."""
+
+    iterator = iter(items)
+
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def _headers(message: dict) -> dict[str, str]:
+    """Return HAR message headers keyed by lowercase name."""
+
+    return {
+        str(header.get("name", "")).lower(): header.get("value")
+        for header in message.get("headers", [])
+    }
+
+
+def _request_data(request: dict) -> str | None:
+    """Return packed CP_REQ_DATA value from HAR request."""
+
+    post_data = request.get("postData", {})
+
+    for param in post_data.get("params") or []:
+        if param.get("name") == "CP_REQ_DATA":
+            return str(param.get("value", ""))
+
+    if (text := post_data.get("text")) is None:
+        return None
+
+    for field in str(text).split("&"):
+        if field.startswith(REQUEST_DATA_PREFIX):
+            # Left URL-encoded. unpack_client_request() decodes it.
+            return field[len(REQUEST_DATA_PREFIX) :]
+
+    return None
+
+
+def _response_body(response: dict) -> str | None:
+    """Return HAR response body as text."""
+
+    content = response.get("content", {})
+
+    if (text := content.get("text")) is None:
+        return None
+
+    if content.get("encoding") == "base64":
+        return str(base64.b64decode(text), "utf-8", errors="replace")
+
+    return str(text)
+
+
+def main() -> None:
+    """Decode capture from the command line."""
+
+    parser = argparse.ArgumentParser(
+        prog="python -m pylaundry.capture",
+        description="Decode captured Laundry Link traffic (HAR) into NDJSON.",
+    )
+    parser.add_argument("capture", help="HAR file, or - for stdin")
+    parser.add_argument("-o", "--output", help="NDJSON file (default: stdout)")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count(),
+        help="decoder processes (default: CPU count; 1 decodes in this process)",
+    )
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    args = parser.parse_args()
+
+    input_file = (
+        sys.stdin
+        if args.capture == "-"
+        else open(args.capture, encoding="utf-8")  # pylint: disable=consider-using-with
+    )
+    output_file = (
+        open(args.output, "w", encoding="utf-8")  # pylint: disable=consider-using-with
+        if args.output
+        else sys.stdout
+    )
+
+    try:
+        count = decode_capture(
+            input_file,
+            output_file,
+            max_workers=args.workers,
+            batch_size=args.batch_size,
+        )
+    except CaptureFormatError as err:
+        parser.exit(1, f"Error: {err}\n")
+    finally:
+        if input_file is not sys.stdin:
+            input_file.close()
+        if output_file is not sys.stdout:
+            output_file.close()
+
+    print(f"Decoded {count} exchanges.", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""JSON codecs for request and response serialization."""
+
+from __future__ import annotations
+
+import json
+from types import ModuleType
+from typing import Any
+
+orjson: ModuleType | None
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+class JsonCodec:
+    """JSON codec backed by the standard library."""
+
+    name = "json"
+
+    # When True, loads() parses UTF-8 bytes without first decoding them to str.
+    parses_bytes = False
+
+    def dumps(self, obj: Any) -> bytes:
+        """Serialize object to UTF-8 encoded JSON."""
+        return bytes(json.dumps(obj), "utf-8")
+
+    def loads(self, data: bytes | bytearray | memoryview | str) -> Any:
+        """Parse JSON document."""
+        return json.loads(data if isinstance(data, (bytes, str)) else bytes(data))
+
+
+class OrjsonCodec(JsonCodec):
+    """JSON codec that parses with orjson."""
+
+    # Requests are still serialized by the standard library. orjson's output is compact and doesn't escape non-ASCII
+    # characters, so using it would change the bytes we send depending on whether orjson happens to be installed.
+    # Request bodies are tiny anyway; responses are where parsing speed matters.
+
+    name = "orjson"
+    parses_bytes = True
+
+    def __init__(self) -> None:
+        """Initialize codec."""
+
+        if orjson is None:
+            raise ImportError(
+                "OrjsonCodec requires orjson. Install with `pip install"
+                " pylaundry[orjson]`."
+            )
+
+        self._loads = orjson.loads
+
+    def loads(self, data: bytes | bytearray | memoryview | str) -> Any:
+        """Parse JSON document."""
+        return self._loads(data)
+
+
+def get_default_codec() -> JsonCodec:
+    """Return fastest available codec."""
+
+    return OrjsonCodec() if orjson is not None else JsonCodec()
+
+
+DEFAULT_CODEC = get_default_codec()
@@ -15,6 +15,14 @@ REFRESH_REQUEST_PREHASH_SUFFIX = (  # Appended to user ID, then MD5 hashed. Used
 )
 EMPTY_AUTH_TOKEN = "00000000-0000-0000-0000-000000000000"  # nosec
 APPKEY = "$#!@ES(*#D3$!318z"
+DEFAULT_TOPOFF_CONCURRENCY = 8  # Max simultaneous GetVendPrice requests.
+TIMESTAMP_CACHE_SIZE = 256  # Distinct machine state timestamps kept parsed.
+DEFAULT_VEND_CONCURRENCY = 4  # Max machines vended simultaneously by async_vend_many().
+
+# Stand-ins for BaseTime / TopoffTime, which the server often reports as zero. One dip starts a 30 minute dryer cycle;
+# every additional dip adds 5 minutes.
+DEFAULT_BASE_TIME_MIN = 30
+DEFAULT_TOPOFF_TIME_MIN = 5
 
 
 class VendResultCodes(IntEnum):
@@ -47,4 +55,12 @@ AES_SUFFIX_PREAUTH = (  # Appended to random request UUID before further process
     "R&%76mhK"
 )
 
+DEFAULT_PACKING_CACHE_SIZE = 32  # Padded request bodies cached per session.
+# Polling requests whose bodies repeat verbatim. Only these are kept in the padded body cache.
+PACKING_CACHE_OPERATIONS = frozenset(
+    {"ConsolidatedRefresh", "GetAdditionalInformation", "GetVendPrice"}
+)
+# Smaller batches aren't worth process pool startup and pickling costs.
+PROCESS_POOL_MIN_BATCH_SIZE = 1000
+
 LOG_LEVEL_TRACE = 5
@@ -0,0 +1,264 @@
+"""Machine and account state change events."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from collections.abc import Iterable
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any
+import weakref
+
+from .exceptions import EventOverflow
+from .models import LaundryMachine
+
+DEFAULT_EVENT_QUEUE_SIZE = 256
+
+
+@dataclass(frozen=True)
+class LaundryEvent:
+    """Base class for events. timestamp is seconds since epoch."""
+
+    timestamp: float
+
+
+@dataclass(frozen=True)
+class BalanceChanged(LaundryEvent):
+    """Card balance changed."""
+
+    old_balance: float | None
+    new_balance: float | None
+
+
+@dataclass(frozen=True)
+class MachineEvent(LaundryEvent):
+    """Base class for events about one machine."""
+
+    machine_id: str
+
+
+@dataclass(frozen=True)
+class CycleStarted(MachineEvent):
+    """Machine became busy."""
+
+    minutes_remaining: int | None
+
+
+@dataclass(frozen=True)
+class CycleFinished(MachineEvent):
+    """Machine stopped being busy."""
+
+
+@dataclass(frozen=True)
+class WentOffline(MachineEvent):
+    """Machine went offline."""
+
+
+@dataclass(frozen=True)
+class CameOnline(MachineEvent):
+    """Offline machine came back online."""
+
+
+@dataclass(frozen=True)
+class PriceChanged(MachineEvent):
+    """Machine's base or topoff price changed. field_name is "base_price" or "topoff_price"."""
+
+    field_name: str
+    old_price: float | None
+    new_price: float | None
+
+
+class OverflowPolicy(Enum):
+    """What a subscription does with a new event when its queue is full."""
+
+    DROP_OLDEST = "drop_oldest"
+    DROP_NEWEST = "drop_newest"
+    DISCONNECT = "disconnect"
+
+
+class Subscription:
+    """One consumer's bounded queue of events. Iterate with async for."""
+
+    # Publishing never waits on consumers, so a slow consumer can't stall polling. Once max_queue_size events are
+    # waiting, the overflow policy decides what's lost: DROP_OLDEST discards the oldest queued event, DROP_NEWEST
+    # discards the new one, and DISCONNECT discards everything and ends the subscription with EventOverflow. Lost events
+    # are counted in dropped. After losing events, resync from Laundry.machines.
+    #
+    # Subscriptions are held weakly by their hub. Breaking out of async for and dropping the subscription unsubscribes
+    # it. Use async with or close() to unsubscribe deterministically, or to end another task's iteration.
+
+    def __init__(
+        self,
+        hub: EventHub,
+        max_queue_size: int = DEFAULT_EVENT_QUEUE_SIZE,
+        overflow: OverflowPolicy = OverflowPolicy.DROP_OLDEST,
+    ) -> None:
+        """Initialize subscription."""
+
+        if max_queue_size < 1:
+            raise ValueError("max_queue_size must be at least 1.")
+
+        self.max_queue_size = max_queue_size
+        self.overflow = overflow
+        self.dropped = 0
+
+        self._hub = hub
+        self._queue: deque[LaundryEvent] = deque()
+        self._waiter: asyncio.Future | None = None
+        self._closed = False
+        self._overflowed = False
+
+    def __len__(self) -> int:
+        """Return number of queued events."""
+        return len(self._queue)
+
+    @property
+    def closed(self) -> bool:
+        """Check whether subscription stopped receiving events."""
+        return self._closed
+
+    def put(self, event: LaundryEvent) -> None:
+        """Queue event, applying overflow policy if queue is full."""
+
+        if self._closed:
+            return
+
+        if len(self._queue) >= self.max_queue_size:
+            if self.overflow is OverflowPolicy.DROP_NEWEST:
+                self.dropped += 1
+                return
+
+            if self.overflow is OverflowPolicy.DISCONNECT:
+                self.dropped += len(self._queue) + 1
+                self._queue.clear()
+                self._overflowed = True
+                self.close()
+                return
+
+            self._queue.popleft()
+            self.dropped += 1
+
+        self._queue.append(event)
+        self._wake()
+
+    def close(self) -> None:
+        """Stop receiving events. Iteration ends once queued events are consumed."""
+
+        self._closed = True
+        self._hub.unsubscribe(self)
+        self._wake()
+
+    def __aiter__(self) -> Subscription:
+        """Return async iterator."""
+        return self
+
+    async def __anext__(self) -> LaundryEvent:
+        """Wait for next event."""
+
+        while not self._queue:
+            if self._overflowed:
+                raise EventOverflow(
+                    f"Subscriber fell {self.max_queue_size} events behind."
+                )
+
+            if self._closed:
+                raise StopAsyncIteration
+
+            self._waiter = asyncio.get_running_loop().create_future()
+
+            try:
+                await self._waiter
+            finally:
+                self._waiter = None
+
+        return self._queue.popleft()
+
+    async def __aenter__(self) -> Subscription:
+        """Enter context manager."""
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        """Close subscription."""
+        self.close()
+
+    def _wake(self) -> None:
+        """Wake consumer waiting in __anext__."""
+
+        if self._waiter is not None and not self._waiter.done():
+            self._waiter.set_result(None)
+
+
+class EventHub:
+    """Fans events out to subscriptions."""
+
+    def __init__(self) -> None:
+        """Initialize hub."""
+        self._subscriptions: weakref.WeakSet[Subscription] = weakref.WeakSet()
+
+    def __len__(self) -> int:
+        """Return number of subscriptions."""
+        return len(self._subscriptions)
+
+    def subscribe(
+        self,
+        max_queue_size: int = DEFAULT_EVENT_QUEUE_SIZE,
+        overflow: OverflowPolicy = OverflowPolicy.DROP_OLDEST,
+    ) -> Subscription:
+        """Return new subscription. Receives events published from now on."""
+
+        subscription = Subscription(self, max_queue_size, overflow)
+        self._subscriptions.add(subscription)
+
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """Remove subscription."""
+        self._subscriptions.discard(subscription)
+
+    def publish(self, events: Iterable[LaundryEvent]) -> None:
+        """Queue events for every subscription."""
+
+        # Copied because DISCONNECT unsubscribes mid-loop.
+        subscriptions = list(self._subscriptions)
+
+        for event in events:
+            for subscription in subscriptions:
+                subscription.put(event)
+
+
+def machine_events(
+    machine: LaundryMachine, previous: dict[str, Any], timestamp: float
+) -> list[LaundryEvent]:
+    """Return events implied by a machine update. previous maps names of changed fields to their old values."""
+
+    events: list[LaundryEvent] = []
+
+    if "busy" in previous:
+        if machine.busy:
+            events.append(
+                CycleStarted(timestamp, machine.id_, machine.minutes_remaining)
+            )
+        elif previous["busy"]:
+            events.append(CycleFinished(timestamp, machine.id_))
+
+    if "online" in previous:
+        if machine.online is False:
+            events.append(WentOffline(timestamp, machine.id_))
+        elif machine.online and previous["online"] is False:
+            events.append(CameOnline(timestamp, machine.id_))
+
+    # A first price (e.g.: topoff price fetched for the first time) isn't a change.
+    for field_name in ("base_price", "topoff_price"):
+        if previous.get(field_name) is not None:
+            events.append(
+                PriceChanged(
+                    timestamp,
+                    machine.id_,
+                    field_name,
+                    previous[field_name],
+                    getattr(machine, field_name),
+                )
+            )
+
+    return events
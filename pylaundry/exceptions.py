@@ -13,6 +13,10 @@ class CommunicationError(Exception):
     """Could not reach server."""
 
 
+class CircuitOpen(CommunicationError):
+    """Request not sent because server was recently failing."""
+
+
 class Rejected(Exception):
     """Server understood but rejected the request."""
 
@@ -37,9 +41,21 @@ class MachineNotFound(Exception):
     """Machine not found."""
 
 
+class InsufficientFunds(VendFailure):
+    """Card balance doesn't cover requested vends."""
+
+
 class VendLogFailure(Exception):
     """Failure logging vend."""
 
 
 class MachineOffline(Exception):
     """Machine not found."""
+
+
+class CaptureFormatError(Exception):
+    """Traffic capture file can't be parsed."""
+
+
+class EventOverflow(Exception):
+    """Event subscriber fell too far behind and was disconnected."""
@@ -0,0 +1,204 @@
+"""Manage many Laundry Link accounts concurrently."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+import logging
+import time
+from typing import Any
+
+import aiohttp
+
+from . import Laundry
+from .metrics import MetricsRegistry
+from .resilience import Resilience
+
+log = logging.getLogger(__name__)
+
+DEFAULT_MAX_CONCURRENCY = 10
+DEFAULT_LOGIN_STAGGER_SEC = 0.1
+DEFAULT_CONNECTOR_LIMIT = 100
+
+
+@dataclass
+class FleetAccount:
+    """Credentials and controller for a single account in a fleet."""
+
+    name: str
+    username: str
+    password: str
+    laundry: Laundry
+
+
+@dataclass
+class FleetResult:
+    """Outcome of a fleet operation for a single account."""
+
+    name: str
+    success: bool
+    duration_sec: float
+    error: Exception | None = None
+
+    # Operation's return value, e.g.: MachineChanges for refreshes.
+    result: Any = None
+
+
+class LaundryFleet:
+    """Owns many Laundry controllers that share one pooled connector."""
+
+    def __init__(
+        self,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        login_stagger_sec: float = DEFAULT_LOGIN_STAGGER_SEC,
+        connector_limit: int = DEFAULT_CONNECTOR_LIMIT,
+        timeout_sec: float | None = None,
+        resilience: Resilience | None = None,
+        metrics: MetricsRegistry | None = None,
+    ) -> None:
+        """Initialize fleet.
+
+        max_concurrency caps the number of accounts talking to the server at once. Logins are additionally spaced
+        login_stagger_sec apart to avoid bursts. timeout_sec bounds each account's operation so that one slow account
+        can't hold up the whole fleet. resilience, if provided, is shared by all accounts so that its endpoint rate
+        limit and circuit breaker apply to the fleet's combined traffic. metrics, if provided, is likewise shared and
+        aggregates all accounts.
+        """
+
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1.")
+
+        self.max_concurrency = max_concurrency
+        self.login_stagger_sec = login_stagger_sec
+        self.timeout_sec = timeout_sec
+        self.resilience = resilience
+        self.metrics = metrics
+
+        self._connector_limit = connector_limit
+        self._connector: aiohttp.TCPConnector | None = None
+        self._sessions: list[aiohttp.ClientSession] = []
+
+        self.accounts: dict[str, FleetAccount] = {}
+
+    async def __aenter__(self) -> LaundryFleet:
+        """Enter async context."""
+        return self
+
+    async def __aexit__(self, *args: object) -> None:
+        """Close sessions and shared connector on context exit."""
+        await self.close()
+
+    @property
+    def laundries(self) -> dict[str, Laundry]:
+        """Return controllers keyed by account name."""
+        return {name: account.laundry for name, account in self.accounts.items()}
+
+    def add_account(
+        self, username: str, password: str, name: str | None = None
+    ) -> Laundry:
+        """Add account to fleet and return its controller. Accounts are keyed by name, which defaults to username."""
+
+        name = name or username
+
+        if name in self.accounts:
+            raise ValueError(f"Account {name} already in fleet.")
+
+        if self._connector is None:
+            self._connector = aiohttp.TCPConnector(limit=self._connector_limit)
+
+        # Each account gets its own session (and cookie jar) on top of the shared connection pool.
+        websession = aiohttp.ClientSession(
+            connector=self._connector, connector_owner=False
+        )
+        self._sessions.append(websession)
+
+        laundry = Laundry(
+            websession=websession, resilience=self.resilience, metrics=self.metrics
+        )
+
+        self.accounts[name] = FleetAccount(
+            name=name, username=username, password=password, laundry=laundry
+        )
+
+        return laundry
+
+    async def async_login_all(self) -> dict[str, FleetResult]:
+        """Log in to all accounts with staggered, bounded concurrency."""
+
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def login(index: int, account: FleetAccount) -> FleetResult:
+            await asyncio.sleep(index * self.login_stagger_sec)
+
+            return await self._async_run(
+                semaphore,
+                account.name,
+                lambda: account.laundry.async_login(
+                    username=account.username, password=account.password
+                ),
+            )
+
+        results = await asyncio.gather(
+            *(
+                login(index, account)
+                for index, account in enumerate(self.accounts.values())
+            )
+        )
+
+        return {result.name: result for result in results}
+
+    async def async_refresh_all(self) -> dict[str, FleetResult]:
+        """Refresh all accounts in parallel."""
+
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        results = await asyncio.gather(
+            *(
+                self._async_run(semaphore, account.name, account.laundry.async_refresh)
+                for account in self.accounts.values()
+            )
+        )
+
+        return {result.name: result for result in results}
+
+    async def close(self) -> None:
+        """Close all account sessions and the shared connector."""
+
+        for websession in self._sessions:
+            await websession.close()
+
+        self._sessions = []
+
+        if self._connector is not None:
+            await self._connector.close()
+            self._connector = None
+
+    async def _async_run(
+        self,
+        semaphore: asyncio.Semaphore,
+        name: str,
+        func: Callable[[], Awaitable[Any]],
+    ) -> FleetResult:
+        """Run operation for a single account, capturing its outcome instead of raising."""
+
+        async with semaphore:
+            start = time.monotonic()
+
+            try:
+                result = await asyncio.wait_for(func(), timeout=self.timeout_sec)
+            except Exception as err:  # pylint: disable=broad-except
+                log.debug("Fleet operation failed for account %s: %r", name, err)
+                return FleetResult(
+                    name=name,
+                    success=False,
+                    duration_sec=time.monotonic() - start,
+                    error=err,
+                )
+
+            return FleetResult(
+                name=name,
+                success=True,
+                duration_sec=time.monotonic() - start,
+                result=result,
+            )
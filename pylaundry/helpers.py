@@ -3,129 +3,228 @@
 from __future__ import annotations
 
 import base64
+import binascii
+from collections import OrderedDict
+from collections.abc import Callable, Sequence
+from datetime import datetime, timezone
+from functools import lru_cache, partial
 import gzip
 import json
 import logging
+import re
+from typing import TYPE_CHECKING, TypeVar
 import urllib.parse
 import uuid
+import zlib
+
+from .const import (
+    AES_IV,
+    AES_SUFFIX_PREAUTH,
+    DEFAULT_PACKING_CACHE_SIZE,
+    LOG_LEVEL_TRACE,
+    PACKING_CACHE_OPERATIONS,
+    PROCESS_POOL_MIN_BATCH_SIZE,
+    TIMESTAMP_CACHE_SIZE,
+)
+from .codec import DEFAULT_CODEC, JsonCodec
+from .exceptions import MessagePackerError, ResponseFormatError
+from .trace import LazyHex, StageTimer
+
+if TYPE_CHECKING:
+    from cryptography.hazmat.primitives.ciphers import Cipher
 
-from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+log = logging.getLogger(__name__)
 
-from .const import AES_IV, AES_SUFFIX_PREAUTH, LOG_LEVEL_TRACE
-from .exceptions import MessagePackerError
+_T = TypeVar("_T")
+_R = TypeVar("_R")
 
-log = logging.getLogger(__name__)
+_CACHEABLE_ITEM_TYPES = (str, int, float, bool, type(None))
+
+_RESPONSE_ENVELOPE_PATTERN = re.compile(
+    rb'\s*\{\s*"Response"\s*:\s*"([A-Za-z0-9+/=]*)"\s*\}\s*'
+)
+
+GZIP_WBITS = 16 + zlib.MAX_WBITS  # Tells zlib to expect a gzip header and trailer.
+MAX_DEFLATE_RATIO = 1032
 
 
 class MessagePacker:
     """Functions for packing and unpacking client <-> server messages."""
 
     @staticmethod
-    def unpack_server_response(response_body: bytes) -> dict | None:
-        """Unpack API response into string."""
+    def extract_response_content(raw_response: bytes) -> memoryview | str | None:
+        """Isolate packed response content from raw server response."""
 
-        # Unpacking Steps:
-        #     1. Base64 decode.
-        #     2. gzip decompress.
+        # Expected response format is {"Response": PACKED_RESPONSE_CONTENT}. Base64 content never needs JSON escaping,
+        # so the common case is sliced out of the raw bytes without parsing or copying. Anything else goes through the
+        # JSON parser.
 
-        log.log(
-            LOG_LEVEL_TRACE, "==============[ UNPACKING RESPONSE BEGIN ]=============="
-        )
+        if match := _RESPONSE_ENVELOPE_PATTERN.fullmatch(raw_response):
+            return memoryview(raw_response)[match.start(1) : match.end(1)]
 
-        decoded_as_bytes = base64.standard_b64decode(response_body)
+        try:
+            response_json = json.loads(raw_response)
+        except (ValueError, TypeError) as err:
+            raise ResponseFormatError("Server response not a JSON dict.") from err
 
-        log.log(
-            LOG_LEVEL_TRACE,
-            "Base64Decode Bytes -> Bytes:\n%s\n\n",
-            decoded_as_bytes.hex(),
-        )
+        if not isinstance(response_json, dict):
+            raise ResponseFormatError("Server response not a JSON dict.")
 
-        gunzipped_as_bytes = gzip.decompress(decoded_as_bytes)
+        return response_json.get("Response")
 
-        log.log(
-            LOG_LEVEL_TRACE, "gunzip Bytes -> Bytes:\n%s\n\n", decoded_as_bytes.hex()
-        )
+    @staticmethod
+    def unpack_server_response(
+        response_body: bytes | memoryview | str,
+        codec: JsonCodec | None = None,
+        timer: StageTimer | None = None,
+    ) -> dict | None:
+        """Unpack API response into dict."""
 
-        try:
-            json_response = json.loads(str(gunzipped_as_bytes, "utf-8"))
-        except ValueError as err:
-            raise err
+        # Unpacking Steps:
+        #     1. Base64 decode.
+        #     2. gzip decompress.
+        #     3. Parse JSON.
+
+        # Payload dumps are only built when TRACE logging is enabled. Stage timing only runs when a timer is passed in.
+        trace = log.isEnabledFor(LOG_LEVEL_TRACE)
 
-        log.log(LOG_LEVEL_TRACE, "UNPACKED RESPONSE:\n%s\n\n", json_response)
+        if trace:
+            log.log(
+                LOG_LEVEL_TRACE,
+                "==============[ UNPACKING RESPONSE BEGIN ]==============",
+            )
 
-        log.log(
-            LOG_LEVEL_TRACE, "==============[ UNPACKING RESPONSE END ]=============="
+        try:
+            decoded_as_bytes = binascii.a2b_base64(response_body)
+        except binascii.Error as err:
+            raise MessagePackerError("Response not valid base64.") from err
+
+        if timer is not None:
+            timer.lap("unbase64")
+
+        if trace:
+            log.log(
+                LOG_LEVEL_TRACE,
+                "Base64Decode Bytes -> Bytes:\n%s\n\n",
+                LazyHex(decoded_as_bytes),
+            )
+
+        # The gzip trailer holds the uncompressed size. Passing it as the output buffer size lets zlib decompress into a
+        # single allocation instead of growing and joining blocks. The size is only a hint and is capped by the maximum
+        # deflate ratio so that a bogus trailer can't trigger a huge allocation.
+        buffer_size = min(
+            int.from_bytes(decoded_as_bytes[-4:], "little"),
+            len(decoded_as_bytes) * MAX_DEFLATE_RATIO,
         )
 
-        return json_response if isinstance(json_response, dict) else None
+        try:
+            gunzipped_as_bytes = zlib.decompress(
+                decoded_as_bytes, GZIP_WBITS, max(buffer_size, 1)
+            )
+        except zlib.error as err:
+            raise MessagePackerError("Error decompressing response.") from err
 
-    @staticmethod
-    def pack_client_request(
-        request_body: str | list | dict,
-        first_request_id: str | None = None,
-        new_request_id: str | None = None,
-    ) -> tuple[str, str]:
-        """Pack request body for transmission to server."""
+        if timer is not None:
+            timer.lap("gunzip")
 
-        # Reference for doing AES in Python: https://gist.github.com/brysontyrrell/7cebfb05105c25d00e84ed35bd821dfe
+        if trace:
+            log.log(
+                LOG_LEVEL_TRACE, "gunzip Bytes -> Bytes:\n%s\n\n", gunzipped_as_bytes
+            )
 
-        # new_request_id generated automatically. If debugging intercepted communications, provide actual new_request_id
+        codec = codec or DEFAULT_CODEC
 
-        # Packing Steps:
-        #     1. Apply PKCS #7 padding.
-        #     2. Encrypt using 128-bit AES/CBC.
-        #     3. Base64 encode.
-        #     4. Base64 encode, again.
-        #     5. URL encode.
+        if codec.parses_bytes:
+            json_response = codec.loads(gunzipped_as_bytes)
+        else:
+            # Decode and drop the bytes before parsing. Otherwise, both copies stay alive next to the parsed objects.
+            json_text = str(gunzipped_as_bytes, "utf-8")
+            del gunzipped_as_bytes
+            json_response = codec.loads(json_text)
 
-        log.log(
-            LOG_LEVEL_TRACE, "==============[ PACKING REQUEST BEGIN ]=============="
-        )
+        if timer is not None:
+            timer.lap("parse")
 
-        log.log(LOG_LEVEL_TRACE, "Original Request Body:\n%s\n\n", request_body)
+        if trace:
+            log.log(LOG_LEVEL_TRACE, "UNPACKED RESPONSE:\n%s\n\n", json_response)
+            log.log(
+                LOG_LEVEL_TRACE,
+                "==============[ UNPACKING RESPONSE END ]==============",
+            )
 
-        if not new_request_id:
-            new_request_id = str(uuid.uuid4())
+        return json_response if isinstance(json_response, dict) else None
 
-        log.log(LOG_LEVEL_TRACE, "New Request ID: %s", new_request_id)
+    @staticmethod
+    def unpack_server_responses(
+        response_bodies: Sequence[bytes | str],
+        max_workers: int | None = None,
+        codec: JsonCodec | None = None,
+    ) -> list[dict | None]:
+        """Unpack many API responses. Output matches unpack_server_response() for each body."""
 
-        key = MessagePacker._generate_aes_key(
-            new_request_id=new_request_id, first_request_id=first_request_id
+        # Set max_workers to spread large batches across a process pool.
+
+        return _run_batch(
+            partial(_unpack_batch, codec=codec), list(response_bodies), max_workers
         )
 
-        # PKCS#7 Pad
-        padded_request = MessagePacker._pkcs7_pad(bytes(str(request_body), "utf-8"))
+    @staticmethod
+    def pack_server_response(
+        response_content: dict, codec: JsonCodec | None = None
+    ) -> bytes:
+        """Pack response content the way the server does. Used by the local simulator; not needed to talk to the API."""
 
-        log.log(LOG_LEVEL_TRACE, "Padded Request:\n%s\n\n", padded_request)
+        # Reverse of unpack_server_response(), wrapped in the {"Response": ...} envelope.
 
-        # AES Encrypt
-        cipher = Cipher(algorithms.AES(key), modes.CBC(AES_IV))
-        encryptor = cipher.encryptor()
-        encrypted_request = (
-            encryptor.update(bytes(padded_request)) + encryptor.finalize()
+        packed_content = base64.standard_b64encode(
+            gzip.compress((codec or DEFAULT_CODEC).dumps(response_content))
         )
 
-        log.log(
-            LOG_LEVEL_TRACE,
-            "Encrypted Request:\n%s\n\n",
-            MessagePacker._format_hex(encrypted_request),
-        )
-
-        # 2x Base 64
-        b64_encoded_request = base64.urlsafe_b64encode(
-            base64.b64encode(encrypted_request)
-        )
+        return b'{"Response":"' + packed_content + b'"}'
 
-        log.log(LOG_LEVEL_TRACE, "Base64 Encoded Request:\n%s\n\n", b64_encoded_request)
+    @staticmethod
+    def pack_client_request(
+        request_body: str | list | dict,
+        first_request_id: str | None = None,
+        new_request_id: str | None = None,
+        codec: JsonCodec | None = None,
+    ) -> tuple[str, str]:
+        """Pack request body for transmission to server."""
 
-        # URL Encode
-        url_encoded_request = urllib.parse.quote(b64_encoded_request)
+        # new_request_id generated automatically. If debugging intercepted communications, provide actual new_request_id
 
-        log.log(LOG_LEVEL_TRACE, "URL Encoded Request:\n%s\n\n", url_encoded_request)
+        # Use PackingContext directly when sending many requests in one session. It keeps per-session state between calls.
 
-        log.log(LOG_LEVEL_TRACE, "==============[ PACKING REQUEST END ]==============")
+        return PackingContext(
+            first_request_id=first_request_id, cache_size=0, codec=codec
+        ).pack(request_body=request_body, new_request_id=new_request_id)
 
-        return (str(new_request_id), url_encoded_request)
+    @staticmethod
+    def pack_client_requests(
+        request_bodies: Sequence[str | list | dict],
+        first_request_ids: Sequence[str | None],
+        new_request_ids: Sequence[str] | None = None,
+        max_workers: int | None = None,
+        codec: JsonCodec | None = None,
+    ) -> list[tuple[str, str]]:
+        """Pack many request bodies. Output matches pack_client_request() for each body."""
+
+        # first_request_ids (and new_request_ids, if provided) are matched to request_bodies by position.
+        # Set max_workers to spread large batches across a process pool.
+
+        if len(first_request_ids) != len(request_bodies) or (
+            new_request_ids is not None and len(new_request_ids) != len(request_bodies)
+        ):
+            raise ValueError("Request IDs must be provided for every request body.")
+
+        if new_request_ids is None:
+            new_request_ids = [str(uuid.uuid4()) for _ in request_bodies]
+
+        return _run_batch(
+            partial(_pack_batch, codec=codec),
+            list(zip(request_bodies, first_request_ids, new_request_ids)),
+            max_workers,
+        )
 
     @staticmethod
     def unpack_client_request(
@@ -141,40 +240,44 @@ class MessagePacker:
             new_request_id=new_request_id, first_request_id=first_request_id
         )
 
+        trace = log.isEnabledFor(LOG_LEVEL_TRACE)
+
         # URL Decode
         url_decoded_request = urllib.parse.unquote(request_body)
 
-        log.log(
-            LOG_LEVEL_TRACE,
-            "[unpack_client_request] URL Decoded Request:\n%s\n\n",
-            url_decoded_request,
-        )
+        if trace:
+            log.log(
+                LOG_LEVEL_TRACE,
+                "[unpack_client_request] URL Decoded Request:\n%s\n\n",
+                url_decoded_request,
+            )
 
         # 2x Base 64 Decode
-        b64_decoded_request = base64.b64decode(base64.b64decode(url_decoded_request))
-
-        log.log(
-            LOG_LEVEL_TRACE,
-            "[unpack_client_request] First Base64 Decoded Request:\n%s\n\n",
-            base64.b64decode(url_decoded_request),
-        )
-
-        log.log(
-            LOG_LEVEL_TRACE,
-            "[unpack_client_request] Second Base64 Decoded Request:\n%s\n\n",
-            MessagePacker._format_hex(b64_decoded_request),
-        )
+        first_b64_decoded_request = base64.b64decode(url_decoded_request)
+        b64_decoded_request = base64.b64decode(first_b64_decoded_request)
+
+        if trace:
+            log.log(
+                LOG_LEVEL_TRACE,
+                "[unpack_client_request] First Base64 Decoded Request:\n%s\n\n",
+                first_b64_decoded_request,
+            )
+            log.log(
+                LOG_LEVEL_TRACE,
+                "[unpack_client_request] Second Base64 Decoded Request:\n%s\n\n",
+                LazyHex(b64_decoded_request),
+            )
 
         # AES Decrypt
-        cipher = Cipher(algorithms.AES(key), modes.CBC(AES_IV))
-        decryptor = cipher.decryptor()
+        decryptor = _aes_cipher(key).decryptor()
         decrypted_request = decryptor.update(b64_decoded_request) + decryptor.finalize()
 
-        log.log(
-            LOG_LEVEL_TRACE,
-            "[unpack_client_request] Decrypted Request:\n%s\n\n",
-            decrypted_request.hex(),
-        )
+        if trace:
+            log.log(
+                LOG_LEVEL_TRACE,
+                "[unpack_client_request] Decrypted Request:\n%s\n\n",
+                LazyHex(decrypted_request),
+            )
 
         # Unpad PKCS#7
         try:
@@ -182,11 +285,12 @@ class MessagePacker:
         except UnicodeDecodeError as err:
             raise MessagePackerError("Error unpadding message.") from err
 
-        log.log(
-            LOG_LEVEL_TRACE,
-            "[unpack_client_request] Unpadded Request:\n%s\n\n",
-            unpadded_request,
-        )
+        if trace:
+            log.log(
+                LOG_LEVEL_TRACE,
+                "[unpack_client_request] Unpadded Request:\n%s\n\n",
+                unpadded_request,
+            )
 
         return str(unpadded_request, "utf-8")
 
@@ -196,49 +300,27 @@ class MessagePacker:
     ) -> bytes:
         """Generate AES encryption key."""
 
-        key_str = ""
-        key_bytes = b""
+        # Authentication requests are identified by missing first_request_id. Their key is built from the new request ID and a fixed suffix.
+        # All other keys weave together backwards last and second to last request IDs.
 
-        if not first_request_id:
-
-            #
-            # Generate key for authentication request. Authentication requests identified by missing first_request_id.
-            #
-
-            key_base = ""
-
-            length = len(new_request_id) - 1
-            while length >= 0 and len(key_base) < 8:
-                key_base = key_base + str(new_request_id[length])
-                length -= 2
-
-            key_str = key_base + AES_SUFFIX_PREAUTH
-            key_bytes = bytes(key_str, "utf-8")
+        key_str = MessagePacker._key_half(str(new_request_id))
 
+        if not first_request_id:
+            key_str += AES_SUFFIX_PREAUTH
         else:
+            key_str += str(first_request_id)[::-2][: 16 - len(key_str)]
 
-            # Generate key for all non-authentication requests by weaving together backwards last and second to last request IDs.
+        key_bytes = bytes(key_str, "utf-8")
 
-            new_req_id_length = len(str(new_request_id)) - 1
-            while new_req_id_length >= 0 and len(key_str) < 8:
-                key_str = key_str + str(new_request_id)[new_req_id_length]
-                new_req_id_length -= 2
+        log.log(LOG_LEVEL_TRACE, "Encryption Key: %s (%s)", key_str, LazyHex(key_bytes))
 
-            original_uuid_length = len(str(first_request_id)) - 1
-            while original_uuid_length >= 0 and len(key_str) < 16:
-                key_str = key_str + str(first_request_id)[original_uuid_length]
-                original_uuid_length -= 2
-
-            key_bytes = bytes(key_str, "utf-8")
+        return key_bytes
 
-        log.log(
-            LOG_LEVEL_TRACE,
-            "Encryption Key: %s (%s)",
-            key_str,
-            MessagePacker._format_hex(key_bytes),
-        )
+    @staticmethod
+    def _key_half(request_id: str) -> str:
+        """Build half of an AES key by reading every other character of a request ID, starting from the end."""
 
-        return key_bytes
+        return request_id[::-2][:8]
 
     @staticmethod
     def _pkcs7_pad(message: bytes) -> bytes:
@@ -257,3 +339,268 @@ class MessagePacker:
         """Format hex number grouped by bytes."""
 
         return hex_input.hex(" ").upper()
+
+
+class PackingContext:
+    """Per-session state for packing client requests."""
+
+    # The half of the AES key derived from first_request_id (or the pre-auth suffix) doesn't change within a session,
+    # so it's computed once here. Padded request bodies are cached because polling sends the same bodies repeatedly.
+
+    def __init__(
+        self,
+        first_request_id: str | None = None,
+        cache_size: int = DEFAULT_PACKING_CACHE_SIZE,
+        codec: JsonCodec | None = None,
+    ) -> None:
+        """Initialize packing context for session."""
+
+        self.first_request_id = first_request_id
+        self.cache_size = cache_size
+        self.codec = codec or DEFAULT_CODEC
+
+        self._key_suffix: str = (
+            str(first_request_id)[::-2][:8] if first_request_id else AES_SUFFIX_PREAUTH
+        )
+        self._padded_bodies: OrderedDict[tuple, bytes] = OrderedDict()
+
+    def generate_aes_key(self, new_request_id: str) -> bytes:
+        """Generate AES encryption key for a request in this session."""
+
+        key_half = MessagePacker._key_half(new_request_id)
+
+        # Request IDs shorter than 15 characters don't yield a full key half. Let the general implementation handle these.
+        if len(key_half) < 8:
+            return MessagePacker._generate_aes_key(
+                new_request_id=new_request_id, first_request_id=self.first_request_id
+            )
+
+        return bytes(key_half + self._key_suffix, "utf-8")
+
+    def pack(
+        self,
+        request_body: str | list | dict,
+        new_request_id: str | None = None,
+        timer: StageTimer | None = None,
+    ) -> tuple[str, str]:
+        """Pack request body for transmission to server. Lists and dicts are serialized to JSON."""
+
+        # Reference for doing AES in Python: https://gist.github.com/brysontyrrell/7cebfb05105c25d00e84ed35bd821dfe
+
+        # Packing Steps:
+        #     1. Apply PKCS #7 padding.
+        #     2. Encrypt using 128-bit AES/CBC.
+        #     3. Base64 encode.
+        #     4. Base64 encode, again.
+        #     5. URL encode.
+
+        trace = log.isEnabledFor(LOG_LEVEL_TRACE)
+
+        if not new_request_id:
+            new_request_id = str(uuid.uuid4())
+
+        key = self.generate_aes_key(str(new_request_id))
+
+        if trace:
+            log.log(
+                LOG_LEVEL_TRACE, "==============[ PACKING REQUEST BEGIN ]=============="
+            )
+            log.log(LOG_LEVEL_TRACE, "Original Request Body:\n%s\n\n", request_body)
+            log.log(LOG_LEVEL_TRACE, "New Request ID: %s", new_request_id)
+            log.log(LOG_LEVEL_TRACE, "Encryption Key: %s (%s)", key, LazyHex(key))
+
+        # PKCS#7 Pad
+        padded_request = self._get_padded_body(request_body)
+
+        if timer is not None:
+            timer.lap("pad")
+
+        if trace:
+            log.log(LOG_LEVEL_TRACE, "Padded Request:\n%s\n\n", padded_request)
+
+        # AES Encrypt
+        encryptor = _aes_cipher(key).encryptor()
+        encrypted_request = encryptor.update(padded_request) + encryptor.finalize()
+
+        if timer is not None:
+            timer.lap("encrypt")
+
+        if trace:
+            log.log(
+                LOG_LEVEL_TRACE,
+                "Encrypted Request:\n%s\n\n",
+                LazyHex(encrypted_request),
+            )
+
+        # 2x Base 64
+        b64_encoded_request = base64.urlsafe_b64encode(
+            base64.b64encode(encrypted_request)
+        )
+
+        # URL Encode
+        url_encoded_request = urllib.parse.quote(b64_encoded_request)
+
+        if timer is not None:
+            timer.lap("base64")
+
+        if trace:
+            log.log(
+                LOG_LEVEL_TRACE, "Base64 Encoded Request:\n%s\n\n", b64_encoded_request
+            )
+            log.log(
+                LOG_LEVEL_TRACE, "URL Encoded Request:\n%s\n\n", url_encoded_request
+            )
+            log.log(
+                LOG_LEVEL_TRACE, "==============[ PACKING REQUEST END ]=============="
+            )
+
+        return (str(new_request_id), url_encoded_request)
+
+    def _get_padded_body(self, request_body: str | list | dict) -> bytes:
+        """Serialize and pad request body, using cached result for repeated bodies."""
+
+        cache_key: tuple | None = None
+
+        # Only polling requests repeat. One-off bodies (vends, logins, vend logs with timestamps) would just churn the
+        # cache. Keys pair each item with its type because 1, 1.0 and True compare and hash equal but serialize
+        # differently.
+        if (
+            self.cache_size > 0
+            and isinstance(request_body, list)
+            and request_body
+            and isinstance(operation := request_body[0], str)
+            and operation in PACKING_CACHE_OPERATIONS
+            and all(type(item) in _CACHEABLE_ITEM_TYPES for item in request_body)
+        ):
+            cache_key = tuple((type(item), item) for item in request_body)
+
+        if cache_key is not None and (
+            padded_body := self._padded_bodies.get(cache_key)
+        ):
+            self._padded_bodies.move_to_end(cache_key)
+            return padded_body
+
+        body_bytes = (
+            self.codec.dumps(request_body)
+            if isinstance(request_body, (list, dict))
+            else bytes(str(request_body), "utf-8")
+        )
+
+        padded_body = MessagePacker._pkcs7_pad(body_bytes)
+
+        if cache_key is not None:
+            self._padded_bodies[cache_key] = padded_body
+
+            if len(self._padded_bodies) > self.cache_size:
+                self._padded_bodies.popitem(last=False)
+
+        return padded_body
+
+
+@lru_cache(maxsize=1)
+def _aes_cipher_factory() -> Callable[[bytes], Cipher]:
+    """Return function that builds an AES/CBC cipher for a key."""
+
+    # cryptography is imported on first encrypt/decrypt rather than with this module. The CBC mode object is immutable
+    # and shared by all ciphers.
+    from cryptography.hazmat.primitives.ciphers import (  # pylint: disable=import-outside-toplevel,redefined-outer-name
+        Cipher,
+        algorithms,
+        modes,
+    )
+
+    cbc_mode = modes.CBC(bytes(AES_IV))
+
+    return lambda key: Cipher(algorithms.AES(key), cbc_mode)
+
+
+def _aes_cipher(key: bytes) -> Cipher:
+    """Return AES/CBC cipher for key."""
+    return _aes_cipher_factory()(key)
+
+
+def _pack_batch(
+    jobs: list[tuple[str | list | dict, str | None, str]],
+    codec: JsonCodec | None = None,
+) -> list[tuple[str, str]]:
+    """Pack (request_body, first_request_id, new_request_id) jobs, sharing one context per session."""
+
+    contexts: dict[str | None, PackingContext] = {}
+    packed_requests = []
+
+    for request_body, first_request_id, new_request_id in jobs:
+        if (context := contexts.get(first_request_id)) is None:
+            context = contexts[first_request_id] = PackingContext(
+                first_request_id=first_request_id, codec=codec
+            )
+
+        packed_requests.append(
+            context.pack(request_body, new_request_id=new_request_id)
+        )
+
+    return packed_requests
+
+
+def _unpack_batch(
+    response_bodies: list[bytes | str], codec: JsonCodec | None = None
+) -> list[dict | None]:
+    """Unpack list of API responses."""
+
+    return [
+        MessagePacker.unpack_server_response(response_body, codec=codec)
+        for response_body in response_bodies
+    ]
+
+
+def _run_batch(
+    func: Callable[[list[_T]], list[_R]], items: list[_T], max_workers: int | None
+) -> list[_R]:
+    """Run batch function in this process, or split across a process pool for large batches."""
+
+    if not max_workers or max_workers < 2 or len(items) < PROCESS_POOL_MIN_BATCH_SIZE:
+        return func(items)
+
+    chunk_size = -(-len(items) // max_workers)
+    chunks = [items[i : i + chunk_size] for i in range(0, len(items), chunk_size)]
+
+    # Only batch tools use worker processes. Keep the import off the path of everything else.
+    from concurrent.futures import (  # pylint: disable=import-outside-toplevel
+        ProcessPoolExecutor,
+    )
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return [result for chunk in executor.map(func, chunks) for result in chunk]
+
+
+@lru_cache(maxsize=TIMESTAMP_CACHE_SIZE)
+def parse_utc_timestamp(value: str) -> datetime:
+    """Parse ISO 8601 timestamp from server. Timestamps without a timezone are treated as UTC."""
+
+    # Machines in the same room often share a timestamp, hence the cache. The server's fixed format
+    # (e.g.: 2022-06-15T02:32:41Z) is parsed by slicing. Anything else falls back to dateutil.
+
+    if (
+        len(value) == 20
+        and value[4] == value[7] == "-"
+        and value[10] == "T"
+        and value[13] == value[16] == ":"
+        and value[19] == "Z"
+    ):
+        try:
+            return datetime(
+                int(value[0:4]),
+                int(value[5:7]),
+                int(value[8:10]),
+                int(value[11:13]),
+                int(value[14:16]),
+                int(value[17:19]),
+                tzinfo=timezone.utc,
+            )
+        except ValueError:
+            pass
+
+    import dateutil.parser  # pylint: disable=import-outside-toplevel
+
+    parsed: datetime = dateutil.parser.isoparse(value)
+
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
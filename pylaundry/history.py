@@ -0,0 +1,211 @@
+"""Bounded per-machine state history."""
+
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterable
+from typing import NamedTuple
+
+from .models import LaundryMachine
+from .table import _from_bool_code, _from_int_code, _to_bool_code, _to_int_code
+
+DEFAULT_HISTORY_DEPTH = 256
+
+# With changes_only, a busy machine whose countdown drifts from the expected value by at most this many minutes is
+# treated as unchanged. Covers rounding of minutes remaining between refreshes.
+COUNTDOWN_TOLERANCE_MIN = 1
+
+
+class HistorySample(NamedTuple):
+    """Machine state at a point in time."""
+
+    timestamp: float
+    busy: bool | None
+    minutes_remaining: int | None
+    online: bool | None
+
+
+class _RingBuffer:
+    """Fixed-size circular buffer of samples for one machine, held in typed arrays."""
+
+    # Arrays are allocated at full depth up front and never resized. Slots are addressed logically (0 = oldest) and
+    # mapped onto physical positions starting at _start. None is stored as NULL_BOOL / NULL_INT, like MachineTable.
+
+    __slots__ = ("depth", "timestamps", "busy", "online", "minutes", "_start", "_size")
+
+    def __init__(self, depth: int) -> None:
+        """Initialize empty buffer."""
+
+        self.depth = depth
+        self.timestamps = array("d", bytes(8 * depth))
+        self.busy = array("b", bytes(depth))
+        self.online = array("b", bytes(depth))
+        self.minutes = array("i", bytes(4 * depth))
+
+        self._start = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        """Return number of stored samples."""
+        return self._size
+
+    def append(self, sample: HistorySample) -> None:
+        """Add sample, overwriting the oldest once full."""
+
+        if self._size < self.depth:
+            pos = (self._start + self._size) % self.depth
+            self._size += 1
+        else:
+            pos = self._start
+            self._start = (self._start + 1) % self.depth
+
+        self.timestamps[pos] = sample.timestamp
+        self.busy[pos] = _to_bool_code(sample.busy)
+        self.online[pos] = _to_bool_code(sample.online)
+        self.minutes[pos] = _to_int_code(sample.minutes_remaining)
+
+    def get(self, index: int) -> HistorySample:
+        """Return sample at logical index. Negative indexes count from newest."""
+
+        if index < 0:
+            index += self._size
+
+        pos = (self._start + index) % self.depth
+
+        return HistorySample(
+            timestamp=self.timestamps[pos],
+            busy=_from_bool_code(self.busy[pos]),
+            minutes_remaining=_from_int_code(self.minutes[pos]),
+            online=_from_bool_code(self.online[pos]),
+        )
+
+    def bisect_left(self, timestamp: float) -> int:
+        """Return logical index of first sample at or after timestamp."""
+
+        low, high = 0, self._size
+
+        while low < high:
+            mid = (low + high) // 2
+
+            if self.timestamps[(self._start + mid) % self.depth] < timestamp:
+                low = mid + 1
+            else:
+                high = mid
+
+        return low
+
+
+class MachineHistory:
+    """Recent state of each machine, kept in fixed-depth ring buffers."""
+
+    # Pass one to Laundry(history=...) to record every machine after each refresh. Memory is depth samples per current
+    # machine (about 14 bytes each). Machines that disappear from the room are dropped along with their history.
+    #
+    # With changes_only, a refresh is only recorded when it says something new: busy or online flipped, or minutes
+    # remaining differs from what the previous sample's countdown predicts (e.g.: a dryer was topped off). depth then
+    # covers a much longer span of time.
+
+    def __init__(
+        self, depth: int = DEFAULT_HISTORY_DEPTH, changes_only: bool = True
+    ) -> None:
+        """Initialize history."""
+
+        if depth < 1:
+            raise ValueError("depth must be at least 1.")
+
+        self.depth = depth
+        self.changes_only = changes_only
+
+        self._buffers: dict[str, _RingBuffer] = {}
+
+    def __len__(self) -> int:
+        """Return number of machines with history."""
+        return len(self._buffers)
+
+    def __contains__(self, machine_id: object) -> bool:
+        """Check whether machine has history."""
+        return machine_id in self._buffers
+
+    def record(self, machines: Iterable[LaundryMachine], timestamp: float) -> None:
+        """Record state of all current machines at timestamp (seconds since epoch). Drops history of absent machines."""
+
+        seen_ids = set()
+
+        for machine in machines:
+            seen_ids.add(machine.id_)
+
+            if (buffer := self._buffers.get(machine.id_)) is None:
+                buffer = self._buffers[machine.id_] = _RingBuffer(self.depth)
+
+            sample = HistorySample(
+                timestamp, machine.busy, machine.minutes_remaining, machine.online
+            )
+
+            if self.changes_only and buffer and not _is_change(buffer.get(-1), sample):
+                continue
+
+            buffer.append(sample)
+
+        for machine_id in self._buffers.keys() - seen_ids:
+            del self._buffers[machine_id]
+
+    def samples(
+        self, machine_id: str, start: float | None = None, end: float | None = None
+    ) -> list[HistorySample]:
+        """Return machine's samples with start <= timestamp < end, oldest first."""
+
+        if (buffer := self._buffers.get(machine_id)) is None:
+            return []
+
+        first = 0 if start is None else buffer.bisect_left(start)
+        last = len(buffer) if end is None else buffer.bisect_left(end)
+
+        return [buffer.get(index) for index in range(first, last)]
+
+    def latest(self, machine_id: str) -> HistorySample | None:
+        """Return machine's most recent sample."""
+
+        if not (buffer := self._buffers.get(machine_id)):
+            return None
+
+        return buffer.get(-1)
+
+    def state_since(self, machine_id: str) -> float | None:
+        """Return when machine entered its current busy/online state, as far back as history goes."""
+
+        # E.g.: how long a dryer has been busy is now - state_since(dryer_id) while it's busy.
+
+        if not (buffer := self._buffers.get(machine_id)):
+            return None
+
+        current = buffer.get(-1)
+        since = current.timestamp
+
+        for index in range(len(buffer) - 2, -1, -1):
+            sample = buffer.get(index)
+
+            if (sample.busy, sample.online) != (current.busy, current.online):
+                break
+
+            since = sample.timestamp
+
+        return since
+
+    def clear(self) -> None:
+        """Drop all history."""
+        self._buffers = {}
+
+
+def _is_change(previous: HistorySample, sample: HistorySample) -> bool:
+    """Check whether sample says something previous didn't already predict."""
+
+    if (previous.busy, previous.online) != (sample.busy, sample.online):
+        return True
+
+    if previous.minutes_remaining is None or sample.minutes_remaining is None:
+        return previous.minutes_remaining != sample.minutes_remaining
+
+    elapsed_min = (sample.timestamp - previous.timestamp) / 60
+    expected = max(0.0, previous.minutes_remaining - elapsed_min)
+
+    return abs(sample.minutes_remaining - expected) > COUNTDOWN_TOLERANCE_MIN
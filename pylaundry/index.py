@@ -0,0 +1,192 @@
+"""Indexes over machine state for availability and label lookups."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+import heapq
+
+from .models import LaundryMachine, MachineType
+
+# Heaps smaller than this (beyond twice the live entry count) aren't worth compacting.
+MIN_HEAP_COMPACT_SIZE = 32
+
+_MACHINE_TYPES_BY_NAME = {
+    machine_type.value.lower(): machine_type for machine_type in MachineType
+}
+
+
+class MachineIndex:
+    """Machines indexed by type and state, by label, and by minutes remaining."""
+
+    # Laundry keeps this in sync as machine data is ingested. Only added, updated and removed machines are touched, so
+    # upkeep is proportional to what changed, not to room size.
+    #
+    # Busy machines sit in a min-heap per type, keyed by minutes remaining. Entries are never removed from the heap
+    # directly. Instead, each machine's current heap key is tracked, and stale entries are discarded when they surface
+    # at the top. A heap is rebuilt once stale entries outnumber live ones, so countdowns ticking on long-running
+    # processes don't grow it without bound.
+
+    def __init__(self) -> None:
+        """Initialize empty index."""
+        self.clear()
+
+    def __len__(self) -> int:
+        """Return number of indexed machines."""
+        return len(self._machines)
+
+    def clear(self) -> None:
+        """Remove all machines."""
+
+        self._machines: dict[str, LaundryMachine] = {}
+        self._by_state: dict[
+            tuple[MachineType, bool | None, bool | None], dict[str, None]
+        ] = {}
+        self._by_label: dict[tuple[MachineType, str], str] = {}
+        self._labels: dict[str, tuple[MachineType, str]] = {}
+        self._states: dict[str, tuple[MachineType, bool | None, bool | None]] = {}
+        self._busy_heaps: dict[MachineType, list[tuple[int, str]]] = {}
+        self._busy_keys: dict[str, int] = {}
+
+    def rebuild(self, machines: Iterable[LaundryMachine]) -> None:
+        """Replace index contents with machines."""
+
+        self.clear()
+
+        for machine in machines:
+            self.update(machine)
+
+    def update(self, machine: LaundryMachine) -> None:
+        """Add machine or re-index its current state."""
+
+        machine_id = machine.id_
+        self._machines[machine_id] = machine
+
+        state = (machine.type, machine.busy, machine.online)
+        if (old_state := self._states.get(machine_id)) != state:
+            if old_state is not None:
+                self._by_state[old_state].pop(machine_id, None)
+            # Dicts (rather than sets) keep machines in insertion order, so results are stable.
+            self._by_state.setdefault(state, {})[machine_id] = None
+            self._states[machine_id] = state
+
+        label = (machine.type, _normalize_number(machine.number))
+        if (old_label := self._labels.get(machine_id)) != label:
+            if old_label is not None and self._by_label.get(old_label) == machine_id:
+                del self._by_label[old_label]
+            self._by_label[label] = machine_id
+            self._labels[machine_id] = label
+
+        # Machines whose type changed need a fresh entry in their new type's heap.
+        if old_state is not None and old_state[0] is not machine.type:
+            self._busy_keys.pop(machine_id, None)
+
+        if machine.busy and machine.online is not False:
+            minutes_remaining = machine.minutes_remaining or 0
+            if self._busy_keys.get(machine_id) != minutes_remaining:
+                self._busy_keys[machine_id] = minutes_remaining
+                heap = self._busy_heaps.setdefault(machine.type, [])
+                heapq.heappush(heap, (minutes_remaining, machine_id))
+
+                if len(heap) > 2 * len(self._busy_keys) + MIN_HEAP_COMPACT_SIZE:
+                    self._compact_heap(machine.type)
+        else:
+            self._busy_keys.pop(machine_id, None)
+
+    def remove(self, machine_id: str) -> None:
+        """Remove machine from index."""
+
+        self._machines.pop(machine_id, None)
+        self._busy_keys.pop(machine_id, None)
+
+        if (state := self._states.pop(machine_id, None)) is not None:
+            self._by_state[state].pop(machine_id, None)
+
+        if (label := self._labels.pop(machine_id, None)) is not None:
+            if self._by_label.get(label) == machine_id:
+                del self._by_label[label]
+
+    def available(self, machine_type: MachineType) -> list[LaundryMachine]:
+        """Return idle, online machines of a type."""
+
+        return [
+            self._machines[machine_id]
+            for machine_id in self._by_state.get((machine_type, False, True), ())
+        ]
+
+    def with_state(
+        self, machine_type: MachineType, busy: bool | None, online: bool | None
+    ) -> list[LaundryMachine]:
+        """Return machines of a type with the given busy and online state."""
+
+        return [
+            self._machines[machine_id]
+            for machine_id in self._by_state.get((machine_type, busy, online), ())
+        ]
+
+    def next_available(self, machine_type: MachineType) -> LaundryMachine | None:
+        """Return an idle machine of a type, or else the busy one finishing soonest. Offline machines are skipped."""
+
+        for machine_id in self._by_state.get((machine_type, False, True), ()):
+            return self._machines[machine_id]
+
+        heap = self._busy_heaps.get(machine_type, [])
+
+        while heap:
+            minutes_remaining, machine_id = heap[0]
+
+            if (
+                self._busy_keys.get(machine_id) == minutes_remaining
+                and self._machines[machine_id].type is machine_type
+            ):
+                return self._machines[machine_id]
+
+            heapq.heappop(heap)
+
+        return None
+
+    def by_label(
+        self, label: str, machine_type: MachineType | None = None
+    ) -> LaundryMachine | None:
+        """Return machine by printed label, e.g.: by_label("12", MachineType.DRYER) or by_label("Dryer 12")."""
+
+        # Labels are only unique within a machine type. Without a type (in either argument), the label must match exactly
+        # one machine.
+
+        if machine_type is None:
+            name, _, number = label.strip().rpartition(" ")
+            if (parsed_type := _MACHINE_TYPES_BY_NAME.get(name.lower())) is not None:
+                machine_type, label = parsed_type, number
+
+        number = _normalize_number(label)
+
+        if machine_type is not None:
+            machine_id = self._by_label.get((machine_type, number))
+            return None if machine_id is None else self._machines[machine_id]
+
+        matches = [
+            machine_id
+            for machine_type_ in MachineType
+            if (machine_id := self._by_label.get((machine_type_, number))) is not None
+        ]
+
+        return self._machines[matches[0]] if len(matches) == 1 else None
+
+    def _compact_heap(self, machine_type: MachineType) -> None:
+        """Rebuild heap for machine type from live entries."""
+
+        heap = [
+            (minutes_remaining, machine_id)
+            for machine_id, minutes_remaining in self._busy_keys.items()
+            if self._machines[machine_id].type is machine_type
+        ]
+        heapq.heapify(heap)
+
+        self._busy_heaps[machine_type] = heap
+
+
+def _normalize_number(number: str) -> str:
+    """Normalize label so that e.g.: "03" and "3" match."""
+
+    number = number.strip()
+
+    return (number.lstrip("0") or "0") if number.isdigit() else number.lower()
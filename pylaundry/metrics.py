@@ -0,0 +1,243 @@
+"""Per-operation request metrics with Prometheus text export."""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections.abc import Iterable, Sequence
+
+# Upper bounds of latency histogram buckets, in seconds. A +Inf bucket is always added.
+DEFAULT_LATENCY_BUCKETS_SEC = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+DEFAULT_METRICS_PREFIX = "pylaundry"
+
+
+class Histogram:
+    """Fixed-bucket histogram."""
+
+    __slots__ = ("bounds", "bucket_counts", "count", "sum")
+
+    def __init__(self, bounds: Sequence[float]) -> None:
+        """Initialize histogram. Bounds must be sorted."""
+
+        self.bounds = tuple(bounds)
+        # Last slot counts observations above the largest bound.
+        self.bucket_counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        """Record observation."""
+
+        self.bucket_counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative_counts(self) -> list[int]:
+        """Return observation counts at or below each bound, followed by the total count."""
+
+        counts = []
+        total = 0
+        for bucket_count in self.bucket_counts:
+            total += bucket_count
+            counts.append(total)
+
+        return counts
+
+
+class MetricsRegistry:
+    """Counters and latency histograms for requests sent to the server, keyed by operation (e.g.: ConsolidatedRefresh)."""
+
+    # Pass one to Laundry(metrics=...) to start collecting. Share an instance among controllers (e.g.: all accounts in a
+    # LaundryFleet) to aggregate them. Labels never include account data. Without a registry, the request pipeline only
+    # pays for a None check.
+
+    def __init__(
+        self, latency_buckets_sec: Sequence[float] = DEFAULT_LATENCY_BUCKETS_SEC
+    ) -> None:
+        """Initialize registry."""
+
+        self.latency_buckets_sec = tuple(sorted(latency_buckets_sec))
+        self.reset()
+
+    def reset(self) -> None:
+        """Clear all metrics."""
+
+        self.requests: dict[str, int] = {}
+        self.latencies: dict[str, Histogram] = {}
+        self.result_codes: dict[tuple[str, int | None], int] = {}
+        self.request_bytes: dict[str, int] = {}
+        self.response_bytes: dict[str, int] = {}
+        self.communication_errors: dict[str, int] = {}
+        self.relogins = 0
+
+    def record_response(
+        self,
+        operation: str,
+        latency_sec: float,
+        request_bytes: int,
+        response_bytes: int,
+        result_code: int | None,
+    ) -> None:
+        """Record request that got a response. result_code is None if the response couldn't be unpacked."""
+
+        self.requests[operation] = self.requests.get(operation, 0) + 1
+
+        if (histogram := self.latencies.get(operation)) is None:
+            histogram = self.latencies[operation] = Histogram(self.latency_buckets_sec)
+        histogram.observe(latency_sec)
+
+        self.request_bytes[operation] = (
+            self.request_bytes.get(operation, 0) + request_bytes
+        )
+        self.response_bytes[operation] = (
+            self.response_bytes.get(operation, 0) + response_bytes
+        )
+
+        key = (operation, result_code)
+        self.result_codes[key] = self.result_codes.get(key, 0) + 1
+
+    def record_communication_error(self, operation: str, request_bytes: int) -> None:
+        """Record request that never got a response (timeout, connection error, cancellation)."""
+
+        self.requests[operation] = self.requests.get(operation, 0) + 1
+        self.request_bytes[operation] = (
+            self.request_bytes.get(operation, 0) + request_bytes
+        )
+        self.communication_errors[operation] = (
+            self.communication_errors.get(operation, 0) + 1
+        )
+
+    def record_relogin(self) -> None:
+        """Record re-login after the server rejected a session."""
+
+        self.relogins += 1
+
+    def to_prometheus(self, prefix: str = DEFAULT_METRICS_PREFIX) -> str:
+        """Return metrics in Prometheus text exposition format."""
+
+        lines: list[str] = []
+
+        def family(
+            name: str,
+            metric_type: str,
+            help_text: str,
+            samples: Iterable[tuple[str, dict[str, str], float]],
+        ) -> None:
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} {metric_type}")
+            lines.extend(
+                f"{prefix}_{name}{suffix}{_format_labels(labels)} {_format_value(value)}"
+                for suffix, labels, value in samples
+            )
+
+        family(
+            "requests_total",
+            "counter",
+            "Requests sent, by operation.",
+            (
+                ("", {"operation": operation}, count)
+                for operation, count in sorted(self.requests.items())
+            ),
+        )
+
+        family(
+            "request_duration_seconds",
+            "histogram",
+            "Time from sending a request to having its response unpacked.",
+            self._histogram_samples(),
+        )
+
+        family(
+            "responses_total",
+            "counter",
+            "Responses received, by operation and server result code.",
+            (
+                (
+                    "",
+                    {
+                        "operation": operation,
+                        "result_code": "" if code is None else str(code),
+                    },
+                    count,
+                )
+                for (operation, code), count in sorted(
+                    self.result_codes.items(), key=lambda item: str(item[0])
+                )
+            ),
+        )
+
+        family(
+            "request_bytes_total",
+            "counter",
+            "Request body bytes sent, by operation.",
+            (
+                ("", {"operation": operation}, count)
+                for operation, count in sorted(self.request_bytes.items())
+            ),
+        )
+
+        family(
+            "response_bytes_total",
+            "counter",
+            "Response body bytes received, by operation.",
+            (
+                ("", {"operation": operation}, count)
+                for operation, count in sorted(self.response_bytes.items())
+            ),
+        )
+
+        family(
+            "communication_errors_total",
+            "counter",
+            "Requests that got no response, by operation.",
+            (
+                ("", {"operation": operation}, count)
+                for operation, count in sorted(self.communication_errors.items())
+            ),
+        )
+
+        family(
+            "relogins_total",
+            "counter",
+            "Re-logins after the server rejected a session.",
+            [("", {}, self.relogins)],
+        )
+
+        return "\n".join(lines) + "\n"
+
+    def _histogram_samples(self) -> Iterable[tuple[str, dict[str, str], float]]:
+        """Yield bucket, sum and count samples for each operation's latency histogram."""
+
+        for operation, histogram in sorted(self.latencies.items()):
+            bounds = [_format_value(bound) for bound in histogram.bounds] + ["+Inf"]
+
+            for bound, count in zip(bounds, histogram.cumulative_counts()):
+                yield "_bucket", {"operation": operation, "le": bound}, count
+
+            yield "_sum", {"operation": operation}, histogram.sum
+            yield "_count", {"operation": operation}, histogram.count
+
+
+def _format_labels(labels: dict[str, str]) -> str:
+    """Format label set, escaping values as the exposition format requires."""
+
+    if not labels:
+        return ""
+
+    return (
+        "{"
+        + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items())
+        + "}"
+    )
+
+
+def _escape(value: str) -> str:
+    """Escape label value."""
+
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value: float) -> str:
+    """Format sample value. Integers are written without a decimal point."""
+
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
@@ -0,0 +1,92 @@
+"""pylaundry data models."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from enum import Enum
+
+
+class MachineType(Enum):
+    """Laundry machine types."""
+
+    WASHER = "Washer"
+    DRYER = "Dryer"
+    UNKNOWN = "Unknown"
+
+
+@dataclass
+class LaundryMachine:
+    """Representation of a washer or dryer."""
+
+    # Slotted to drop the per-instance __dict__. Large rooms / fleets hold many of these.
+    __slots__ = (
+        "id_",
+        "type",
+        "number",
+        "busy",
+        "minutes_remaining",
+        "base_price",
+        "topoff_price",
+        "topoff_time_min",
+        "online",
+        "reader_serial",
+    )
+
+    id_: str
+    type: MachineType
+    number: str
+    busy: bool | None
+    minutes_remaining: int | None
+    base_price: float | None
+    topoff_price: float | None
+    topoff_time_min: int | None
+    online: bool | None
+    reader_serial: str | None
+
+
+@dataclass
+class LaundryProfile:
+    """Metadata for location and user's virtual card."""
+
+    location_address: str
+    card_balance: float
+    user_id: str
+    user_token: str
+    location_id: str
+    database_id: str | None
+    card_serial: str | None
+
+
+@dataclass
+class MachineChanges:
+    """IDs of machines affected by a machine data update."""
+
+    added: set[str] = field(default_factory=set)
+    updated: set[str] = field(default_factory=set)
+    removed: set[str] = field(default_factory=set)
+
+    @property
+    def changed(self) -> set[str]:
+        """Return IDs of all added, updated, and removed machines."""
+        return self.added | self.updated | self.removed
+
+
+class VendStatus(Enum):
+    """Outcome of one vend in a multi-vend."""
+
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    SKIPPED = (
+        "skipped"  # Not attempted because an earlier vend for the same machine failed.
+    )
+
+
+@dataclass
+class VendOutcome:
+    """Result of one vend in a multi-vend. sequence is the vend's position among its machine's vends."""
+
+    machine_id: str
+    sequence: int
+    price: float | None
+    status: VendStatus
+    error: Exception | None = None
@@ -0,0 +1,324 @@
+"""Client-side rate limiting, retries and circuit breaking."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from dataclasses import dataclass
+from enum import Enum
+import logging
+import random
+import time
+from typing import TypeVar
+
+from .exceptions import CircuitOpen, CommunicationError
+
+log = logging.getLogger(__name__)
+
+_T = TypeVar("_T")
+
+# Operations that are safe to send more than once. Vends and vend log entries are never retried.
+IDEMPOTENT_OPERATIONS = frozenset(
+    {
+        "Authenticate2",
+        "ConsolidatedRefresh",
+        "GetAdditionalInformation",
+        "GetVendPrice",
+    }
+)
+
+DEFAULT_ENDPOINT_RATE_PER_SEC = 10.0
+DEFAULT_ENDPOINT_BURST = 20
+DEFAULT_ACCOUNT_RATE_PER_SEC = 2.0
+DEFAULT_ACCOUNT_BURST = 5
+DEFAULT_MAX_ATTEMPTS = 3
+DEFAULT_BASE_DELAY_SEC = 0.5
+DEFAULT_MAX_DELAY_SEC = 10.0
+DEFAULT_FAILURE_THRESHOLD = 5
+DEFAULT_RESET_TIMEOUT_SEC = 30.0
+
+
+class TokenBucket:
+    """Token bucket rate limiter."""
+
+    # Tokens may go negative. Each caller reserves a token up front and sleeps until its reservation is covered, so
+    # waiters are served in arrival order without a lock.
+
+    def __init__(
+        self,
+        rate_per_sec: float,
+        burst: int,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize bucket. Starts full."""
+
+        if rate_per_sec <= 0 or burst < 1:
+            raise ValueError("rate_per_sec must be positive and burst at least 1.")
+
+        self.rate_per_sec = rate_per_sec
+        self.burst = burst
+        self.wait_count = 0
+
+        self._clock = clock
+        self._tokens = float(burst)
+        self._updated_at = clock()
+
+    @property
+    def tokens(self) -> float:
+        """Return tokens currently available. Negative while callers are waiting."""
+
+        self._refill()
+        return self._tokens
+
+    async def acquire(self) -> None:
+        """Take a token, waiting for one if the bucket is empty."""
+
+        if (wait_sec := self.reserve()) > 0:
+            await asyncio.sleep(wait_sec)
+
+    def reserve(self) -> float:
+        """Take a token and return seconds until it's actually available."""
+
+        self._refill()
+        self._tokens -= 1
+
+        if self._tokens >= 0:
+            return 0.0
+
+        self.wait_count += 1
+        return -self._tokens / self.rate_per_sec
+
+    def _refill(self) -> None:
+        """Add tokens accrued since last refill."""
+
+        now = self._clock()
+        self._tokens = min(
+            self.burst, self._tokens + (now - self._updated_at) * self.rate_per_sec
+        )
+        self._updated_at = now
+
+
+@dataclass
+class RetryPolicy:
+    """Exponential backoff with full jitter for idempotent operations."""
+
+    max_attempts: int = DEFAULT_MAX_ATTEMPTS
+    base_delay_sec: float = DEFAULT_BASE_DELAY_SEC
+    max_delay_sec: float = DEFAULT_MAX_DELAY_SEC
+    jitter: bool = True
+
+    def delay(self, attempt: int) -> float:
+        """Return seconds to wait after a failed attempt (starting at 1)."""
+
+        delay = min(self.max_delay_sec, self.base_delay_sec * 2 ** (attempt - 1))
+
+        return random.uniform(0, delay) if self.jitter else delay  # nosec
+
+
+class CircuitState(str, Enum):
+    """Circuit breaker states."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Fails fast after repeated communication failures."""
+
+    # After failure_threshold consecutive failures, the breaker opens and rejects calls for reset_timeout_sec. It then
+    # lets a single probe through (half open). The probe's outcome closes or re-opens the breaker.
+
+    def __init__(
+        self,
+        failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+        reset_timeout_sec: float = DEFAULT_RESET_TIMEOUT_SEC,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize breaker."""
+
+        self.failure_threshold = failure_threshold
+        self.reset_timeout_sec = reset_timeout_sec
+
+        self.consecutive_failures = 0
+        self.open_count = 0
+        self.opened_at: float | None = None
+
+        self._clock = clock
+        self._probing = False
+
+    @property
+    def state(self) -> CircuitState:
+        """Return current state."""
+
+        if self.opened_at is None:
+            return CircuitState.CLOSED
+
+        if self._clock() - self.opened_at < self.reset_timeout_sec:
+            return CircuitState.OPEN
+
+        return CircuitState.HALF_OPEN
+
+    def before_call(self) -> None:
+        """Raise CircuitOpen if calls aren't allowed right now."""
+
+        if (state := self.state) == CircuitState.CLOSED:
+            return
+
+        if state == CircuitState.HALF_OPEN and not self._probing:
+            self._probing = True
+            return
+
+        raise CircuitOpen("Server marked unhealthy. Not sending request.")
+
+    def record_success(self) -> None:
+        """Close breaker."""
+
+        if self.opened_at is not None:
+            log.info("Circuit breaker closed.")
+
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self._probing = False
+
+    def record_failure(self) -> None:
+        """Count failure and open breaker if threshold is reached or probe failed."""
+
+        self.consecutive_failures += 1
+
+        if self._probing or (
+            self.opened_at is None
+            and self.consecutive_failures >= self.failure_threshold
+        ):
+            log.warning(
+                "Circuit breaker opened after %s consecutive failures.",
+                self.consecutive_failures,
+            )
+            self.opened_at = self._clock()
+            self.open_count += 1
+
+        self._probing = False
+
+    def release(self) -> None:
+        """Give up probe slot without an outcome, e.g.: when the probe was cancelled."""
+        self._probing = False
+
+
+@dataclass
+class ResilienceStats:
+    """Resilience counters."""
+
+    attempts: int = 0
+    retries: int = 0
+    rejected: int = 0
+
+
+class Resilience:
+    """Rate limiting, retries and circuit breaking for requests to a single endpoint."""
+
+    # Share one instance among controllers (e.g.: all accounts in a LaundryFleet) so that the endpoint rate limit and
+    # circuit breaker apply to their combined traffic. Each account additionally gets its own rate limit. Set a rate to
+    # None to disable that limiter.
+
+    def __init__(
+        self,
+        endpoint_rate_per_sec: float | None = DEFAULT_ENDPOINT_RATE_PER_SEC,
+        endpoint_burst: int = DEFAULT_ENDPOINT_BURST,
+        account_rate_per_sec: float | None = DEFAULT_ACCOUNT_RATE_PER_SEC,
+        account_burst: int = DEFAULT_ACCOUNT_BURST,
+        retry: RetryPolicy | None = None,
+        breaker: CircuitBreaker | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize resilience layer."""
+
+        self.endpoint_limiter = (
+            TokenBucket(endpoint_rate_per_sec, endpoint_burst, clock=clock)
+            if endpoint_rate_per_sec
+            else None
+        )
+        self.account_rate_per_sec = account_rate_per_sec
+        self.account_burst = account_burst
+        self.account_limiters: dict[Hashable, TokenBucket] = {}
+        self.retry = retry or RetryPolicy()
+        self.breaker = breaker or CircuitBreaker(clock=clock)
+        self.stats = ResilienceStats()
+
+        self._clock = clock
+
+    async def async_call(
+        self, operation: str, account: Hashable, func: Callable[[], Awaitable[_T]]
+    ) -> _T:
+        """Await func() subject to rate limits, retrying communication errors if operation is idempotent."""
+
+        max_attempts = (
+            self.retry.max_attempts if operation in IDEMPOTENT_OPERATIONS else 1
+        )
+
+        attempt = 0
+
+        while True:
+            attempt += 1
+
+            try:
+                self.breaker.before_call()
+            except CircuitOpen:
+                self.stats.rejected += 1
+                raise
+
+            try:
+                await self._async_acquire(account)
+
+                self.stats.attempts += 1
+
+                result = await func()
+            except CommunicationError as err:
+                # Cancellation surfaces as CommunicationError from _send_request, and a CircuitOpen from a nested call
+                # never reached the server. Neither says anything about server health.
+                if isinstance(err, CircuitOpen) or isinstance(
+                    err.__cause__, asyncio.CancelledError
+                ):
+                    self.breaker.release()
+                    raise
+
+                self.breaker.record_failure()
+
+                if attempt >= max_attempts:
+                    raise
+
+                self.stats.retries += 1
+                delay = self.retry.delay(attempt)
+
+                log.debug(
+                    "%s failed (attempt %s of %s). Retrying in %.2f seconds.",
+                    operation,
+                    attempt,
+                    max_attempts,
+                    delay,
+                )
+
+                await asyncio.sleep(delay)
+            except Exception:
+                # Server answered, even if the answer was bad.
+                self.breaker.record_success()
+                raise
+            except BaseException:
+                self.breaker.release()
+                raise
+            else:
+                self.breaker.record_success()
+                return result
+
+    async def _async_acquire(self, account: Hashable) -> None:
+        """Wait for endpoint and account rate limits."""
+
+        if self.endpoint_limiter is not None:
+            await self.endpoint_limiter.acquire()
+
+        if self.account_rate_per_sec:
+            if (limiter := self.account_limiters.get(account)) is None:
+                limiter = self.account_limiters[account] = TokenBucket(
+                    self.account_rate_per_sec, self.account_burst, clock=self._clock
+                )
+
+            await limiter.acquire()
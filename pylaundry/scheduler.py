@@ -0,0 +1,158 @@
+"""Adaptive refresh scheduling."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import time
+
+from . import Laundry
+
+log = logging.getLogger(__name__)
+
+DEFAULT_MIN_INTERVAL_SEC = 30
+DEFAULT_MAX_INTERVAL_SEC = 900
+DEFAULT_IDLE_INTERVAL_SEC = 120
+DEFAULT_BACKOFF_FACTOR = 2.0
+DEFAULT_JITTER = 0.1
+
+
+class RefreshScheduler:
+    """Refreshes a Laundry controller on an interval derived from machine state."""
+
+    # While machines are running, the next refresh is scheduled halfway to the soonest cycle end, so polling tightens as
+    # a cycle finishes (down to min_interval_sec). While everything is idle, the interval starts at idle_interval_sec
+    # and grows by backoff_factor after each idle refresh, up to max_interval_sec. Failed refreshes back off the same
+    # way. Every delay is randomized by +/- jitter (as a fraction) so that many schedulers don't poll in lockstep.
+
+    def __init__(
+        self,
+        laundry: Laundry,
+        min_interval_sec: float = DEFAULT_MIN_INTERVAL_SEC,
+        max_interval_sec: float = DEFAULT_MAX_INTERVAL_SEC,
+        idle_interval_sec: float = DEFAULT_IDLE_INTERVAL_SEC,
+        backoff_factor: float = DEFAULT_BACKOFF_FACTOR,
+        jitter: float = DEFAULT_JITTER,
+    ) -> None:
+        """Initialize scheduler."""
+
+        if not 0 < min_interval_sec <= max_interval_sec:
+            raise ValueError(
+                "Intervals must satisfy 0 < min_interval_sec <= max_interval_sec."
+            )
+
+        self.laundry = laundry
+        self.min_interval_sec = min_interval_sec
+        self.max_interval_sec = max_interval_sec
+        self.idle_interval_sec = idle_interval_sec
+        self.backoff_factor = backoff_factor
+        self.jitter = jitter
+
+        self.last_refresh_at: float | None = None
+        self.next_refresh_at: float | None = None
+        self.last_error: Exception | None = None
+
+        self._idle_streak = 0
+        self._failure_streak = 0
+        self._task: asyncio.Task | None = None
+        self._wake: asyncio.Event | None = None
+
+    @property
+    def running(self) -> bool:
+        """Check whether scheduler is running."""
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Start refreshing in the background. The first refresh runs immediately."""
+
+        if self.running:
+            return
+
+        self._wake = asyncio.Event()
+        self._task = asyncio.create_task(self._async_run(self._wake))
+
+    async def stop(self) -> None:
+        """Stop refreshing and wait for background task to exit."""
+
+        if (task := self._task) is None:
+            return
+
+        self._task = None
+        task.cancel()
+
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    def refresh_now(self) -> None:
+        """Skip the current wait and refresh immediately."""
+
+        if self._wake is not None:
+            self._wake.set()
+
+    def next_delay(self) -> float:
+        """Return seconds until the next refresh based on current machine state."""
+
+        if self._failure_streak:
+            delay = self.idle_interval_sec * self.backoff_factor ** (
+                self._failure_streak - 1
+            )
+        elif (soonest_sec := self._soonest_cycle_end_sec()) is not None:
+            delay = soonest_sec / 2
+        else:
+            delay = self.idle_interval_sec * self.backoff_factor ** max(
+                self._idle_streak - 1, 0
+            )
+
+        if self.jitter:
+            delay *= random.uniform(1 - self.jitter, 1 + self.jitter)  # nosec
+
+        # Clamped after jitter so that jitter never takes the delay outside the configured bounds.
+        return min(max(delay, self.min_interval_sec), self.max_interval_sec)
+
+    async def _async_run(self, wake: asyncio.Event) -> None:
+        """Refresh, wait, repeat."""
+
+        while True:
+            # Cleared before refreshing so that a refresh_now() call made mid-refresh triggers another refresh.
+            wake.clear()
+
+            try:
+                await self.laundry.async_refresh()
+            except Exception as err:  # pylint: disable=broad-except
+                log.warning("Scheduled refresh failed: %r", err)
+                self.last_error = err
+                self._failure_streak += 1
+            else:
+                self.last_error = None
+                self._failure_streak = 0
+                self._idle_streak = (
+                    0
+                    if self._soonest_cycle_end_sec() is not None
+                    else self._idle_streak + 1
+                )
+
+            self.last_refresh_at = time.monotonic()
+
+            delay = self.next_delay()
+            self.next_refresh_at = self.last_refresh_at + delay
+
+            log.debug("Next refresh in %.1f seconds.", delay)
+
+            try:
+                await asyncio.wait_for(wake.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+
+    def _soonest_cycle_end_sec(self) -> float | None:
+        """Return seconds until the first running machine finishes, or None if nothing is running."""
+
+        remaining = [
+            machine.minutes_remaining
+            for machine in getattr(self.laundry, "machines", {}).values()
+            if machine.busy and machine.minutes_remaining
+        ]
+
+        return min(remaining) * 60 if remaining else None
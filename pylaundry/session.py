@@ -0,0 +1,141 @@
+"""Persistence of session state across process restarts."""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import asdict, dataclass, field
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+import time
+from typing import Any
+
+from .models import LaundryMachine, LaundryProfile, MachineType
+
+log = logging.getLogger(__name__)
+
+SESSION_STATE_VERSION = 1
+
+
+@dataclass
+class SessionState:
+    """Everything needed to resume a session without sending Authenticate2."""
+
+    # Credentials are deliberately not included. Pass them to Laundry.async_resume() for the login fallback.
+
+    installation_token: str
+    first_request_id: str | None
+    auth_token: str
+    profile: LaundryProfile
+    machines: list[LaundryMachine] = field(default_factory=list)
+    saved_at: float = field(default_factory=time.time)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to JSON-serializable dict."""
+
+        return {
+            "version": SESSION_STATE_VERSION,
+            "installation_token": self.installation_token,
+            "first_request_id": self.first_request_id,
+            "auth_token": self.auth_token,
+            "profile": asdict(self.profile),
+            "machines": [
+                {**asdict(machine), "type": machine.type.value}
+                for machine in self.machines
+            ],
+            "saved_at": self.saved_at,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> SessionState:
+        """Build from dict produced by to_dict(). Raises ValueError if data is from an unsupported version."""
+
+        if (version := data.get("version")) != SESSION_STATE_VERSION:
+            raise ValueError(f"Unsupported session state version {version}.")
+
+        return cls(
+            installation_token=data["installation_token"],
+            first_request_id=data["first_request_id"],
+            auth_token=data["auth_token"],
+            profile=LaundryProfile(**data["profile"]),
+            machines=[
+                LaundryMachine(**{**machine, "type": MachineType(machine["type"])})
+                for machine in data["machines"]
+            ],
+            saved_at=data["saved_at"],
+        )
+
+
+class SessionStore:
+    """Base class for session state storage. Subclass to keep sessions in e.g.: Redis or a database."""
+
+    async def async_load(self, key: str) -> SessionState | None:
+        """Return stored session state for key, or None if there is none."""
+        raise NotImplementedError
+
+    async def async_save(self, key: str, state: SessionState) -> None:
+        """Store session state under key."""
+        raise NotImplementedError
+
+    async def async_delete(self, key: str) -> None:
+        """Remove stored session state for key."""
+        raise NotImplementedError
+
+
+class FileSessionStore(SessionStore):
+    """Stores each session as a JSON file in a directory."""
+
+    # Session files contain auth tokens. They're created readable by the owner only. Filenames are hashed so that
+    # usernames (email addresses) don't show up in directory listings.
+
+    def __init__(self, directory: str | os.PathLike) -> None:
+        """Initialize store."""
+
+        self.directory = Path(directory)
+
+    async def async_load(self, key: str) -> SessionState | None:
+        """Return stored session state for key, or None if there is none or it can't be read."""
+
+        return await asyncio.to_thread(self._load, key)
+
+    async def async_save(self, key: str, state: SessionState) -> None:
+        """Store session state under key."""
+
+        await asyncio.to_thread(self._save, key, state)
+
+    async def async_delete(self, key: str) -> None:
+        """Remove stored session state for key."""
+
+        await asyncio.to_thread(self._path(key).unlink, missing_ok=True)
+
+    def _path(self, key: str) -> Path:
+        """Return file path for key."""
+
+        return self.directory / f"{hashlib.sha256(key.encode()).hexdigest()}.json"
+
+    def _load(self, key: str) -> SessionState | None:
+        """Read session file."""
+
+        try:
+            return SessionState.from_dict(json.loads(self._path(key).read_text()))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError, TypeError) as err:
+            log.warning("Ignoring unreadable session file: %r", err)
+            return None
+
+    def _save(self, key: str, state: SessionState) -> None:
+        """Write session file atomically."""
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        path = self._path(key)
+        tmp_path = path.with_suffix(".tmp")
+
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w") as file:
+            json.dump(state.to_dict(), file)
+
+        os.replace(tmp_path, path)
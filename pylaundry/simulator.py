@@ -0,0 +1,552 @@
+"""Local stand-in for the Laundry Link server.
+
+Speaks the real wire protocol (encrypted requests, gzip+base64 responses, auth token headers) so that the full client
+can be exercised offline, e.g.: for load testing. Run standalone with `python -m pylaundry.simulator --help`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections import Counter, deque
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+import hashlib
+import json
+import logging
+import math
+import random
+import time
+import uuid
+
+from aiohttp import web
+
+from .const import (
+    AUTH_TOKEN_KEY,
+    EMPTY_AUTH_TOKEN,
+    REFRESH_REQUEST_PREHASH_SUFFIX,
+    RESULT_CODE_KEY,
+    RESULT_TEXT_KEY,
+    ServerResponseCodes,
+    VendResultCodes,
+)
+from .exceptions import MessagePackerError
+from .helpers import MessagePacker
+from .models import MachineType
+
+log = logging.getLogger(__name__)
+
+DEFAULT_USERNAME = "test@example.com"
+DEFAULT_PASSWORD = "hunter2"  # nosec
+DEFAULT_MACHINE_COUNT = 20
+DEFAULT_CARD_BALANCE = 20.0
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8080
+
+WASHER_CYCLE_MIN = 30
+DRYER_CYCLE_MIN = 60
+
+
+@dataclass
+class SimulatedMachine:
+    """Server-side state of a simulated machine."""
+
+    reader_id: str
+    type: MachineType
+    label: str
+    serial_number: str
+    base_price: float
+    topoff_price: float
+    topoff_time_min: int
+    cycle_time_min: int
+    online: bool = True
+    cycle_ends_at: float = 0.0  # Unix time.
+
+    def minutes_remaining(self, now: float) -> int:
+        """Return whole minutes until the current cycle ends."""
+        return max(0, math.ceil((self.cycle_ends_at - now) / 60))
+
+    def to_dict(self, now: float, timestamp: str) -> dict:
+        """Return entry for MachinesInformation response object."""
+
+        minutes_remaining = self.minutes_remaining(now)
+
+        return {
+            "ReaderID": self.reader_id,
+            "SetupType": self.type.value,
+            "Label": self.label,
+            "SerialNumber": self.serial_number,
+            "IsBusy": minutes_remaining > 0,
+            "IsReadyToVend": self.online,
+            "MinutesRemaining": minutes_remaining,
+            "BasePrice": self.base_price,
+            "StateDateTimeUtc": timestamp,
+            "IsOnline": self.online,
+        }
+
+
+@dataclass
+class SimulatorStats:
+    """Simulator counters."""
+
+    requests: Counter = field(default_factory=Counter)
+    result_codes: Counter = field(default_factory=Counter)
+    logins: int = 0
+    vends: int = 0
+
+
+@dataclass
+class _Session:
+    """Server-side session, shared by all auth tokens issued for it."""
+
+    first_request_id: str
+
+
+class LaundrySimulator:
+    """Simulated Laundry Link server with a single account and a room of machines."""
+
+    # error_rates maps result codes (e.g.: ServerResponseCodes.TRY_AGAIN_LATER_BAD_REQUEST) to the probability that any
+    # request is answered with that code instead of being processed. Use fail_next() for deterministic failures. With
+    # rotate_auth_tokens, every response carries a new auth token, like the real server. Older tokens stay valid so
+    # that requests already in flight aren't rejected.
+
+    def __init__(
+        self,
+        machine_count: int = DEFAULT_MACHINE_COUNT,
+        busy_fraction: float = 0.3,
+        offline_fraction: float = 0.0,
+        latency_sec: float = 0.0,
+        latency_jitter_sec: float = 0.0,
+        error_rates: dict[int, float] | None = None,
+        card_balance: float = DEFAULT_CARD_BALANCE,
+        username: str = DEFAULT_USERNAME,
+        password: str = DEFAULT_PASSWORD,
+        rotate_auth_tokens: bool = False,
+        seed: int | None = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """Initialize simulator."""
+
+        self.latency_sec = latency_sec
+        self.latency_jitter_sec = latency_jitter_sec
+        self.error_rates = dict(error_rates or {})
+        self.card_balance = card_balance
+        self.username = username
+        self.password = password
+        self.rotate_auth_tokens = rotate_auth_tokens
+        self.stats = SimulatorStats()
+        self.url: str | None = None
+
+        self._random = random.Random(seed)  # nosec
+        self._clock = clock
+
+        self.user_id = self._uuid()
+        self.database_id = self._uuid()
+        self.location_id = self._uuid()
+        self.card_serial = f"{self._random.randrange(10000):04d}"
+
+        now = clock()
+        self.machines: dict[str, SimulatedMachine] = {}
+
+        for i in range(machine_count):
+            machine_type = MachineType.DRYER if i % 2 else MachineType.WASHER
+            serial_number = f"{10010000 + i}"
+
+            self.machines[serial_number] = SimulatedMachine(
+                reader_id=self._uuid(),
+                type=machine_type,
+                label=f"{i + 1:02d}",
+                serial_number=serial_number,
+                base_price=1.5 if machine_type is MachineType.DRYER else 2.0,
+                topoff_price=0.25 if machine_type is MachineType.DRYER else 0.0,
+                topoff_time_min=5 if machine_type is MachineType.DRYER else 0,
+                cycle_time_min=(
+                    DRYER_CYCLE_MIN
+                    if machine_type is MachineType.DRYER
+                    else WASHER_CYCLE_MIN
+                ),
+                online=self._random.random() >= offline_fraction,
+                cycle_ends_at=(
+                    now + self._random.randrange(1, 60) * 60
+                    if self._random.random() < busy_fraction
+                    else 0.0
+                ),
+            )
+
+        self._sessions: dict[str, _Session] = {}
+        self._forced_codes: deque[tuple[int, str | None]] = deque()
+        self._runner: web.AppRunner | None = None
+
+    async def __aenter__(self) -> LaundrySimulator:
+        """Start server on a free local port."""
+
+        await self.start()
+        return self
+
+    async def __aexit__(self, *args: object) -> None:
+        """Stop server."""
+        await self.stop()
+
+    def make_app(self) -> web.Application:
+        """Return aiohttp application serving the API endpoint at any path."""
+
+        app = web.Application()
+        app.router.add_post("/{tail:.*}", self._async_handle)
+        return app
+
+    async def start(self, host: str = DEFAULT_HOST, port: int = 0) -> str:
+        """Start serving. Port 0 picks a free port. Returns endpoint URL to pass to Laundry(endpoint_url=...)."""
+
+        self._runner = web.AppRunner(self.make_app(), access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, host, port).start()
+
+        bound_host, bound_port = self._runner.addresses[0][:2]
+        self.url = f"http://{bound_host}:{bound_port}/AppRequestHandler.aspx"
+
+        return self.url
+
+    async def stop(self) -> None:
+        """Stop serving."""
+
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+            self.url = None
+
+    def fail_next(self, result_code: int, operation: str | None = None) -> None:
+        """Answer the next request (for operation, if given) with result_code instead of processing it."""
+        self._forced_codes.append((result_code, operation))
+
+    def invalidate_sessions(self) -> None:
+        """Forget all sessions, as if the server restarted. Clients get INPUT_MALFORMED until they log in again."""
+        self._sessions.clear()
+
+    async def _async_handle(self, request: web.Request) -> web.Response:
+        """Handle API request."""
+
+        if self.latency_sec or self.latency_jitter_sec:
+            await asyncio.sleep(
+                self.latency_sec + self._random.uniform(0, self.latency_jitter_sec)
+            )
+
+        form = await request.post()
+        request_id = request.headers.get("CP_REQ_ID", "")
+        auth_token = request.headers.get(AUTH_TOKEN_KEY, EMPTY_AUTH_TOKEN)
+
+        # Unauthenticated requests are packed with the pre-auth key. Everything else uses the key derived from the
+        # session's first request ID, which the server learns from the CP_REQ_ID of the login request.
+        session = None
+        first_request_id = None
+
+        if auth_token != EMPTY_AUTH_TOKEN:
+            if (session := self._sessions.get(auth_token)) is not None:
+                first_request_id = session.first_request_id
+
+        try:
+            request_data = json.loads(
+                MessagePacker.unpack_client_request(
+                    str(form.get("CP_REQ_DATA", "")),
+                    new_request_id=request_id,
+                    first_request_id=first_request_id,
+                )
+            )
+            operation = str(request_data[0])
+        except (MessagePackerError, ValueError, TypeError, IndexError):
+            return self._respond(
+                "unknown",
+                _result(ServerResponseCodes.INPUT_MALFORMED, "The input is not valid."),
+            )
+
+        self.stats.requests[operation] += 1
+
+        if (result_code := self._injected_result_code(operation)) is not None:
+            return self._respond(operation, _result(result_code, "Simulated error."))
+
+        new_auth_token = None
+
+        if operation == "Authenticate2":
+            content = self._authenticate(request_data)
+
+            if content[RESULT_CODE_KEY] == ServerResponseCodes.SUCCESS:
+                # Logging in again within a session keeps its first request ID. That's what the client keeps, too.
+                new_auth_token = str(uuid.uuid4())
+                self._sessions[new_auth_token] = session or _Session(
+                    first_request_id=request_id
+                )
+                self.stats.logins += 1
+
+        elif session is None:
+            content = _result(
+                ServerResponseCodes.INPUT_MALFORMED, "The input is not valid."
+            )
+
+        else:
+            content = self._dispatch(operation, request_data)
+
+            if self.rotate_auth_tokens:
+                new_auth_token = str(uuid.uuid4())
+                self._sessions[new_auth_token] = session
+
+        return self._respond(operation, content, new_auth_token)
+
+    def _respond(
+        self, operation: str, content: dict, auth_token: str | None = None
+    ) -> web.Response:
+        """Pack response content."""
+
+        self.stats.result_codes[content.get(RESULT_CODE_KEY)] += 1
+
+        log.debug("%s -> %s", operation, content.get(RESULT_CODE_KEY))
+
+        # The real server mislabels its JSON responses as text/html.
+        return web.Response(
+            body=MessagePacker.pack_server_response(content),
+            content_type="text/html",
+            headers={AUTH_TOKEN_KEY: auth_token} if auth_token else None,
+        )
+
+    def _injected_result_code(self, operation: str) -> int | None:
+        """Return result code to answer with instead of processing the request, if any."""
+
+        if self._forced_codes:
+            result_code, forced_operation = self._forced_codes[0]
+
+            if forced_operation in (None, operation):
+                self._forced_codes.popleft()
+                return result_code
+
+        for result_code, rate in self.error_rates.items():
+            if self._random.random() < rate:
+                return result_code
+
+        return None
+
+    def _dispatch(self, operation: str, request_data: list) -> dict:
+        """Process authenticated request."""
+
+        if operation in ("ConsolidatedRefresh", "GetVendPrice", "VirtualVend"):
+            user_token = request_data[1] if len(request_data) > 1 else None
+
+            if user_token != self._user_token():
+                return _result(ServerResponseCodes.INVALID_USER_ID, "Invalid user.")
+
+        if operation == "ConsolidatedRefresh":
+            return {
+                "CardInformation": self._card_information(),
+                "MachinesInformation": self._machines_information(),
+                **_result(
+                    ServerResponseCodes.SUCCESS,
+                    "Consolidated data refresh request processed.",
+                ),
+            }
+
+        if operation == "GetVendPrice":
+            return self._get_vend_price(request_data)
+
+        if operation == "VirtualVend":
+            return self._virtual_vend(request_data)
+
+        if operation == "CreateVendLogEntry":
+            return _result(ServerResponseCodes.SUCCESS, "Success")
+
+        if operation == "GetAdditionalInformation":
+            return {
+                "Values": [f"{self._random.getrandbits(64):016x}"],
+                **_result(ServerResponseCodes.SUCCESS, ""),
+            }
+
+        return _result(ServerResponseCodes.INVALID_REQUEST, "Unknown request.")
+
+    def _authenticate(self, request_data: list) -> dict:
+        """Process Authenticate2 request."""
+
+        if request_data[2:4] != [self.username, self.password]:
+            return _result(
+                ServerResponseCodes.INVALID_CREDENTIALS,
+                "The specified email and password combination is not valid.",
+            )
+
+        return {
+            "DatabaseID": self.database_id,
+            "LocationID": self.location_id,
+            "LocationAddress": "123 Main St., Anytown, PA 19000",
+            "UserID": self.user_id,
+            "Bundle": {
+                "CardInformation": self._card_information(),
+                "MachinesInformation": self._machines_information(),
+                **_result(
+                    ServerResponseCodes.SUCCESS,
+                    "Consolidated data refresh request processed.",
+                ),
+            },
+            **_result(ServerResponseCodes.SUCCESS, "Authentication successful."),
+        }
+
+    def _get_vend_price(self, request_data: list) -> dict:
+        """Process GetVendPrice request."""
+
+        if (machine := self._get_machine(request_data)) is None:
+            return _result(
+                ServerResponseCodes.TRY_AGAIN_LATER_BAD_REQUEST, "Unknown reader."
+            )
+
+        if not machine.online:
+            return _result(
+                ServerResponseCodes.TRY_AGAIN_LATER_SWIPE_FAILED,
+                "Unable to communicate with machine.",
+            )
+
+        busy = machine.minutes_remaining(self._clock()) > 0
+
+        return {
+            "DatabaseID": self.database_id,
+            "ReaderID": machine.reader_id,
+            "ReaderSerialNumber": machine.serial_number,
+            "BasePrice": machine.base_price,
+            "TopoffPrice": machine.topoff_price,
+            "BaseTime": machine.cycle_time_min,
+            "TopoffTime": machine.topoff_time_min,
+            "IsTopOffPossible": machine.type is MachineType.DRYER,
+            "IsMachineBusy": busy,
+            **_result(
+                ServerResponseCodes.SUCCESS, "Vend price retrieved successfully."
+            ),
+        }
+
+    def _virtual_vend(self, request_data: list) -> dict:
+        """Process VirtualVend request. Idle machines start a cycle; busy dryers are topped off."""
+
+        if (machine := self._get_machine(request_data)) is None:
+            return _result(
+                ServerResponseCodes.TRY_AGAIN_LATER_BAD_REQUEST, "Unknown reader."
+            )
+
+        if not machine.online:
+            return _result(
+                ServerResponseCodes.TRY_AGAIN_LATER_SWIPE_FAILED,
+                "Unable to communicate with machine.",
+            )
+
+        now = self._clock()
+
+        if machine.minutes_remaining(now) > 0:
+            if machine.type is not MachineType.DRYER:
+                return _result(
+                    ServerResponseCodes.TRY_AGAIN_LATER_BAD_REQUEST,
+                    "Machine is busy.",
+                )
+
+            price = machine.topoff_price
+            ends_at = machine.cycle_ends_at + machine.topoff_time_min * 60
+        else:
+            price = machine.base_price
+            ends_at = now + machine.cycle_time_min * 60
+
+        if price > self.card_balance:
+            return _result(
+                ServerResponseCodes.TRY_AGAIN_LATER_BAD_REQUEST, "Insufficient funds."
+            )
+
+        self.card_balance = round(self.card_balance - price, 2)
+        machine.cycle_ends_at = ends_at
+        self.stats.vends += 1
+
+        return {
+            "DatabaseID": self.database_id,
+            "ReaderID": machine.reader_id,
+            "ReaderSerialNumber": machine.serial_number,
+            "CardSerialNumber": self.card_serial,
+            "VendResult": VendResultCodes.SUCCESS,
+            **_result(
+                ServerResponseCodes.SUCCESS,
+                "Virtual mag swipe response received successfully.",
+            ),
+        }
+
+    def _get_machine(self, request_data: list) -> SimulatedMachine | None:
+        """Return machine addressed by reader serial in request."""
+
+        return self.machines.get(request_data[3]) if len(request_data) > 3 else None
+
+    def _card_information(self) -> dict:
+        """Return CardInformation response object."""
+
+        return {
+            "DatabaseID": self.database_id,
+            "AccountNumber": self.card_serial,
+            "Balance": self.card_balance,
+            **_result(
+                ServerResponseCodes.SUCCESS, "Card information retrieved successfully."
+            ),
+        }
+
+    def _machines_information(self) -> dict:
+        """Return MachinesInformation response object."""
+
+        now = self._clock()
+        timestamp = datetime.fromtimestamp(now, timezone.utc).strftime(
+            "%Y-%m-%dT%H:%M:%SZ"
+        )
+
+        return {
+            "Machines": [
+                machine.to_dict(now, timestamp) for machine in self.machines.values()
+            ],
+            **_result(
+                ServerResponseCodes.SUCCESS,
+                "Machine information retrieved successfully!",
+            ),
+        }
+
+    def _user_token(self) -> str:
+        """Return user token clients derive from the user ID."""
+
+        return hashlib.md5(  # nosec
+            bytes(f"{self.user_id}{REFRESH_REQUEST_PREHASH_SUFFIX}", "utf-8")
+        ).hexdigest()
+
+    def _uuid(self) -> str:
+        """Return UUID drawn from the simulator's seeded random generator."""
+
+        return str(uuid.UUID(int=self._random.getrandbits(128), version=4))
+
+
+def _result(result_code: int, result_text: str) -> dict:
+    """Return result code and text fields present in every response object."""
+
+    return {RESULT_CODE_KEY: int(result_code), RESULT_TEXT_KEY: result_text}
+
+
+def main() -> None:
+    """Run simulator until interrupted."""
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--machines", type=int, default=DEFAULT_MACHINE_COUNT)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds")
+    parser.add_argument("--latency-jitter", type=float, default=0.0, help="seconds")
+    parser.add_argument("--rotate-auth-tokens", action="store_true")
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+
+    simulator = LaundrySimulator(
+        machine_count=args.machines,
+        latency_sec=args.latency,
+        latency_jitter_sec=args.latency_jitter,
+        rotate_auth_tokens=args.rotate_auth_tokens,
+        seed=args.seed,
+    )
+
+    print(
+        f"Serving {args.machines} machines. Log in as {simulator.username} /"
+        f" {simulator.password}."
+    )
+
+    web.run_app(simulator.make_app(), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""Coalescing of concurrent identical calls."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any, TypeVar
+
+_T = TypeVar("_T")
+
+
+class SingleFlight:
+    """Shares one in-flight call among concurrent callers that use the same key."""
+
+    # Only use this for read-only operations. Every caller gets the leader's result or exception.
+
+    def __init__(self) -> None:
+        """Initialize."""
+
+        self.coalesced_count = 0
+
+        self._calls: dict[Hashable, asyncio.Future] = {}
+
+    def __len__(self) -> int:
+        """Return number of calls in flight."""
+        return len(self._calls)
+
+    async def run(self, key: Hashable, func: Callable[[], Awaitable[_T]]) -> _T:
+        """Await func(), or join the call already in flight for key."""
+
+        if (future := self._calls.get(key)) is not None:
+            self.coalesced_count += 1
+        else:
+            future = self._calls[key] = asyncio.ensure_future(func())
+            future.add_done_callback(lambda done: self._finish(key, done))
+
+        # Shielded so that one cancelled caller doesn't cancel the call for everyone else.
+        return await asyncio.shield(future)
+
+    def _finish(self, key: Hashable, future: asyncio.Future[Any]) -> None:
+        """Forget completed call."""
+
+        if self._calls.get(key) is future:
+            del self._calls[key]
+
+        # Mark exception as retrieved in case every caller was cancelled before the call finished.
+        if not future.cancelled():
+            future.exception()
@@ -0,0 +1,166 @@
+"""Compact columnar storage for machine state."""
+
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterable
+import math
+from typing import Any
+
+from .models import LaundryMachine, MachineType
+
+# Sentinels used in place of None in typed columns.
+NULL_BOOL = -1
+NULL_INT = -1
+
+MACHINE_TYPES = tuple(MachineType)
+MACHINE_TYPE_CODES = {
+    machine_type: code for code, machine_type in enumerate(MACHINE_TYPES)
+}
+
+
+class MachineTable:
+    """Machine state held in typed arrays, one row per machine."""
+
+    # Columns are array.array objects. None is stored as NULL_BOOL / NULL_INT for integer columns and NaN for price
+    # columns. Machine types are stored as indexes into MachineType.
+
+    def __init__(self) -> None:
+        """Initialize empty table."""
+
+        self.ids: list[str] = []
+        self.numbers: list[str] = []
+        self.reader_serials: list[str | None] = []
+
+        self.types = array("b")
+        self.busy = array("b")
+        self.online = array("b")
+        self.minutes_remaining = array("i")
+        self.topoff_time_min = array("i")
+        self.base_price = array("d")
+        self.topoff_price = array("d")
+
+        self._index: dict[str, int] = {}
+
+    @classmethod
+    def from_machines(cls, machines: Iterable[LaundryMachine]) -> MachineTable:
+        """Build table from machines, e.g.: Laundry.machines.values()."""
+
+        table = cls()
+
+        for machine in machines:
+            table.upsert(machine)
+
+        return table
+
+    def __len__(self) -> int:
+        """Return number of machines in table."""
+        return len(self.ids)
+
+    def __contains__(self, machine_id: object) -> bool:
+        """Check whether machine is in table."""
+        return machine_id in self._index
+
+    def upsert(self, machine: LaundryMachine) -> None:
+        """Add machine to table or overwrite its existing row."""
+
+        # Appending fails with BufferError while a view from to_numpy() is alive. Overwriting existing rows doesn't.
+
+        if (row := self._index.get(machine.id_)) is None:
+            self._index[machine.id_] = len(self.ids)
+            self.ids.append(machine.id_)
+            self.numbers.append(machine.number)
+            self.reader_serials.append(machine.reader_serial)
+            self.types.append(MACHINE_TYPE_CODES[machine.type])
+            self.busy.append(_to_bool_code(machine.busy))
+            self.online.append(_to_bool_code(machine.online))
+            self.minutes_remaining.append(_to_int_code(machine.minutes_remaining))
+            self.topoff_time_min.append(_to_int_code(machine.topoff_time_min))
+            self.base_price.append(_to_float_code(machine.base_price))
+            self.topoff_price.append(_to_float_code(machine.topoff_price))
+            return
+
+        self.numbers[row] = machine.number
+        self.reader_serials[row] = machine.reader_serial
+        self.types[row] = MACHINE_TYPE_CODES[machine.type]
+        self.busy[row] = _to_bool_code(machine.busy)
+        self.online[row] = _to_bool_code(machine.online)
+        self.minutes_remaining[row] = _to_int_code(machine.minutes_remaining)
+        self.topoff_time_min[row] = _to_int_code(machine.topoff_time_min)
+        self.base_price[row] = _to_float_code(machine.base_price)
+        self.topoff_price[row] = _to_float_code(machine.topoff_price)
+
+    def get(self, machine_id: str) -> LaundryMachine | None:
+        """Rebuild machine object for a single row."""
+
+        if (row := self._index.get(machine_id)) is None:
+            return None
+
+        return LaundryMachine(
+            id_=self.ids[row],
+            type=MACHINE_TYPES[self.types[row]],
+            number=self.numbers[row],
+            busy=_from_bool_code(self.busy[row]),
+            minutes_remaining=_from_int_code(self.minutes_remaining[row]),
+            base_price=_from_float_code(self.base_price[row]),
+            topoff_price=_from_float_code(self.topoff_price[row]),
+            topoff_time_min=_from_int_code(self.topoff_time_min[row]),
+            online=_from_bool_code(self.online[row]),
+            reader_serial=self.reader_serials[row],
+        )
+
+    def to_numpy(self) -> dict[str, Any]:
+        """Return zero-copy NumPy views of numeric columns. Requires numpy."""
+
+        try:
+            import numpy as np  # pylint: disable=import-outside-toplevel
+        except ImportError as err:
+            raise ImportError(
+                "MachineTable.to_numpy() requires numpy. Install with `pip install"
+                " pylaundry[numpy]`."
+            ) from err
+
+        columns: dict[str, array] = {
+            "types": self.types,
+            "busy": self.busy,
+            "online": self.online,
+            "minutes_remaining": self.minutes_remaining,
+            "topoff_time_min": self.topoff_time_min,
+            "base_price": self.base_price,
+            "topoff_price": self.topoff_price,
+        }
+
+        return {
+            name: np.frombuffer(column, dtype=np.dtype(column.typecode))
+            for name, column in columns.items()
+        }
+
+
+def _to_bool_code(value: bool | None) -> int:
+    """Encode optional bool for storage in signed byte column."""
+    return NULL_BOOL if value is None else int(value)
+
+
+def _from_bool_code(value: int) -> bool | None:
+    """Decode optional bool from signed byte column."""
+    return None if value == NULL_BOOL else bool(value)
+
+
+def _to_int_code(value: int | None) -> int:
+    """Encode optional int for storage in int column."""
+    return NULL_INT if value is None else value
+
+
+def _from_int_code(value: int) -> int | None:
+    """Decode optional int from int column."""
+    return None if value == NULL_INT else value
+
+
+def _to_float_code(value: float | None) -> float:
+    """Encode optional float for storage in double column."""
+    return math.nan if value is None else float(value)
+
+
+def _from_float_code(value: float) -> float | None:
+    """Decode optional float from double column."""
+    return None if math.isnan(value) else value
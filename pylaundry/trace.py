@@ -0,0 +1,107 @@
+"""Low-overhead tracing for the request pipeline."""
+
+from __future__ import annotations
+
+import logging
+import time
+
+log = logging.getLogger(__name__)
+
+
+class LazyHex:
+    """Bytes formatted as grouped hex only if a log record is actually emitted."""
+
+    __slots__ = ("data",)
+
+    def __init__(self, data: bytes | bytearray | memoryview) -> None:
+        """Initialize wrapper."""
+        self.data = data
+
+    def __str__(self) -> str:
+        """Format hex number grouped by bytes."""
+        return bytes(self.data).hex(" ").upper()
+
+
+class StageTimer:
+    """Collects durations of pipeline stages for a single request."""
+
+    # Stage names used by pylaundry:
+    #     Request: pad, encrypt, base64, network
+    #     Response: unbase64, gunzip, parse
+
+    __slots__ = ("stages", "_last")
+
+    def __init__(self) -> None:
+        """Start timer."""
+
+        self.stages: dict[str, float] = {}
+        self._last = time.perf_counter()
+
+    def lap(self, stage: str) -> None:
+        """Attribute time since previous lap to stage."""
+
+        now = time.perf_counter()
+        self.stages[stage] = self.stages.get(stage, 0.0) + now - self._last
+        self._last = now
+
+
+class Tracer:
+    """Per-controller switch for stage timing."""
+
+    # Timing can be turned on or off at any time, e.g.: laundry.tracer.timing_enabled = True. When off, the pipeline only
+    # pays for a None check per stage.
+
+    def __init__(self, timing_enabled: bool = False) -> None:
+        """Initialize tracer."""
+
+        self.timing_enabled = timing_enabled
+
+        self.last_timings: dict[str, dict[str, float]] = {}
+        self.total_timings: dict[str, dict[str, float]] = {}
+        self.request_counts: dict[str, int] = {}
+
+    def start_timer(self) -> StageTimer | None:
+        """Return new stage timer if timing is enabled."""
+
+        return StageTimer() if self.timing_enabled else None
+
+    def record(self, operation: str, timer: StageTimer | None) -> None:
+        """Store stage durations for an operation."""
+
+        if timer is None:
+            return
+
+        self.last_timings[operation] = timer.stages
+        self.request_counts[operation] = self.request_counts.get(operation, 0) + 1
+
+        totals = self.total_timings.setdefault(operation, {})
+        for stage, duration in timer.stages.items():
+            totals[stage] = totals.get(stage, 0.0) + duration
+
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug(
+                "%s stage timings (ms): %s",
+                operation,
+                {
+                    stage: round(duration * 1000, 3)
+                    for stage, duration in timer.stages.items()
+                },
+            )
+
+    def average_timings(self, operation: str) -> dict[str, float]:
+        """Return mean stage durations in seconds for an operation."""
+
+        if not (count := self.request_counts.get(operation)):
+            return {}
+
+        return {
+            stage: duration / count
+            for stage, duration in self.total_timings[operation].items()
+        }
+
+    def reset(self) -> None:
+        """Clear recorded timings."""
+
+        self.last_timings = {}
+        self.total_timings = {}
+        self.request_counts = {}
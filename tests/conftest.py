@@ -18,6 +18,24 @@ from .http_bodies import get_http_body
 #
 
 
+class FakeClock:
+    """Manually advanced clock."""
+
+    def __init__(self) -> None:
+        """Initialize clock."""
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        """Return current time."""
+        return self.now
+
+
+@pytest.fixture  # type: ignore
+def fake_clock() -> FakeClock:
+    """Return clock that only moves when told to."""
+    return FakeClock()
+
+
 @pytest.fixture  # type: ignore
 def response_mocker() -> Generator:
     """Yield aioresponses."""
@@ -113,6 +131,17 @@ def get_vend_price__response__success(response_mocker: aioresponses) -> None:
     )
 
 
+@pytest.fixture  # type: ignore
+def get_vend_price__response__machine_offline(response_mocker: aioresponses) -> None:
+    """Machine offline response for get vend price."""
+
+    response_mocker.post(
+        url=API_ENDPOINT_URL,
+        status=200,
+        body=get_http_body("get_vend_price__response__machine_offline"),
+    )
+
+
 @pytest.fixture  # type: ignore
 def vend_log_topoff__response__success(response_mocker: aioresponses) -> None:
     """Success response for vend log."""
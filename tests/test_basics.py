@@ -2,14 +2,21 @@
 
 # pylint: disable=protected-access
 
+import asyncio
+from datetime import datetime, timezone
+from typing import Any
 import uuid
 
 import aiohttp
+from aioresponses import CallbackResult, aioresponses
 import pytest
+from yarl import URL
 
-from pylaundry import Laundry, LaundryMachine
-from pylaundry.const import EMPTY_AUTH_TOKEN
-from pylaundry.exceptions import AuthenticationError
+from pylaundry import Laundry, LaundryMachine, MachineType
+from pylaundry.const import API_ENDPOINT_URL, EMPTY_AUTH_TOKEN
+from pylaundry.exceptions import AuthenticationError, MachineOffline, Rejected
+
+from .http_bodies import get_http_body
 
 
 def test_property__initial_state(laundry: Laundry) -> None:
@@ -158,3 +165,168 @@ async def test__vend_log_topoff__success(
 
     # Log Vend
     await laundry._async_log_vend("a312b4b7-5110-5775-9966-ed9a6e087e3a", 1, True)
+
+
+@pytest.mark.asyncio  # type: ignore
+async def test__get_all_topoff_data__partial_failure(
+    laundry: Laundry,
+    authentication__response__success: pytest.fixture,
+    get_vend_price__response__machine_offline: pytest.fixture,
+    response_mocker: aioresponses,
+) -> None:
+    """Test that bulk topoff retrieval skips washers and reports per-machine failures without aborting."""
+
+    await laundry.async_login(username="test@example.com", password="hunter2")
+
+    dryers = [
+        machine
+        for machine in laundry.machines.values()
+        if machine.type is MachineType.DRYER
+    ]
+
+    for _ in dryers[1:]:
+        response_mocker.post(
+            url=API_ENDPOINT_URL,
+            status=200,
+            body=get_http_body("get_vend_price__response__success"),
+        )
+
+    results = await laundry.async_get_all_topoff_data(max_concurrency=3)
+
+    assert set(results) == {machine.id_ for machine in dryers}
+
+    failures = [result for result in results.values() if isinstance(result, Exception)]
+    assert len(failures) == 1
+    assert isinstance(failures[0], MachineOffline)
+
+    assert (
+        sum(1 for machine in dryers if machine.topoff_price == 0.25) == len(dryers) - 1
+    )
+
+
+@pytest.mark.asyncio  # type: ignore
+async def test__consolidated_refresh__updates_in_place(
+    laundry: Laundry,
+    authentication__response__success: pytest.fixture,
+    consolidated_refresh__response__success: pytest.fixture,
+) -> None:
+    """Test that refresh mutates existing machine objects and reports which ones changed."""
+
+    await laundry.async_login(username="test@example.com", password="hunter2")
+
+    machines = laundry.machines
+    test_machine = machines["a312b4b7-5110-5775-9966-ed9a6e087e3a"]
+    test_machine.topoff_price = 0.25
+
+    assert laundry.machine_changes.added == set(machines)
+
+    changes = await laundry.async_refresh()
+
+    assert laundry.machines is machines
+    assert laundry.machines["a312b4b7-5110-5775-9966-ed9a6e087e3a"] is test_machine
+    assert test_machine.base_price == 200
+    assert test_machine.topoff_price == 0.25
+
+    assert "a312b4b7-5110-5775-9966-ed9a6e087e3a" in changes.updated
+    assert not changes.added
+    # Only the test machine's state differs between the login and refresh responses.
+    assert changes.updated == {"a312b4b7-5110-5775-9966-ed9a6e087e3a"}
+    assert not changes.removed
+    assert laundry.machine_changes is changes
+
+
+def test__process_machine_data__single_reference_time(laundry: Laundry) -> None:
+    """Test that minutes remaining are computed against one reference time per response."""
+
+    machines_info = {
+        "ResultCode": 1,
+        "Machines": [
+            {
+                "ReaderID": reader_id,
+                "SetupType": "Dryer",
+                "Label": reader_id,
+                "MinutesRemaining": 60,
+                "StateDateTimeUtc": "2022-06-15T02:00:00Z",
+                "IsOnline": True,
+            }
+            for reader_id in ["1", "2"]
+        ],
+    }
+
+    laundry._process_machine_data(
+        machines_info, now=datetime(2022, 6, 15, 2, 15, tzinfo=timezone.utc)
+    )
+
+    assert [machine.minutes_remaining for machine in laundry.machines.values()] == [
+        45,
+        45,
+    ]
+
+
+@pytest.mark.asyncio  # type: ignore
+async def test__input_malformed__single_relogin(
+    laundry: Laundry,
+    authentication__response__success: pytest.fixture,
+    response_mocker: aioresponses,
+) -> None:
+    """Test that concurrent requests rejected under the same session trigger exactly one re-login."""
+
+    await laundry.async_login(username="test@example.com", password="hunter2")
+
+    dryers = [
+        machine.id_
+        for machine in laundry.machines.values()
+        if machine.type is MachineType.DRYER
+    ][:3]
+
+    stale_generation = laundry._session_generation
+    login_count = 0
+
+    # Answer based on session state rather than request order, which depends on task scheduling.
+    def respond(url: URL, **kwargs: Any) -> CallbackResult:
+        nonlocal login_count
+
+        if laundry._relogin_task is not None:
+            login_count += 1
+            body_name = "authentication__response__success"
+        elif laundry._session_generation == stale_generation:
+            body_name = "general__response__incorrect_packing"
+        else:
+            body_name = "get_vend_price__response__success"
+
+        return CallbackResult(status=200, body=get_http_body(body_name))
+
+    response_mocker.post(url=API_ENDPOINT_URL, callback=respond, repeat=True)
+
+    results = await asyncio.wait_for(
+        asyncio.gather(
+            *(laundry.async_get_topoff_data(machine_id) for machine_id in dryers)
+        ),
+        timeout=5,
+    )
+
+    assert login_count == 1
+    assert all(result and result["price"] == 0.25 for result in results)
+
+
+@pytest.mark.asyncio  # type: ignore
+async def test__input_malformed__relogin_rejected(
+    laundry: Laundry,
+    authentication__response__success: pytest.fixture,
+    response_mocker: aioresponses,
+) -> None:
+    """Test that a re-login that is itself rejected as malformed raises instead of re-logging in again."""
+
+    await laundry.async_login(username="test@example.com", password="hunter2")
+
+    response_mocker.post(
+        url=API_ENDPOINT_URL,
+        status=200,
+        body=get_http_body("general__response__incorrect_packing"),
+        repeat=True,
+    )
+
+    with pytest.raises(Rejected):
+        await asyncio.wait_for(laundry.async_refresh(), timeout=5)
+
+    assert laundry._relogin_task is None
@@ -0,0 +1,109 @@
+"""Tests for response cache."""
+
+from aioresponses import aioresponses
+import pytest
+
+from pylaundry import Laundry, MachineType
+from pylaundry.cache import ResponseCache
+from pylaundry.const import API_ENDPOINT_URL
+
+from .conftest import FakeClock
+from .http_bodies import get_http_body
+
+
+def test__response_cache__ttl_and_stats(fake_clock: FakeClock) -> None:
+    """Test that entries expire after their operation's TTL and lookups are counted."""
+
+    cache = ResponseCache(ttls_sec={"GetVendPrice": 10}, clock=fake_clock)
+
+    cache.set("GetVendPrice", "1", {"TopoffPrice": 0.25})
+    cache.set("ConsolidatedRefresh", None, {})
+
+    assert cache.get("GetVendPrice", "1") == {"TopoffPrice": 0.25}
+    assert cache.get("GetVendPrice", "2") is None
+    assert cache.get("ConsolidatedRefresh") is None
+
+    fake_clock.now = 10
+
+    assert cache.get("GetVendPrice", "1") is None
+    assert len(cache) == 0
+
+    assert (cache.stats.hits, cache.stats.misses, cache.stats.expirations) == (1, 2, 1)
+    assert cache.stats.hit_rate == pytest.approx(1 / 3)
+
+
+def test__response_cache__lru_eviction_and_invalidation() -> None:
+    """Test that least recently used entries are evicted first and invalidation drops entries."""
+
+    cache = ResponseCache(ttls_sec={"GetVendPrice": 10}, max_size=2)
+
+    cache.set("GetVendPrice", "1", {})
+    cache.set("GetVendPrice", "2", {})
+    cache.get("GetVendPrice", "1")
+    cache.set("GetVendPrice", "3", {})
+
+    assert cache.get("GetVendPrice", "2") is None
+    assert cache.get("GetVendPrice", "1") is not None
+    assert cache.stats.evictions == 1
+
+    cache.invalidate("GetVendPrice", "1")
+    assert cache.get("GetVendPrice", "1") is None
+
+    cache.invalidate("GetVendPrice")
+    assert len(cache) == 0
+
+
+@pytest.mark.asyncio  # type: ignore
+async def test__get_topoff_data__cached(
+    laundry: Laundry,
+    authentication__response__success: pytest.fixture,
+    get_vend_price__response__success: pytest.fixture,
+    virtual_vend_topoff__response__success: pytest.fixture,
+) -> None:
+    """Test that repeated topoff lookups are served from cache until a vend invalidates them."""
+
+    await laundry.async_login(username="test@example.com", password="hunter2")
+
+    machine_id = "a312b4b7-5110-5775-9966-ed9a6e087e3a"
+
+    # Only one GetVendPrice response is mocked. A second request would fail.
+    first = await laundry.async_get_topoff_data(machine_id)
+    second = await laundry.async_get_topoff_data(machine_id)
+
+    assert first == second == {"price": 0.25, "time": 0}
+    assert laundry.cache.stats.hits == 1
+
+    await laundry.async_vend(machine_id)
+
+    assert laundry.cache.get("GetVendPrice", machine_id) is None
+
+
+@pytest.mark.asyncio  # type: ignore
+async def test__get_topoff_data__cached_per_machine(
+    laundry: Laundry,
+    authentication__response__success: pytest.fixture,
+    response_mocker: aioresponses,
+) -> None:
+    """Test that machines without a reader serial don't share a cache entry."""
+
+    await laundry.async_login(username="test@example.com", password="hunter2")
+
+    dryers = [
+        machine
+        for machine in laundry.machines.values()
+        if machine.type is MachineType.DRYER
+    ][:2]
+
+    for machine in dryers:
+        machine.reader_serial = None
+        response_mocker.post(
+            url=API_ENDPOINT_URL,
+            status=200,
+            body=get_http_body("get_vend_price__response__success"),
+        )
+
+    for machine in dryers:
+        await laundry.async_get_topoff_data(machine.id_)
+
+    assert laundry.cache.stats.hits == 0
+    assert len(laundry.cache) == 2
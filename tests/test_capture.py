@@ -0,0 +1,153 @@
+"""Tests for capture decoder."""
+
+from __future__ import annotations
+
+import io
+import json
+
+import pytest
+
+from pylaundry.capture import decode_capture, iter_har_entries
+from pylaundry.const import AUTH_TOKEN_KEY, EMPTY_AUTH_TOKEN
+from pylaundry.exceptions import CaptureFormatError
+from pylaundry.helpers import MessagePacker, PackingContext
+
+LOGIN_REQUEST_ID = "2c1d7c4e-6a4b-4f8e-9b1a-0d3e5f7a9b11"
+
+
+def build_entry(
+    request_body: list,
+    request_id: str,
+    first_request_id: str | None,
+    auth_token: str,
+    response_auth_token: str | None,
+) -> dict:
+    """Build HAR entry for an exchange packed the way the client and server pack it."""
+
+    _, packed_request = PackingContext(first_request_id=first_request_id).pack(
+        request_body, new_request_id=request_id
+    )
+
+    response_headers = (
+        [{"name": AUTH_TOKEN_KEY, "value": response_auth_token}]
+        if response_auth_token
+        else []
+    )
+
+    return {
+        "startedDateTime": "2022-06-15T02:32:41.000Z",
+        "request": {
+            "method": "POST",
+            "headers": [
+                {"name": "CP_REQ_ID", "value": request_id},
+                {"name": AUTH_TOKEN_KEY, "value": auth_token},
+            ],
+            "postData": {"text": f"CP_REQ_DATA={packed_request}"},
+        },
+        "response": {
+            "headers": response_headers,
+            "content": {
+                "text": (
+                    MessagePacker.pack_server_response(
+                        {"ResultCode": 1, "Echo": request_body[0]}
+                    ).decode()
+                )
+            },
+        },
+    }
+
+
+def build_capture() -> str:
+    """Build HAR capture with a login, token rotation, a session started before the capture and unrelated traffic."""
+
+    entries = [
+        {"request": {"headers": []}, "response": {"content": {"text": "<html/>"}}},
+        build_entry(
+            ["Authenticate2", "user"], LOGIN_REQUEST_ID, None, EMPTY_AUTH_TOKEN, "t1"
+        ),
+        build_entry(
+            ["ConsolidatedRefresh"],
+            "5e0f6a2b-8c3d-4e1f-a2b4-c6d8e0f2a4b6",
+            LOGIN_REQUEST_ID,
+            "t1",
+            "t2",
+        ),
+        build_entry(
+            ["GetVendPrice"],
+            "9a8b7c6d-5e4f-4a3b-2c1d-0e9f8a7b6c5d",
+            LOGIN_REQUEST_ID,
+            "t2",
+            None,
+        ),
+        build_entry(
+            ["GetVendPrice"],
+            "0f1e2d3c-4b5a-4697-8877-665544332211",
+            "11111111-2222-4333-8444-555555555555",
+            "unknown",
+            None,
+        ),
+    ]
+
+    # Non-entry members before and after entries must be skipped.
+    return json.dumps(
+        {
+            "log": {
+                "version": "1.2",
+                "pages": [{"id": "page_1", "pageTimings": {"onLoad": 12345}}],
+                "entries": entries,
+                "comment": "",
+            }
+        },
+        indent=1,
+    )
+
+
+@pytest.mark.parametrize("max_workers", [None, 2])  # type: ignore
+def test__decode_capture(max_workers: int | None) -> None:
+    """Test that requests are paired with their sessions and decoded in capture order."""
+
+    output = io.StringIO()
+
+    # Tiny reads put chunk boundaries inside strings, numbers and between tokens.
+    count = decode_capture(
+        io.StringIO(build_capture()),
+        output,
+        max_workers=max_workers,
+        batch_size=1,
+        read_size=7,
+    )
+
+    records = [json.loads(line) for line in output.getvalue().splitlines()]
+
+    assert count == len(records) == 4
+    assert [record["index"] for record in records] == [1, 2, 3, 4]
+    assert [record["operation"] for record in records] == [
+        "Authenticate2",
+        "ConsolidatedRefresh",
+        "GetVendPrice",
+        None,
+    ]
+    assert records[0]["request"] == ["Authenticate2", "user"]
+    assert records[2]["first_request_id"] == LOGIN_REQUEST_ID
+    assert all(not record["errors"] for record in records[:3])
+    assert all(record["response"]["ResultCode"] == 1 for record in records)
+
+    # Session started before capture, so the request can't be decrypted. The response still can.
+    assert records[3]["request"] is None
+    assert records[3]["errors"]
+
+
+def test__iter_har_entries__truncated() -> None:
+    """Test that truncated captures raise CaptureFormatError after yielding complete entries."""
+
+    capture = build_capture()
+
+    entries = []
+
+    with pytest.raises(CaptureFormatError):
+        for entry in iter_har_entries(
+            io.StringIO(capture[: len(capture) // 2]), read_size=64
+        ):
+            entries.append(entry)
+
+    assert entries
@@ -0,0 +1,138 @@
+"""Tests for command-line interface and import cost."""
+
+# pylint: disable=protected-access
+
+import asyncio
+import json
+from pathlib import Path
+import re
+import subprocess  # nosec
+import sys
+
+import pytest
+
+from pylaundry.__main__ import _async_run, build_parser
+from pylaundry.simulator import LaundrySimulator
+
+HEAVY_MODULES = ("aiohttp", "cryptography", "dateutil")
+
+# Deliberately loose so that slow CI machines pass. It catches gross regressions. The heavy module check is the strict
+# guard.
+CLI_IMPORT_BUDGET_SEC = 0.3
+
+
+def test__import__no_heavy_modules() -> None:
+    """Test that the package, helpers, models and CLI import without the network or crypto stacks."""
+
+    code = (
+        "import json, sys;"
+        "import pylaundry, pylaundry.helpers, pylaundry.models, pylaundry.__main__;"
+        f"print(json.dumps([name for name in {HEAVY_MODULES!r} if name in sys.modules]))"
+    )
+
+    result = subprocess.run(  # nosec
+        [sys.executable, "-c", code], capture_output=True, check=True, text=True
+    )
+
+    assert json.loads(result.stdout) == []
+
+
+def test__import__cli_within_budget() -> None:
+    """Test that importing the CLI stays within its startup-time budget."""
+
+    result = subprocess.run(  # nosec
+        [sys.executable, "-X", "importtime", "-c", "import pylaundry.__main__"],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+
+    # Lines are "import time: self [us] | cumulative | module". Top-level imports aren't indented.
+    cumulative_us = sum(
+        int(match.group(1))
+        for match in re.finditer(
+            r"^import time:\s+\d+ \|\s+(\d+) \| \S", result.stderr, re.M
+        )
+    )
+
+    assert cumulative_us / 1_000_000 < CLI_IMPORT_BUDGET_SEC
+
+
+@pytest.mark.asyncio  # type: ignore
+async def test__cli__status_and_balance(
+    tmp_path: Path, capsys: pytest.CaptureFixture
+) -> None:
+    """Test status and balance output, and that saved sessions are resumed across runs."""
+
+    async with LaundrySimulator(machine_count=4, busy_fraction=0, seed=1) as simulator:
+        common_args = [
+            "--username",
+            "test@example.com",
+            "--password",
+            "hunter2",
+            "--endpoint-url",
+            simulator.url,
+            "--session-dir",
+            str(tmp_path),
+        ]
+
+        await _async_run(build_parser().parse_args([*common_args, "--json", "status"]))
+
+        status = json.loads(capsys.readouterr().out)
+
+        assert status["balance"] == 20.0
+        assert [machine["number"] for machine in status["machines"]] == [
+            "01",
+            "02",
+            "03",
+            "04",
+        ]
+        assert status["machines"][0]["type"] == "Washer"
+
+        await _async_run(build_parser().parse_args([*common_args, "balance"]))
+
+        assert capsys.readouterr().out == "Balance: 20.00\n"
+        assert simulator.stats.logins == 1
+
+
+@pytest.mark.asyncio  # type: ignore
+async def test__cli__watch(capsys: pytest.CaptureFixture) -> None:
+    """Test that watch prints status, then one JSON line per changed machine."""
+
+    async with LaundrySimulator(machine_count=2, busy_fraction=0, seed=1) as simulator:
+        args = build_parser().parse_args(
+            [
+                "--username",
+                "test@example.com",
+                "--password",
+                "hunter2",
+                "--endpoint-url",
+                simulator.url,
+                "--json",
+                "watch",
+                "--interval",
+                "0.2",
+                "--count",
+                "1",
+            ]
+        )
+
+        async def start_cycle_after_login() -> None:
+            # Start a cycle behind the client's back so that the refresh reports a change.
+            while not simulator.stats.logins:
+                await asyncio.sleep(0.01)
+
+            machine = next(iter(simulator.machines.values()))
+            machine.cycle_ends_at = simulator._clock() + 600
+
+        await asyncio.gather(_async_run(args), start_cycle_after_login())
+
+        lines = capsys.readouterr().out.splitlines()
+
+        assert len(json.loads(lines[0])["machines"]) == 2
+
+        event = json.loads(lines[1])
+
+        assert event["event"] == "updated"
+        assert event["machine"]["busy"] is True
+        assert len(lines) == 2
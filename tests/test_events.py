@@ -0,0 +1,163 @@
+"""Tests for state change events."""
+
+# pylint: disable=protected-access
+
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timezone
+import gc
+
+import aiohttp
+import pytest
+
+from pylaundry import Laundry, MachineType
+from pylaundry.events import (
+    BalanceChanged,
+    CameOnline,
+    CycleFinished,
+    CycleStarted,
+    EventHub,
+    LaundryEvent,
+    OverflowPolicy,
+    PriceChanged,
+    Subscription,
+    WentOffline,
+)
+from pylaundry.exceptions import EventOverflow
+from pylaundry.simulator import LaundrySimulator
+
+
+def _machines_info(*machines: tuple[str, int, bool, float]) -> dict:
+    """Build MachinesInformation object."""
+
+    return {
+        "ResultCode": 1,
+        "Machines": [
+            {
+                "ReaderID": reader_id,
+                "SetupType": "Dryer",
+                "Label": reader_id,
+                "MinutesRemaining": minutes_remaining,
+                "StateDateTimeUtc": "2022-06-15T02:00:00Z",
+                "IsOnline": is_online,
+                "BasePrice": base_price,
+            }
+            for reader_id, minutes_remaining, is_online, base_price in machines
+        ],
+    }
+
+
+def _drain(events: Subscription) -> list[LaundryEvent]:
+    """Return queued events without waiting."""
+    return list(events._queue)
+
+
+def test__laundry__machine_events(laundry: Laundry) -> None:
+    """Test that refreshes produce typed events for watchers only."""
+
+    now = datetime(2022, 6, 15, 2, 0, tzinfo=timezone.utc)
+
+    laundry._process_machine_data(
+        _machines_info(("1", 0, True, 1.5), ("2", 30, True, 1.5), ("3", 0, False, 1.5)),
+        now=now,
+    )
+
+    events = laundry.watch()
+
+    laundry._process_machine_data(
+        _machines_info(("1", 45, True, 1.5), ("2", 0, False, 1.5), ("3", 0, True, 2.0)),
+        now=now,
+    )
+
+    timestamp = now.timestamp()
+
+    assert _drain(events) == [
+        CycleStarted(timestamp, "1", 45),
+        CycleFinished(timestamp, "2"),
+        WentOffline(timestamp, "2"),
+        CameOnline(timestamp, "3"),
+        PriceChanged(timestamp, "3", "base_price", 1.5, 2.0),
+    ]
+
+    events.close()
+    assert not laundry._event_hub
+
+
+@pytest.mark.asyncio  # type: ignore
+async def test__subscription__overflow_policies() -> None:
+    """Test that full queues drop or disconnect without blocking the publisher."""
+
+    hub = EventHub()
+    oldest = hub.subscribe(max_queue_size=2)
+    newest = hub.subscribe(max_queue_size=2, overflow=OverflowPolicy.DROP_NEWEST)
+    disconnect = hub.subscribe(max_queue_size=2, overflow=OverflowPolicy.DISCONNECT)
+
+    hub.publish(CycleFinished(float(second), "1") for second in range(3))
+
+    assert [event.timestamp for event in _drain(oldest)] == [1.0, 2.0]
+    assert [event.timestamp for event in _drain(newest)] == [0.0, 1.0]
+    assert oldest.dropped == newest.dropped == 1
+    assert disconnect.closed
+    assert disconnect.dropped == 3
+    assert len(hub) == 2
+
+    with pytest.raises(EventOverflow):
+        await disconnect.__anext__()
+
+
+@pytest.mark.asyncio  # type: ignore
+async def test__subscription__iteration() -> None:
+    """Test that consumers wake on publish, end on close and unsubscribe when dropped."""
+
+    hub = EventHub()
+
+    async def consume() -> list[LaundryEvent]:
+        async with hub.subscribe() as events:
+            return [event async for event in events]
+
+    task = asyncio.create_task(consume())
+    await asyncio.sleep(0)
+
+    hub.publish([CycleFinished(0.0, "1")])
+    await asyncio.sleep(0)
+    hub.publish([CycleFinished(1.0, "1")])
+
+    # Ends iteration after queued events are delivered.
+    next(iter(hub._subscriptions)).close()
+
+    assert [event.timestamp for event in await task] == [0.0, 1.0]
+    assert not hub
+
+    # Consumers that just stop iterating are unsubscribed once the subscription is garbage collected.
+    hub.subscribe()
+    gc.collect()
+    assert not hub
+
+
+@pytest.mark.asyncio  # type: ignore
+async def test__simulator__vend_events() -> None:
+    """Test that a vend shows up as cycle start and balance change on the next refresh."""
+
+    async with LaundrySimulator(machine_count=4, busy_fraction=0, seed=1) as simulator:
+        async with aiohttp.ClientSession() as websession:
+            laundry = Laundry(websession=websession, endpoint_url=simulator.url)
+            await laundry.async_login(username="test@example.com", password="hunter2")
+
+            dryer = laundry.next_available(MachineType.DRYER)
+            assert dryer
+
+            async with laundry.watch() as events:
+                await laundry.async_vend(dryer.id_)
+                await laundry.async_refresh()
+
+                cycle_started = await events.__anext__()
+                balance_changed = await events.__anext__()
+
+            assert isinstance(cycle_started, CycleStarted)
+            assert cycle_started.machine_id == dryer.id_
+            assert isinstance(balance_changed, BalanceChanged)
+            assert (balance_changed.old_balance, balance_changed.new_balance) == (
+                20.0,
+                18.5,
+            )
@@ -0,0 +1,61 @@
+"""Tests for fleet controller."""
+
+from aioresponses import aioresponses
+import pytest
+
+from pylaundry import MachineChanges
+from pylaundry.const import API_ENDPOINT_URL
+from pylaundry.exceptions import AuthenticationError, NotLoggedIn
+from pylaundry.fleet import LaundryFleet
+
+from .http_bodies import get_http_body
+
+
+@pytest.mark.asyncio  # type: ignore
+async def test__fleet__login_and_refresh(response_mocker: aioresponses) -> None:
+    """Test that fleet logs in and refreshes each account, reporting per-account outcomes."""
+
+    response_mocker.post(
+        url=API_ENDPOINT_URL,
+        status=200,
+        body=get_http_body("authentication__response__success"),
+        headers={"CP_AUTH_TOKEN": "e94eca12-854f-409e-b32f-302805ed12d9"},
+    )
+    response_mocker.post(
+        url=API_ENDPOINT_URL,
+        status=200,
+        body=get_http_body("authentication__response__incorrect_credentials"),
+    )
+    response_mocker.post(
+        url=API_ENDPOINT_URL,
+        status=200,
+        body=get_http_body("consolidated_refresh__response__success"),
+    )
+
+    async with LaundryFleet(max_concurrency=1, login_stagger_sec=0) as fleet:
+        fleet.add_account("good@example.com", "hunter2", name="good")
+        fleet.add_account("bad@example.com", "incorrect", name="bad")
+
+        login_results = await fleet.async_login_all()
+
+        assert login_results["good"].success
+        assert isinstance(login_results["bad"].error, AuthenticationError)
+
+        refresh_results = await fleet.async_refresh_all()
+
+        assert refresh_results["good"].success
+        assert isinstance(refresh_results["good"].result, MachineChanges)
+        assert isinstance(refresh_results["bad"].error, NotLoggedIn)
+
+        assert fleet.laundries["good"].machines
+
+
+@pytest.mark.asyncio  # type: ignore
+async def test__fleet__duplicate_account() -> None:
+    """Test that account names must be unique."""
+
+    async with LaundryFleet() as fleet:
+        fleet.add_account("test@example.com", "hunter2")
+
+        with pytest.raises(ValueError):
+            fleet.add_account("test@example.com", "hunter2")
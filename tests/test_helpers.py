@@ -0,0 +1,239 @@
+"""Tests for message packing and unpacking."""
+
+# pylint: disable=protected-access
+
+import base64
+from datetime import datetime, timezone
+import json
+
+import dateutil.parser
+import pytest
+
+from pylaundry.codec import JsonCodec, OrjsonCodec
+from pylaundry.const import PROCESS_POOL_MIN_BATCH_SIZE
+from pylaundry.exceptions import MessagePackerError, ResponseFormatError
+from pylaundry.helpers import MessagePacker, PackingContext, parse_utc_timestamp
+
+from .http_bodies import get_http_body
+
+FIRST_REQUEST_ID = "7c9d1e20-4f5a-4b6c-8d7e-9f0a1b2c3d4e"
+NEW_REQUEST_ID = "0f8e2a52-3b61-4d1c-9a0e-55b3c2d7f1a4"
+
+REFRESH_REQUEST = [
+    "ConsolidatedRefresh",
+    "effcb2cfcdd33390d3abf4fbc1d53e1b",
+    "4e353d4d-a9c9-5867-9324-99dbe26d9c35",
+]
+
+
+def test__generate_aes_key() -> None:
+    """Test AES key derivation for authentication and regular requests."""
+
+    assert MessagePacker._generate_aes_key(NEW_REQUEST_ID) == b"417235-0R&%76mhK"
+    assert (
+        MessagePacker._generate_aes_key(NEW_REQUEST_ID, FIRST_REQUEST_ID)
+        == b"417235-0edcbaf-7"
+    )
+
+
+def test__packing_context__matches_pack_client_request() -> None:
+    """Test that session packing context output matches stateless packing."""
+
+    for first_request_id in [None, FIRST_REQUEST_ID]:
+        context = PackingContext(first_request_id=first_request_id)
+
+        assert context.generate_aes_key(
+            NEW_REQUEST_ID
+        ) == MessagePacker._generate_aes_key(NEW_REQUEST_ID, first_request_id)
+
+        # Pack twice to exercise cached padded body.
+        for _ in range(2):
+            assert context.pack(
+                REFRESH_REQUEST, new_request_id=NEW_REQUEST_ID
+            ) == MessagePacker.pack_client_request(
+                REFRESH_REQUEST,
+                first_request_id=first_request_id,
+                new_request_id=NEW_REQUEST_ID,
+            )
+
+
+def test__packing_context__round_trip() -> None:
+    """Test that packed requests can be unpacked and that the body cache stays bounded."""
+
+    context = PackingContext(first_request_id=FIRST_REQUEST_ID, cache_size=1)
+
+    for body in [REFRESH_REQUEST, ["GetAdditionalInformation", "appkey"]]:
+        request_id, packed_request = context.pack(body)
+
+        assert (
+            json.loads(
+                MessagePacker.unpack_client_request(
+                    packed_request,
+                    new_request_id=request_id,
+                    first_request_id=FIRST_REQUEST_ID,
+                )
+            )
+            == body
+        )
+
+    assert len(context._padded_bodies) == 1
+
+
+def test__packing_context__cache_keys_are_type_exact() -> None:
+    """Test that equal but differently typed bodies aren't served each other's cached bytes."""
+
+    context = PackingContext(first_request_id=FIRST_REQUEST_ID)
+
+    for body in [["GetVendPrice", 1, True], ["GetVendPrice", True, 1.0]]:
+        request_id, packed_request = context.pack(body)
+
+        unpacked_body = json.loads(
+            MessagePacker.unpack_client_request(
+                packed_request,
+                new_request_id=request_id,
+                first_request_id=FIRST_REQUEST_ID,
+            )
+        )
+
+        assert [(type(item), item) for item in unpacked_body] == [
+            (type(item), item) for item in body
+        ]
+
+    # One-off requests aren't cached.
+    context.pack(["CreateVendLogEntry", "2022-06-15T02:00:00Z"])
+
+    assert len(context._padded_bodies) == 2
+
+
+def test__pack_client_requests__matches_single() -> None:
+    """Test that batch packing output matches single-message packing byte for byte."""
+
+    bodies = [REFRESH_REQUEST, json.dumps(REFRESH_REQUEST), ["Authenticate2", "x"]]
+    first_request_ids = [FIRST_REQUEST_ID, FIRST_REQUEST_ID, None]
+    new_request_ids = [NEW_REQUEST_ID, FIRST_REQUEST_ID, NEW_REQUEST_ID]
+
+    assert MessagePacker.pack_client_requests(
+        bodies, first_request_ids, new_request_ids
+    ) == [
+        MessagePacker.pack_client_request(*job)
+        for job in zip(bodies, first_request_ids, new_request_ids)
+    ]
+
+    with pytest.raises(ValueError):
+        MessagePacker.pack_client_requests(bodies, first_request_ids[:1])
+
+
+def test__unpack_server_responses__process_pool() -> None:
+    """Test that batch unpacking matches single-message unpacking, including across a process pool."""
+
+    response_bodies = [
+        json.loads(get_http_body(name))["Response"]
+        for name in [
+            "get_vend_price__response__success",
+            "virtual_vend_topoff__response__success",
+        ]
+    ] * (PROCESS_POOL_MIN_BATCH_SIZE // 2)
+
+    expected = [MessagePacker.unpack_server_response(body) for body in response_bodies]
+
+    assert MessagePacker.unpack_server_responses(response_bodies) == expected
+    assert (
+        MessagePacker.unpack_server_responses(response_bodies, max_workers=2)
+        == expected
+    )
+
+
+def test__extract_response_content() -> None:
+    """Test that response content is sliced from envelope without parsing, with JSON fallback for unusual formatting."""
+
+    raw_response = get_http_body("consolidated_refresh__response__success")
+    expected = json.loads(raw_response)["Response"]
+
+    content = MessagePacker.extract_response_content(raw_response)
+
+    assert isinstance(content, memoryview)
+    assert bytes(content) == expected.encode()
+
+    assert (
+        MessagePacker.extract_response_content(
+            json.dumps({"ResultCode": 1, "Response": expected}).encode()
+        )
+        == expected
+    )
+
+    with pytest.raises(ResponseFormatError):
+        MessagePacker.extract_response_content(b"[]")
+
+    with pytest.raises(ResponseFormatError):
+        MessagePacker.extract_response_content(b"<html></html>")
+
+
+def test__unpack_server_response__truncated() -> None:
+    """Test that truncated gzip streams are rejected."""
+
+    content = json.loads(get_http_body("consolidated_refresh__response__success"))[
+        "Response"
+    ]
+
+    assert MessagePacker.unpack_server_response(content.encode())
+
+    truncated = base64.b64encode(base64.b64decode(content)[:-20])
+
+    with pytest.raises(MessagePackerError):
+        MessagePacker.unpack_server_response(truncated)
+
+
+@pytest.mark.parametrize("codec_class", [JsonCodec, OrjsonCodec])  # type: ignore
+def test__codec__equivalent_results(codec_class: type[JsonCodec]) -> None:
+    """Test that each codec packs and unpacks the payloads this library handles the same way."""
+
+    if codec_class is OrjsonCodec:
+        pytest.importorskip("orjson")
+
+    codec = codec_class()
+
+    response_content = json.loads(
+        get_http_body("consolidated_refresh__response__success")
+    )["Response"]
+
+    assert MessagePacker.unpack_server_response(
+        response_content, codec=codec
+    ) == MessagePacker.unpack_server_response(response_content, codec=JsonCodec())
+
+    request_id, packed_request = MessagePacker.pack_client_request(
+        REFRESH_REQUEST, first_request_id=FIRST_REQUEST_ID, codec=codec
+    )
+
+    assert (
+        json.loads(
+            MessagePacker.unpack_client_request(
+                packed_request,
+                new_request_id=request_id,
+                first_request_id=FIRST_REQUEST_ID,
+            )
+        )
+        == REFRESH_REQUEST
+    )
+
+
+@pytest.mark.parametrize(  # type: ignore
+    "value",
+    [
+        "2022-06-15T02:32:41Z",
+        "2000-01-01T05:00:00Z",
+        "2022-06-15T02:32:41.123Z",
+        "2022-06-15T02:32:41+02:00",
+    ],
+)
+def test__parse_utc_timestamp(value: str) -> None:
+    """Test that fast timestamp parser agrees with dateutil."""
+
+    assert parse_utc_timestamp(value) == dateutil.parser.isoparse(value)
+
+
+def test__parse_utc_timestamp__naive() -> None:
+    """Test that timestamps without timezone are treated as UTC."""
+
+    assert parse_utc_timestamp("2022-06-15T02:32:41") == datetime(
+        2022, 6, 15, 2, 32, 41, tzinfo=timezone.utc
+    )
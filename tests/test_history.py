@@ -0,0 +1,115 @@
+"""Tests for machine state history."""
+
+# pylint: disable=protected-access
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+from pylaundry import Laundry, LaundryMachine, MachineType
+from pylaundry.history import HistorySample, MachineHistory
+
+
+def _machine(
+    id_: str, minutes_remaining: int | None, online: bool | None = True
+) -> LaundryMachine:
+    """Build machine for testing."""
+
+    return LaundryMachine(
+        id_=id_,
+        type=MachineType.DRYER,
+        number=id_,
+        busy=None if minutes_remaining is None else minutes_remaining > 0,
+        minutes_remaining=minutes_remaining,
+        base_price=1.5,
+        topoff_price=None,
+        topoff_time_min=None,
+        online=online,
+        reader_serial=None,
+    )
+
+
+def test__machine_history__ring_buffer_and_range_query() -> None:
+    """Test that only the newest depth samples are kept and range queries respect bounds after wrapping."""
+
+    history = MachineHistory(depth=4, changes_only=False)
+
+    for minute in range(10):
+        history.record([_machine("1", 60 - minute)], timestamp=minute * 60.0)
+
+    assert [sample.timestamp for sample in history.samples("1")] == [
+        360.0,
+        420.0,
+        480.0,
+        540.0,
+    ]
+    assert [
+        sample.minutes_remaining
+        for sample in history.samples("1", start=400.0, end=540.0)
+    ] == [53, 52]
+    assert history.samples("1", start=1000.0) == []
+    assert history.samples("unknown") == []
+    assert history.latest("1") == HistorySample(540.0, True, 51, True)
+
+
+def test__machine_history__changes_only() -> None:
+    """Test that steady countdowns are compacted while state flips and topoffs are recorded."""
+
+    history = MachineHistory(depth=8)
+
+    # Idle, then a 10 minute cycle counting down as expected, topped off at minute 4, then done.
+    states = [(0, 0), (1, 10), (2, 9), (3, 8), (4, 12), (5, 11), (16, 0), (17, 0)]
+
+    for minute, minutes_remaining in states:
+        history.record([_machine("1", minutes_remaining)], timestamp=minute * 60.0)
+
+    assert [
+        (sample.timestamp / 60, sample.minutes_remaining)
+        for sample in history.samples("1")
+    ] == [(0, 0), (1, 10), (4, 12), (16, 0)]
+
+
+def test__machine_history__state_since_and_removal() -> None:
+    """Test busy duration lookup and that absent machines are dropped."""
+
+    history = MachineHistory(changes_only=False)
+
+    history.record([_machine("1", 0), _machine("2", 0)], timestamp=0.0)
+    history.record([_machine("1", 30), _machine("2", 0)], timestamp=60.0)
+    history.record([_machine("1", 29), _machine("2", 0, online=False)], timestamp=120.0)
+
+    assert history.state_since("1") == 60.0
+    assert history.state_since("2") == 120.0
+    assert history.state_since("unknown") is None
+
+    history.record([_machine("1", 28)], timestamp=180.0)
+
+    assert "2" not in history
+    assert len(history) == 1
+
+
+def test__laundry__records_history(laundry: Laundry) -> None:
+    """Test that machine data updates are recorded at the update's reference time."""
+
+    laundry.history = MachineHistory()
+
+    machines_info = {
+        "ResultCode": 1,
+        "Machines": [
+            {
+                "ReaderID": "1",
+                "SetupType": "Dryer",
+                "Label": "1",
+                "MinutesRemaining": 60,
+                "StateDateTimeUtc": "2022-06-15T02:00:00Z",
+                "IsOnline": True,
+            }
+        ],
+    }
+    now = datetime(2022, 6, 15, 2, 15, tzinfo=timezone.utc)
+
+    laundry._process_machine_data(machines_info, now=now)
+
+    assert laundry.history.samples("1") == [
+        HistorySample(now.timestamp(), True, 45, True)
+    ]
@@ -0,0 +1,144 @@
+"""Tests for machine indexes."""
+
+# pylint: disable=protected-access
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+from pylaundry import Laundry, LaundryMachine, MachineType
+from pylaundry.index import MachineIndex
+
+
+def _machine(
+    id_: str,
+    minutes_remaining: int | None,
+    online: bool | None = True,
+    type_: MachineType = MachineType.DRYER,
+    number: str | None = None,
+) -> LaundryMachine:
+    """Build machine for testing."""
+
+    return LaundryMachine(
+        id_=id_,
+        type=type_,
+        number=id_ if number is None else number,
+        busy=None if minutes_remaining is None else minutes_remaining > 0,
+        minutes_remaining=minutes_remaining,
+        base_price=1.5,
+        topoff_price=None,
+        topoff_time_min=None,
+        online=online,
+        reader_serial=None,
+    )
+
+
+def test__machine_index__next_available() -> None:
+    """Test that idle machines win, then the busy machine finishing soonest, skipping offline machines."""
+
+    index = MachineIndex()
+    index.rebuild(
+        [
+            _machine("1", 30),
+            _machine("2", 10),
+            _machine("3", 5, online=False),
+            _machine("4", 20, type_=MachineType.WASHER),
+        ]
+    )
+
+    assert not index.available(MachineType.DRYER)
+    assert index.next_available(MachineType.DRYER).id_ == "2"  # type: ignore
+    assert index.next_available(MachineType.WASHER).id_ == "4"  # type: ignore
+
+    # Topping off dryer 2 pushes it behind dryer 1.
+    index.update(_machine("2", 45))
+    assert index.next_available(MachineType.DRYER).id_ == "1"  # type: ignore
+
+    index.update(_machine("2", 0))
+    assert [machine.id_ for machine in index.available(MachineType.DRYER)] == ["2"]
+    assert index.next_available(MachineType.DRYER).id_ == "2"  # type: ignore
+
+    index.remove("2")
+    index.remove("1")
+    assert index.next_available(MachineType.DRYER) is None
+    assert len(index) == 2
+
+
+def test__machine_index__heap_compaction() -> None:
+    """Test that stale heap entries from ticking countdowns don't accumulate."""
+
+    index = MachineIndex()
+
+    for minutes_remaining in range(500, 0, -1):
+        index.update(_machine("1", minutes_remaining))
+
+    assert len(index._busy_heaps[MachineType.DRYER]) <= 2 + 32 + 1
+    assert index.next_available(MachineType.DRYER).minutes_remaining == 1  # type: ignore
+
+
+def test__machine_index__by_label() -> None:
+    """Test label lookups with and without machine type."""
+
+    index = MachineIndex()
+    index.rebuild(
+        [
+            _machine("a", 0, number="03"),
+            _machine("b", 0, number="12"),
+            _machine("c", 0, number="12", type_=MachineType.WASHER),
+            _machine("d", 0, number="A1"),
+        ]
+    )
+
+    assert index.by_label("3", MachineType.DRYER).id_ == "a"  # type: ignore
+    assert index.by_label("3").id_ == "a"  # type: ignore
+    assert index.by_label("Dryer 12").id_ == "b"  # type: ignore
+    assert index.by_label("washer 12").id_ == "c"  # type: ignore
+    assert index.by_label("a1").id_ == "d"  # type: ignore
+
+    # Ambiguous without type.
+    assert index.by_label("12") is None
+    assert index.by_label("99") is None
+
+    index.update(_machine("a", 0, number="4"))
+    assert index.by_label("3") is None
+    assert index.by_label("04").id_ == "a"  # type: ignore
+
+
+def test__laundry__maintains_index(laundry: Laundry) -> None:
+    """Test that machine data updates keep the index in sync."""
+
+    def machines_info(*machines: tuple[str, int, bool]) -> dict:
+        return {
+            "ResultCode": 1,
+            "Machines": [
+                {
+                    "ReaderID": reader_id,
+                    "SetupType": "Dryer",
+                    "Label": reader_id,
+                    "MinutesRemaining": minutes_remaining,
+                    "StateDateTimeUtc": "2022-06-15T02:00:00Z",
+                    "IsOnline": is_online,
+                }
+                for reader_id, minutes_remaining, is_online in machines
+            ],
+        }
+
+    now = datetime(2022, 6, 15, 2, 0, tzinfo=timezone.utc)
+
+    laundry._process_machine_data(
+        machines_info(("1", 30, True), ("2", 0, True)), now=now
+    )
+
+    assert laundry.next_available(MachineType.DRYER).id_ == "2"  # type: ignore
+    assert laundry.machine_by_label("Dryer 1").id_ == "1"  # type: ignore
+
+    laundry._process_machine_data(
+        machines_info(("1", 30, True), ("2", 0, False)), now=now
+    )
+
+    assert laundry.next_available(MachineType.DRYER).id_ == "1"  # type: ignore
+
+    laundry._process_machine_data(machines_info(("2", 0, True)), now=now)
+
+    assert laundry.machine_by_label("1") is None
+    assert len(laundry.index) == 1
@@ -0,0 +1,112 @@
+"""Tests for metrics registry."""
+
+import aiohttp
+from aioresponses import aioresponses
+import pytest
+
+from pylaundry import Laundry
+from pylaundry.const import API_ENDPOINT_URL, ServerResponseCodes
+from pylaundry.exceptions import CommunicationError
+from pylaundry.metrics import Histogram, MetricsRegistry
+
+from .http_bodies import get_http_body
+
+
+def test__histogram__bucket_bounds_inclusive() -> None:
+    """Test that observations equal to a bound land in that bound's bucket."""
+
+    histogram = Histogram([0.1, 1.0])
+
+    for value in [0.05, 0.1, 0.5, 1.0, 5.0]:
+        histogram.observe(value)
+
+    assert histogram.cumulative_counts() == [2, 4, 5]
+    assert histogram.count == 5
+
+
+def test__metrics__prometheus_export() -> None:
+    """Test Prometheus text exposition output."""
+
+    metrics = MetricsRegistry(latency_buckets_sec=[0.1, 1.0])
+
+    metrics.record_response("ConsolidatedRefresh", 0.05, 100, 1000, 1)
+    metrics.record_response("ConsolidatedRefresh", 0.5, 100, 1000, 1)
+    metrics.record_response("GetVendPrice", 2.0, 50, 200, 118)
+    metrics.record_response('Odd"Name', 0.5, 1, 1, None)
+    metrics.record_communication_error("GetVendPrice", 50)
+    metrics.record_relogin()
+
+    lines = metrics.to_prometheus().splitlines()
+
+    assert "# TYPE pylaundry_request_duration_seconds histogram" in lines
+    assert (
+        'pylaundry_request_duration_seconds_bucket{operation="ConsolidatedRefresh",le="0.1"} 1'
+        in lines
+    )
+    assert (
+        'pylaundry_request_duration_seconds_bucket{operation="ConsolidatedRefresh",le="+Inf"} 2'
+        in lines
+    )
+    assert (
+        'pylaundry_request_duration_seconds_count{operation="ConsolidatedRefresh"} 2'
+        in lines
+    )
+    assert 'pylaundry_requests_total{operation="GetVendPrice"} 2' in lines
+    assert (
+        'pylaundry_responses_total{operation="GetVendPrice",result_code="118"} 1'
+        in lines
+    )
+    assert 'pylaundry_responses_total{operation="Odd\\"Name",result_code=""} 1' in lines
+    assert (
+        'pylaundry_response_bytes_total{operation="ConsolidatedRefresh"} 2000' in lines
+    )
+    assert 'pylaundry_communication_errors_total{operation="GetVendPrice"} 1' in lines
+    assert "pylaundry_relogins_total 1" in lines
+
+    metrics.reset()
+
+    assert "pylaundry_relogins_total 0" in metrics.to_prometheus().splitlines()
+
+
+@pytest.mark.asyncio  # type: ignore
+async def test__metrics__laundry_records_requests(
+    laundry: Laundry, response_mocker: aioresponses
+) -> None:
+    """Test that requests, result codes, bytes, re-logins and communication errors are recorded."""
+
+    laundry.metrics = metrics = MetricsRegistry()
+
+    for body_name in [
+        "authentication__response__success",
+        "general__response__incorrect_packing",
+        "authentication__response__success",
+        "consolidated_refresh__response__success",
+    ]:
+        response_mocker.post(
+            url=API_ENDPOINT_URL,
+            status=200,
+            body=get_http_body(body_name),
+            headers={"CP_AUTH_TOKEN": "e94eca12-854f-409e-b32f-302805ed12d9"},
+        )
+
+    await laundry.async_login(username="test@example.com", password="hunter2")
+    await laundry.async_refresh()
+
+    assert metrics.requests == {"Authenticate2": 2, "ConsolidatedRefresh": 2}
+    assert metrics.result_codes == {
+        ("Authenticate2", ServerResponseCodes.SUCCESS): 2,
+        ("ConsolidatedRefresh", ServerResponseCodes.INPUT_MALFORMED): 1,
+        ("ConsolidatedRefresh", ServerResponseCodes.SUCCESS): 1,
+    }
+    assert metrics.relogins == 1
+    assert metrics.latencies["ConsolidatedRefresh"].count == 2
+    assert metrics.request_bytes["ConsolidatedRefresh"] > 0
+    assert metrics.response_bytes["ConsolidatedRefresh"] > 0
+
+    response_mocker.post(url=API_ENDPOINT_URL, exception=aiohttp.ClientError())
+
+    with pytest.raises(CommunicationError):
+        await laundry.async_refresh()
+
+    assert metrics.communication_errors == {"ConsolidatedRefresh": 1}
+    assert metrics.requests["ConsolidatedRefresh"] == 3
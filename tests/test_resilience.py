@@ -0,0 +1,170 @@
+"""Tests for rate limiting, retries and circuit breaking."""
+
+import aiohttp
+from aioresponses import aioresponses
+import pytest
+
+from pylaundry import Laundry
+from pylaundry.const import API_ENDPOINT_URL
+from pylaundry.exceptions import CircuitOpen, VendFailure
+from pylaundry.resilience import (
+    CircuitBreaker,
+    CircuitState,
+    Resilience,
+    RetryPolicy,
+    TokenBucket,
+)
+
+from .conftest import FakeClock
+from .http_bodies import get_http_body
+
+
+def test__token_bucket__reservations(fake_clock: FakeClock) -> None:
+    """Test that callers beyond the burst wait in turn and tokens refill over time."""
+
+    bucket = TokenBucket(rate_per_sec=2, burst=2, clock=fake_clock)
+
+    assert [bucket.reserve() for _ in range(4)] == [0, 0, 0.5, 1.0]
+    assert bucket.wait_count == 2
+
+    fake_clock.now = 10
+    assert bucket.tokens == 2
+
+
+def test__circuit_breaker__opens_and_probes(fake_clock: FakeClock) -> None:
+    """Test that the breaker opens at the threshold, fails fast, then lets a single probe through."""
+
+    breaker = CircuitBreaker(
+        failure_threshold=2, reset_timeout_sec=30, clock=fake_clock
+    )
+
+    breaker.record_failure()
+    assert breaker.state == CircuitState.CLOSED
+
+    breaker.record_failure()
+    assert breaker.state == CircuitState.OPEN
+
+    with pytest.raises(CircuitOpen):
+        breaker.before_call()
+
+    fake_clock.now = 30
+    assert breaker.state == CircuitState.HALF_OPEN
+
+    breaker.before_call()
+    with pytest.raises(CircuitOpen):
+        breaker.before_call()
+
+    # Failed probe re-opens the breaker.
+    breaker.record_failure()
+    assert breaker.state == CircuitState.OPEN
+    assert breaker.open_count == 2
+
+    fake_clock.now = 60
+    breaker.before_call()
+    breaker.record_success()
+    assert breaker.state == CircuitState.CLOSED
+
+
+def test__retry_policy__delay() -> None:
+    """Test exponential backoff bounds."""
+
+    policy = RetryPolicy(base_delay_sec=1, max_delay_sec=5, jitter=False)
+    assert [policy.delay(attempt) for attempt in range(1, 5)] == [1, 2, 4, 5]
+
+    jittered = RetryPolicy(base_delay_sec=1, max_delay_sec=5)
+    assert all(0 <= jittered.delay(3) <= 4 for _ in range(20))
+
+
+@pytest.mark.asyncio  # type: ignore
+async def test__resilience__retries_idempotent_requests(
+    authentication__response__success: pytest.fixture,
+    response_mocker: aioresponses,
+) -> None:
+    """Test that refreshes are retried after communication errors and vends are not."""
+
+    resilience = Resilience(
+        endpoint_rate_per_sec=None,
+        account_rate_per_sec=None,
+        retry=RetryPolicy(max_attempts=2, base_delay_sec=0),
+    )
+
+    async with aiohttp.ClientSession() as websession:
+        laundry = Laundry(websession=websession, resilience=resilience)
+
+        await laundry.async_login(username="test@example.com", password="hunter2")
+
+        response_mocker.post(url=API_ENDPOINT_URL, exception=aiohttp.ClientError())
+        response_mocker.post(
+            url=API_ENDPOINT_URL,
+            status=200,
+            body=get_http_body("consolidated_refresh__response__success"),
+        )
+
+        await laundry.async_refresh()
+
+        assert resilience.stats.retries == 1
+        assert resilience.breaker.consecutive_failures == 0
+
+        response_mocker.post(url=API_ENDPOINT_URL, exception=aiohttp.ClientError())
+
+        with pytest.raises(VendFailure):
+            await laundry.async_vend("a312b4b7-5110-5775-9966-ed9a6e087e3a")
+
+        assert resilience.stats.retries == 1
+        assert resilience.breaker.consecutive_failures == 1
+
+
+@pytest.mark.asyncio  # type: ignore
+async def test__resilience__circuit_open_fails_fast(laundry: Laundry) -> None:
+    """Test that no request is sent while the breaker is open."""
+
+    resilience = laundry.resilience = Resilience(
+        breaker=CircuitBreaker(failure_threshold=1)
+    )
+    resilience.breaker.record_failure()
+
+    # No response is mocked. Sending a request would fail with a connection error instead.
+    with pytest.raises(CircuitOpen):
+        await laundry.async_login(username="test@example.com", password="hunter2")
+
+    assert resilience.stats.rejected == 1
+    assert resilience.stats.attempts == 0
+
+
+@pytest.mark.asyncio  # type: ignore
+async def test__resilience__relogin_counts_as_one_call(
+    fake_clock: FakeClock,
+    authentication__response__success: pytest.fixture,
+    response_mocker: aioresponses,
+) -> None:
+    """Test that a refresh that re-logs in is a single resilience call, even as a half-open probe."""
+
+    resilience = Resilience(
+        breaker=CircuitBreaker(failure_threshold=1, clock=fake_clock),
+        clock=fake_clock,
+    )
+
+    async with aiohttp.ClientSession() as websession:
+        laundry = Laundry(websession=websession, resilience=resilience)
+
+        await laundry.async_login(username="test@example.com", password="hunter2")
+
+        resilience.breaker.record_failure()
+        fake_clock.now = resilience.breaker.reset_timeout_sec
+        assert resilience.breaker.state == CircuitState.HALF_OPEN
+
+        attempts = resilience.stats.attempts
+
+        for body_name in [
+            "general__response__incorrect_packing",
+            "authentication__response__success",
+            "consolidated_refresh__response__success",
+        ]:
+            response_mocker.post(
+                url=API_ENDPOINT_URL, status=200, body=get_http_body(body_name)
+            )
+
+        await laundry.async_refresh()
+
+        assert resilience.stats.attempts == attempts + 1
+        assert resilience.breaker.state == CircuitState.CLOSED
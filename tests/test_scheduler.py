@@ -0,0 +1,115 @@
+"""Tests for adaptive refresh scheduler."""
+
+# pylint: disable=protected-access
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from pylaundry import LaundryMachine, MachineChanges, MachineType
+from pylaundry.scheduler import RefreshScheduler
+
+
+class FakeLaundry:
+    """Stand-in controller that counts refreshes."""
+
+    def __init__(self, minutes_remaining: list[int]) -> None:
+        """Initialize fake controller."""
+
+        self.refresh_count = 0
+        self.machines = {
+            str(i): LaundryMachine(
+                id_=str(i),
+                type=MachineType.DRYER,
+                number=str(i),
+                busy=minutes > 0,
+                minutes_remaining=minutes,
+                base_price=1.5,
+                topoff_price=None,
+                topoff_time_min=None,
+                online=True,
+                reader_serial=None,
+            )
+            for i, minutes in enumerate(minutes_remaining)
+        }
+
+    async def async_refresh(self) -> MachineChanges:
+        """Count refresh."""
+
+        self.refresh_count += 1
+        return MachineChanges()
+
+
+def _scheduler(laundry: FakeLaundry) -> RefreshScheduler:
+    """Build scheduler without jitter."""
+
+    return RefreshScheduler(
+        laundry,  # type: ignore
+        min_interval_sec=30,
+        max_interval_sec=900,
+        idle_interval_sec=120,
+        jitter=0,
+    )
+
+
+def test__next_delay__busy() -> None:
+    """Test that polling tightens as the soonest cycle end approaches."""
+
+    assert _scheduler(FakeLaundry([0, 20, 50])).next_delay() == 600
+    assert _scheduler(FakeLaundry([0, 1])).next_delay() == 30
+
+
+def test__next_delay__idle_backoff() -> None:
+    """Test exponential backoff while idle and after failures, capped at max interval."""
+
+    scheduler = _scheduler(FakeLaundry([0, 0]))
+
+    delays = []
+    for idle_streak in range(1, 6):
+        scheduler._idle_streak = idle_streak
+        delays.append(scheduler.next_delay())
+
+    assert delays == [120, 240, 480, 900, 900]
+
+    scheduler._failure_streak = 2
+    assert scheduler.next_delay() == 240
+
+
+def test__next_delay__jitter_within_bounds() -> None:
+    """Test that jitter never pushes the delay outside the configured interval bounds."""
+
+    for minutes_remaining, idle_streak in [([0, 1], 0), ([0, 0], 5)]:
+        scheduler = _scheduler(FakeLaundry(minutes_remaining))
+        scheduler.jitter = 0.5
+        scheduler._idle_streak = idle_streak
+
+        assert all(30 <= scheduler.next_delay() <= 900 for _ in range(50))
+
+
+@pytest.mark.asyncio  # type: ignore
+async def test__scheduler__start_refresh_now_stop() -> None:
+    """Test scheduler lifecycle controls."""
+
+    laundry = FakeLaundry([0])
+    scheduler = _scheduler(laundry)
+
+    scheduler.start()
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+
+    assert scheduler.running
+    assert laundry.refresh_count == 1
+    assert scheduler.next_refresh_at is not None
+
+    scheduler.refresh_now()
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+
+    assert laundry.refresh_count == 2
+
+    await scheduler.stop()
+
+    assert not scheduler.running
@@ -0,0 +1,101 @@
+"""Tests for session persistence and resumption."""
+
+# pylint: disable=protected-access
+
+from pathlib import Path
+import stat
+
+import aiohttp
+from aioresponses import aioresponses
+import pytest
+
+from pylaundry import Laundry
+from pylaundry.const import API_ENDPOINT_URL
+from pylaundry.session import FileSessionStore, SessionState
+
+from .http_bodies import get_http_body
+
+
+@pytest.mark.asyncio  # type: ignore
+async def test__file_session_store__round_trip(
+    laundry: Laundry,
+    authentication__response__success: pytest.fixture,
+    tmp_path: Path,
+) -> None:
+    """Test that exported session state survives a trip through the file store."""
+
+    await laundry.async_login(username="test@example.com", password="hunter2")
+
+    store = FileSessionStore(tmp_path)
+    state = laundry.export_session()
+
+    assert await store.async_load("test@example.com") is None
+
+    await store.async_save("test@example.com", state)
+
+    (path,) = tmp_path.iterdir()
+    assert "test@example.com" not in path.name
+    assert stat.S_IMODE(path.stat().st_mode) == 0o600
+
+    loaded = await store.async_load("test@example.com")
+
+    assert isinstance(loaded, SessionState)
+    assert loaded.to_dict() == state.to_dict()
+
+    await store.async_delete("test@example.com")
+    assert await store.async_load("test@example.com") is None
+
+
+@pytest.mark.asyncio  # type: ignore
+async def test__async_resume__skips_login(
+    laundry: Laundry,
+    authentication__response__success: pytest.fixture,
+    consolidated_refresh__response__success: pytest.fixture,
+) -> None:
+    """Test that a resumed session refreshes without sending Authenticate2."""
+
+    await laundry.async_login(username="test@example.com", password="hunter2")
+    state = SessionState.from_dict(laundry.export_session().to_dict())
+
+    async with aiohttp.ClientSession() as websession:
+        resumed_laundry = Laundry(websession=websession)
+
+        # Only one refresh response is left. A login would fail.
+        assert await resumed_laundry.async_resume(
+            username="test@example.com", password="hunter2", state=state
+        )
+
+        assert resumed_laundry.installation_token == laundry.installation_token
+        assert resumed_laundry._first_request_id == laundry._first_request_id
+        assert resumed_laundry.profile == laundry.profile
+        assert set(resumed_laundry.machines) == set(laundry.machines)
+        assert resumed_laundry.machine_changes.updated
+
+
+@pytest.mark.asyncio  # type: ignore
+async def test__async_resume__falls_back_to_login(
+    laundry: Laundry,
+    authentication__response__success: pytest.fixture,
+    response_mocker: aioresponses,
+) -> None:
+    """Test that a rejected resumed session falls back to a full login."""
+
+    await laundry.async_login(username="test@example.com", password="hunter2")
+    state = laundry.export_session()
+
+    for body_name in [
+        "authentication__response__incorrect_credentials",
+        "authentication__response__success",
+    ]:
+        response_mocker.post(
+            url=API_ENDPOINT_URL, status=200, body=get_http_body(body_name)
+        )
+
+    async with aiohttp.ClientSession() as websession:
+        resumed_laundry = Laundry(websession=websession)
+
+        assert not await resumed_laundry.async_resume(
+            username="test@example.com", password="hunter2", state=state
+        )
+
+        assert resumed_laundry.profile == laundry.profile
@@ -0,0 +1,105 @@
+"""Tests for local server simulator."""
+
+# pylint: disable=protected-access
+
+import aiohttp
+import pytest
+
+from pylaundry import Laundry, MachineType
+from pylaundry.const import ServerResponseCodes
+from pylaundry.exceptions import AuthenticationError, MachineOffline
+from pylaundry.helpers import MessagePacker
+from pylaundry.simulator import LaundrySimulator
+
+
+def test__pack_server_response__round_trip() -> None:
+    """Test that packed server responses unpack to the original content."""
+
+    content = {"ResultCode": 1, "ResultText": "Success", "Values": ["é"]}
+
+    assert (
+        MessagePacker.unpack_server_response(
+            MessagePacker.extract_response_content(  # type: ignore
+                MessagePacker.pack_server_response(content)
+            )
+        )
+        == content
+    )
+
+
+@pytest.mark.asyncio  # type: ignore
+async def test__simulator__full_client_flow() -> None:
+    """Test login, refresh, topoff lookup and vend against the simulator."""
+
+    async with LaundrySimulator(
+        machine_count=6, busy_fraction=0, rotate_auth_tokens=True, seed=1
+    ) as simulator:
+        async with aiohttp.ClientSession() as websession:
+            with pytest.raises(AuthenticationError):
+                await Laundry(
+                    websession=websession, endpoint_url=simulator.url
+                ).async_login(username="test@example.com", password="wrong")
+
+            laundry = Laundry(websession=websession, endpoint_url=simulator.url)
+            await laundry.async_login(username="test@example.com", password="hunter2")
+
+            assert len(laundry.machines) == 6
+            assert laundry.profile.card_balance == 20.0
+
+            dryer = next(
+                machine
+                for machine in laundry.machines.values()
+                if machine.type is MachineType.DRYER
+            )
+
+            assert await laundry.async_get_topoff_data(dryer.id_) == {
+                "price": 0.25,
+                "time": 5,
+            }
+
+            await laundry.async_vend(dryer.id_)
+            changes = await laundry.async_refresh()
+
+            assert changes.updated == {dryer.id_}
+            assert dryer.busy
+            assert laundry.profile.card_balance == 18.5
+
+            assert simulator.stats.logins == 1
+            assert simulator.stats.vends == 1
+
+
+@pytest.mark.asyncio  # type: ignore
+async def test__simulator__errors_and_relogin() -> None:
+    """Test injected errors and recovery after the server forgets sessions."""
+
+    async with LaundrySimulator(
+        machine_count=2, offline_fraction=1, seed=1
+    ) as simulator:
+        async with aiohttp.ClientSession() as websession:
+            laundry = Laundry(websession=websession, endpoint_url=simulator.url)
+
+            await laundry.async_login(username="test@example.com", password="hunter2")
+
+            with pytest.raises(MachineOffline):
+                await laundry.async_get_topoff_data(
+                    next(
+                        machine.id_
+                        for machine in laundry.machines.values()
+                        if machine.type is MachineType.DRYER
+                    )
+                )
+
+            simulator.invalidate_sessions()
+            await laundry.async_refresh()
+
+            assert simulator.stats.logins == 2
+            assert (
+                simulator.stats.result_codes[ServerResponseCodes.INPUT_MALFORMED] == 1
+            )
+
+            simulator.fail_next(
+                ServerResponseCodes.INPUT_MALFORMED, "ConsolidatedRefresh"
+            )
+            await laundry.async_refresh()
+
+            assert simulator.stats.logins == 3
@@ -0,0 +1,89 @@
+"""Tests for single-flight request coalescing."""
+
+# pylint: disable=protected-access
+
+import asyncio
+
+import pytest
+
+from pylaundry import Laundry
+from pylaundry.singleflight import SingleFlight
+
+
+@pytest.mark.asyncio  # type: ignore
+async def test__single_flight__shares_result_and_exception() -> None:
+    """Test that concurrent callers with the same key share one call, including its exception."""
+
+    single_flight = SingleFlight()
+    calls = []
+
+    async def fetch(value: int) -> int:
+        calls.append(value)
+        await asyncio.sleep(0)
+        if value < 0:
+            raise ValueError(value)
+        return value
+
+    results = await asyncio.gather(
+        single_flight.run("a", lambda: fetch(1)),
+        single_flight.run("a", lambda: fetch(2)),
+        single_flight.run("b", lambda: fetch(3)),
+    )
+
+    assert results == [1, 1, 3]
+    assert calls == [1, 3]
+    assert single_flight.coalesced_count == 1
+    assert len(single_flight) == 0
+
+    errors = await asyncio.gather(
+        single_flight.run("c", lambda: fetch(-1)),
+        single_flight.run("c", lambda: fetch(-2)),
+        return_exceptions=True,
+    )
+
+    assert [type(error) for error in errors] == [ValueError, ValueError]
+    assert calls == [1, 3, -1]
+
+
+@pytest.mark.asyncio  # type: ignore
+async def test__single_flight__cancelled_caller_does_not_cancel_others() -> None:
+    """Test that cancelling one caller leaves the shared call running for the rest."""
+
+    single_flight = SingleFlight()
+    release = asyncio.Event()
+
+    async def fetch() -> str:
+        await release.wait()
+        return "done"
+
+    first = asyncio.ensure_future(single_flight.run("a", fetch))
+    second = asyncio.ensure_future(single_flight.run("a", fetch))
+    await asyncio.sleep(0)
+
+    first.cancel()
+    release.set()
+
+    assert await second == "done"
+    assert first.cancelled()
+
+
+@pytest.mark.asyncio  # type: ignore
+async def test__consolidated_refresh__coalesced(
+    laundry: Laundry,
+    authentication__response__success: pytest.fixture,
+    consolidated_refresh__response__success: pytest.fixture,
+) -> None:
+    """Test that concurrent refreshes send a single request and share its changes."""
+
+    await laundry.async_login(username="test@example.com", password="hunter2")
+
+    # Only one refresh response is mocked. A second request would fail.
+    first, second = await asyncio.gather(
+        laundry.async_refresh(), laundry.async_refresh()
+    )
+
+    assert laundry._single_flight.coalesced_count == 1
+
+    # Both callers get the same changes, and processing ran only once.
+    assert first is second is laundry.machine_changes
+    assert first.updated
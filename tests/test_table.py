@@ -0,0 +1,87 @@
+"""Tests for columnar machine storage."""
+
+from __future__ import annotations
+
+import math
+
+import pytest
+
+from pylaundry import Laundry, LaundryMachine, MachineType
+from pylaundry.table import NULL_BOOL, MachineTable
+
+
+def _machine(
+    id_: str, minutes_remaining: int | None, online: bool | None
+) -> LaundryMachine:
+    """Build machine for testing."""
+
+    return LaundryMachine(
+        id_=id_,
+        type=MachineType.DRYER,
+        number=id_,
+        busy=None if minutes_remaining is None else minutes_remaining > 0,
+        minutes_remaining=minutes_remaining,
+        base_price=1.5,
+        topoff_price=None,
+        topoff_time_min=None,
+        online=online,
+        reader_serial=None,
+    )
+
+
+def test__laundry_machine__slotted() -> None:
+    """Test that machine records don't carry a per-instance dict."""
+
+    assert not hasattr(_machine("1", 0, True), "__dict__")
+
+
+def test__machine_table__round_trip() -> None:
+    """Test that rows can be upserted and rebuilt without losing None values."""
+
+    table = MachineTable.from_machines(
+        [_machine("1", 10, True), _machine("2", None, None)]
+    )
+
+    assert len(table) == 2
+    assert table.online[1] == NULL_BOOL
+    assert math.isnan(table.topoff_price[0])
+
+    table.upsert(_machine("1", 0, False))
+
+    assert len(table) == 2
+    assert table.get("1") == _machine("1", 0, False)
+    assert table.get("2") == _machine("2", None, None)
+    assert table.get("3") is None
+
+
+def test__machine_table__numpy_view() -> None:
+    """Test that NumPy columns are views over the table's arrays."""
+
+    np = pytest.importorskip("numpy")
+
+    table = MachineTable.from_machines(
+        [_machine("1", 10, True), _machine("2", 0, True)]
+    )
+
+    columns = table.to_numpy()
+
+    assert columns["minutes_remaining"].tolist() == [10, 0]
+    assert np.count_nonzero(columns["busy"] == 1) == 1
+
+    table.upsert(_machine("2", 5, True))
+
+    assert columns["minutes_remaining"].tolist() == [10, 5]
+
+
+@pytest.mark.asyncio  # type: ignore
+async def test__laundry__machine_table(
+    laundry: Laundry, authentication__response__success: pytest.fixture
+) -> None:
+    """Test that controller builds table from current machines."""
+
+    await laundry.async_login(username="test@example.com", password="hunter2")
+
+    table = laundry.machine_table()
+
+    assert len(table) == len(laundry.machines)
+    assert "a312b4b7-5110-5775-9966-ed9a6e087e3a" in table
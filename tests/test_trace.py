@@ -0,0 +1,82 @@
+"""Tests for tracing."""
+
+import logging
+
+from aioresponses import aioresponses
+import pytest
+
+from pylaundry import Laundry
+from pylaundry.const import API_ENDPOINT_URL, LOG_LEVEL_TRACE
+from pylaundry.trace import LazyHex
+
+from .http_bodies import get_http_body
+
+
+def test__lazy_hex() -> None:
+    """Test that hex formatting matches the grouped format used in trace logs."""
+
+    assert str(LazyHex(b"\x01\xab")) == "01 AB"
+
+
+@pytest.mark.asyncio  # type: ignore
+async def test__tracer__stage_timings(
+    laundry: Laundry,
+    authentication__response__success: pytest.fixture,
+    consolidated_refresh__response__success: pytest.fixture,
+) -> None:
+    """Test that stage timings are only collected while enabled."""
+
+    await laundry.async_login(username="test@example.com", password="hunter2")
+
+    assert not laundry.tracer.last_timings
+
+    laundry.tracer.timing_enabled = True
+
+    await laundry.async_refresh()
+
+    assert set(laundry.tracer.last_timings["ConsolidatedRefresh"]) == {
+        "pad",
+        "encrypt",
+        "base64",
+        "network",
+        "unbase64",
+        "gunzip",
+        "parse",
+    }
+    assert laundry.tracer.average_timings("ConsolidatedRefresh")
+
+    laundry.tracer.reset()
+
+    assert not laundry.tracer.average_timings("ConsolidatedRefresh")
+
+
+@pytest.mark.asyncio  # type: ignore
+async def test__trace_logging(
+    laundry: Laundry,
+    authentication__response__success: pytest.fixture,
+    response_mocker: aioresponses,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Test that payload dumps are emitted when TRACE logging is enabled."""
+
+    with caplog.at_level(LOG_LEVEL_TRACE, logger="pylaundry"):
+        await laundry.async_login(username="test@example.com", password="hunter2")
+
+    assert any("Encrypted Request" in message for message in caplog.messages)
+    assert any(
+        record.levelno == LOG_LEVEL_TRACE and record.name == "pylaundry.helpers"
+        for record in caplog.records
+    )
+
+    caplog.clear()
+
+    response_mocker.post(
+        url=API_ENDPOINT_URL,
+        status=200,
+        body=get_http_body("consolidated_refresh__response__success"),
+    )
+
+    with caplog.at_level(logging.DEBUG, logger="pylaundry"):
+        await laundry.async_refresh()
+
+    assert not any(record.levelno == LOG_LEVEL_TRACE for record in caplog.records)
@@ -0,0 +1,100 @@
+"""Tests for multi-vends."""
+
+from __future__ import annotations
+
+from collections.abc import AsyncGenerator
+
+import aiohttp
+import pytest
+
+from pylaundry import Laundry, MachineType
+from pylaundry.exceptions import InsufficientFunds, MachineOffline
+from pylaundry.models import VendStatus
+from pylaundry.simulator import LaundrySimulator
+
+
+@pytest.fixture  # type: ignore
+async def simulated() -> AsyncGenerator:
+    """Yield simulator and a controller logged in to it."""
+
+    async with LaundrySimulator(machine_count=6, busy_fraction=0, seed=1) as simulator:
+        async with aiohttp.ClientSession() as websession:
+            laundry = Laundry(websession=websession, endpoint_url=simulator.url)
+            await laundry.async_login(username="test@example.com", password="hunter2")
+
+            yield simulator, laundry
+
+
+def _first(laundry: Laundry, machine_type: MachineType) -> str:
+    """Return ID of first machine of a type."""
+
+    return next(
+        machine.id_
+        for machine in laundry.machines.values()
+        if machine.type is machine_type
+    )
+
+
+@pytest.mark.asyncio  # type: ignore
+async def test__add_time(simulated: tuple[LaundrySimulator, Laundry]) -> None:
+    """Test that an idle dryer is started, then topped off up to the requested time."""
+
+    simulator, laundry = simulated
+    dryer_id = _first(laundry, MachineType.DRYER)
+
+    # Simulated dryers run 60 minutes per start and 5 minutes per topoff.
+    outcomes = await laundry.async_add_time(dryer_id, 70)
+
+    assert [(outcome.sequence, outcome.price) for outcome in outcomes] == [
+        (0, 1.5),
+        (1, 0.25),
+        (2, 0.25),
+    ]
+    assert all(outcome.status is VendStatus.SUCCEEDED for outcome in outcomes)
+
+    await laundry.async_refresh()
+
+    assert laundry.machines[dryer_id].minutes_remaining == 70
+    assert laundry.profile.card_balance == 18.0
+
+    # Busy now, so only topoffs. Rounded up to whole topoffs.
+    outcomes = await laundry.async_add_time(dryer_id, 7)
+
+    assert [outcome.price for outcome in outcomes] == [0.25, 0.25]
+    assert simulator.stats.vends == 5
+
+
+@pytest.mark.asyncio  # type: ignore
+async def test__vend_many(simulated: tuple[LaundrySimulator, Laundry]) -> None:
+    """Test concurrent vends of several machines, balance checks and skipping after a failure."""
+
+    simulator, laundry = simulated
+    dryer_id = _first(laundry, MachineType.DRYER)
+    washer_id = _first(laundry, MachineType.WASHER)
+
+    with pytest.raises(InsufficientFunds):
+        await laundry.async_vend_many({dryer_id: 100})
+
+    with pytest.raises(ValueError):
+        await laundry.async_vend_many({washer_id: 2})
+
+    assert simulator.stats.vends == 0
+
+    # Machine goes offline after prices were looked up.
+    await laundry.async_get_topoff_data(dryer_id)
+    next(
+        machine
+        for machine in simulator.machines.values()
+        if machine.reader_id == dryer_id
+    ).online = False
+
+    results = await laundry.async_vend_many({washer_id: 1, dryer_id: 3})
+
+    assert [outcome.status for outcome in results[washer_id]] == [VendStatus.SUCCEEDED]
+    assert [outcome.status for outcome in results[dryer_id]] == [
+        VendStatus.FAILED,
+        VendStatus.SKIPPED,
+        VendStatus.SKIPPED,
+    ]
+    assert isinstance(results[dryer_id][0].error, MachineOffline)
+    assert simulator.stats.vends == 1